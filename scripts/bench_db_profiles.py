@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from controlwork.services.database import CONNECTION_PROFILES, Database
+
+
+def bench_profile(name: str, writes: int, directory: Path) -> tuple[float, float, float]:
+    db = Database(directory / f"{name}.db", flush_interval_sec=0, profile=name)
+    session_id = db.create_session(datetime.now())
+    latencies: list[float] = []
+    started = time.perf_counter()
+    for second in range(1, writes + 1):
+        t0 = time.perf_counter()
+        db.update_session_totals(session_id, second, 0, 0)
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    db.close()
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (writes / total, p50 * 1000, p99 * 1000)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Commit throughput and latency per SQLite connection profile")
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--dir", type=Path, default=None, help="directory for the benchmark databases")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        print(f"{'profile':<10} {'commits/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'flush every':>12}")
+        for name, profile in CONNECTION_PROFILES.items():
+            rate, p50, p99 = bench_profile(name, args.writes, Path(tmp))
+            print(f"{name:<10} {rate:>10.0f} {p50:>8.3f} {p99:>8.3f} {profile.flush_interval_sec:>11.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
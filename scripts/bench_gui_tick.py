@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QApplication, QMenu
+
+from controlwork.i18n import tr
+from controlwork.models import AppSettings, TrackerState
+from controlwork.ui.main_window import MainWindow
+from controlwork.ui.view_model import StatusViewModel
+
+_MENU_KEYS = ("menu_status", "menu_pause", "menu_break_now", "menu_settings", "menu_exit")
+
+
+def bench_legacy(window: MainWindow, actions: list[QAction], ticks: int) -> float:
+    started = time.perf_counter()
+    for tick in range(ticks):
+        window.update_state(TrackerState.ACTIVE)
+        window.update_timers(tick // 60 * 60, 3000 - tick // 60 * 60)
+        window.set_notice()
+        window.refresh_learning_block()
+        for action, key in zip(actions, _MENU_KEYS):
+            action.setText(tr("ru", key))
+    return time.perf_counter() - started
+
+
+def bench_view_model(window: MainWindow, ticks: int) -> float:
+    view = StatusViewModel()
+    started = time.perf_counter()
+    for tick in range(ticks):
+        view.update(state=TrackerState.ACTIVE, work_seconds=tick // 60 * 60, until_break_seconds=3000 - tick // 60 * 60)
+        if not window.isVisible():
+            continue
+        changes = view.take_changes()
+        if "state" in changes:
+            window.update_state(view.current.state)
+        if "work_seconds" in changes or "until_break_seconds" in changes:
+            window.update_timers(view.current.work_seconds, view.current.until_break_seconds)
+        if "notice" in changes:
+            window.set_notice(view.current.notice)
+        window.refresh_learning_block()
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-tick cost of pushing tracker status into the main window")
+    parser.add_argument("--ticks", type=int, default=3600)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow(AppSettings().normalize())
+    menu = QMenu()
+    actions = [QAction(tr("ru", key), menu) for key in _MENU_KEYS]
+
+    window.show()
+    app.processEvents()
+    legacy = bench_legacy(window, actions, args.ticks)
+    visible = bench_view_model(window, args.ticks)
+    window.hide()
+    app.processEvents()
+    hidden = bench_view_model(window, args.ticks)
+
+    print(f"{'pipeline':<20} {'us/tick':>9}")
+    for name, total in (("legacy", legacy), ("view model, visible", visible), ("view model, hidden", hidden)):
+        print(f"{name:<20} {total / args.ticks * 1e6:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
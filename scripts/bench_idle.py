@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import resource
+import time
+
+from controlwork.services.idle import (
+    DBusScreenSaverIdleProvider,
+    IdleProvider,
+    LinuxIdleProvider,
+    SampledIdleProvider,
+    XPrintIdleProvider,
+    XScreenSaverIdleProvider,
+)
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def bench(provider: IdleProvider, calls: int) -> tuple[float, float, bool]:
+    answered = provider.query_idle_seconds() is not None
+    cpu_before = _cpu_seconds()
+    started = time.perf_counter()
+    for _ in range(calls):
+        provider.get_idle_seconds()
+    wall = (time.perf_counter() - started) / calls
+    cpu = (_cpu_seconds() - cpu_before) / calls
+    return (wall, cpu, answered)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-call latency and CPU cost of Linux idle backends")
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    candidates: list[tuple[str, IdleProvider]] = []
+    try:
+        candidates.append(("xss (in-process)", XScreenSaverIdleProvider()))
+    except (OSError, AttributeError) as exc:
+        print(f"xss (in-process): unavailable ({exc})")
+    candidates.append(("dbus-send (subprocess)", DBusScreenSaverIdleProvider()))
+    candidates.append(("xprintidle (subprocess)", XPrintIdleProvider()))
+    candidates.append(("legacy chain: dbus-send then xprintidle", _LegacySubprocessChain()))
+    candidates.append((f"auto-detected: {LinuxIdleProvider().name}", LinuxIdleProvider()))
+    sampled = SampledIdleProvider(LinuxIdleProvider())
+    candidates.append((f"sampled tick read: {sampled.name}", sampled))
+
+    print(f"{'backend':<42} {'answers':>7} {'ms/call':>9} {'CPU s/hour @1Hz':>16}")
+    for label, provider in candidates:
+        wall, cpu, answered = bench(provider, args.calls)
+        print(f"{label:<42} {str(answered):>7} {wall * 1000:>9.3f} {cpu * 3600:>16.2f}")
+    sampled.stop()
+    return 0
+
+
+class _LegacySubprocessChain(IdleProvider):
+    def __init__(self) -> None:
+        self._dbus = DBusScreenSaverIdleProvider()
+        self._xprintidle = XPrintIdleProvider()
+
+    def query_idle_seconds(self) -> int | None:
+        value = self._dbus.query_idle_seconds()
+        if value is not None:
+            return value
+        return self._xprintidle.query_idle_seconds()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
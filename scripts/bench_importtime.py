@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR), QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold import cost of the ControlWork entry points (-X importtime)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in ("controlwork.app", "controlwork.headless"):
+        runs = [import_times(module) for _ in range(args.runs)]
+        total_ms = statistics.median(run[module][1] for run in runs) / 1000
+        own_ms = statistics.median(
+            sum(self_us for name, (self_us, _) in run.items() if name.startswith("controlwork")) for run in runs
+        ) / 1000
+        print(f"{module}: {total_ms:.1f} ms total, {own_ms:.1f} ms in controlwork modules, {len(runs[0])} modules")
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+        for name, (self_us, cumulative_us) in slowest:
+            print(f"  {name:<45} self {self_us / 1000:>7.1f} ms  cumulative {cumulative_us / 1000:>7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from controlwork.services.database import Database
+from controlwork.services.learning_content import LearningCard
+from controlwork.services.spaced_repetition import QUALITY_EASY, QUALITY_GOOD, LearningScheduler
+
+START_EPOCH = 1_771_329_600
+
+
+def bench_size(size: int, reviews: int, seed: int, directory: Path) -> tuple[float, float, float]:
+    rng = random.Random(seed)
+    cards = [LearningCard(f"word{index}", f"слово{index}", None, f"Example {index}.") for index in range(size)]
+    now = [0.0]
+    db = Database(directory / f"cards_{size}.db", flush_interval_sec=10, time_fn=lambda: now[0])
+
+    started = time.perf_counter()
+    scheduler = LearningScheduler(db, cards, START_EPOCH)
+    cold = time.perf_counter() - started
+
+    epoch = START_EPOCH
+    started = time.perf_counter()
+    for _ in range(reviews):
+        card = scheduler.next_due(epoch)
+        if card is not None:
+            scheduler.review(card, QUALITY_EASY if rng.random() < 0.3 else QUALITY_GOOD, epoch)
+        epoch += 30
+        now[0] += 30
+    per_review = (time.perf_counter() - started) / reviews
+    db.flush()
+
+    started = time.perf_counter()
+    LearningScheduler(db, cards, epoch)
+    warm = time.perf_counter() - started
+    db.close()
+    return (cold, per_review, warm)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Spaced-repetition scheduler: deck load and per-review cost")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'cards':>8} {'load ms':>9} {'reload ms':>10} {'pick+review us':>15}")
+        for size in args.sizes:
+            cold, per_review, warm = bench_size(size, args.reviews, args.seed, Path(tmp))
+            print(f"{size:>8} {cold * 1000:>9.1f} {warm * 1000:>10.1f} {per_review * 1e6:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from controlwork.services.database import Database, MigrationProgress
+
+LEGACY_SCHEMA = """
+CREATE TABLE sessions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  started_at TEXT NOT NULL,
+  ended_at TEXT,
+  active_sec INTEGER NOT NULL DEFAULT 0,
+  idle_sec INTEGER NOT NULL DEFAULT 0,
+  break_sec INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE reminder_events (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  ts TEXT NOT NULL,
+  type TEXT NOT NULL,
+  point_min INTEGER NOT NULL,
+  action_taken TEXT NOT NULL
+);
+CREATE TABLE break_events (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  started_at TEXT NOT NULL,
+  ended_at TEXT,
+  valid_idle_sec INTEGER NOT NULL DEFAULT 0,
+  completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE app_settings (
+  key TEXT PRIMARY KEY,
+  value_json TEXT NOT NULL
+);
+"""
+
+
+def make_legacy_database(db_path: Path, reminder_rows: int) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute(
+        """
+        WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n + 1 < ?)
+        INSERT INTO reminder_events(ts, type, point_min, action_taken)
+        SELECT strftime('%Y-%m-%dT%H:%M:%S', 1451606400 + n * 300, 'unixepoch'), 'soft', 15, 'shown' FROM seq
+        """,
+        (reminder_rows,),
+    )
+    conn.commit()
+    conn.close()
+
+
+def bench(db_path: Path) -> tuple[float, dict[int, tuple[int, float]]]:
+    reports: list[tuple[float, MigrationProgress]] = []
+    started = time.perf_counter()
+    db = Database(db_path, progress=lambda progress: reports.append((time.perf_counter(), progress)))
+    elapsed = time.perf_counter() - started
+    db.close()
+
+    steps: dict[int, tuple[int, float]] = {}
+    for version in sorted({progress.version for _, progress in reports}):
+        times = [ts for ts, progress in reports if progress.version == version]
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        steps[version] = (len(times), max(gaps, default=0.0))
+    return (elapsed, steps)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time to migrate a legacy database and gaps between progress reports")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dir", type=Path, default=None, help="directory for the benchmark database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_path = Path(tmp) / "legacy.db"
+        make_legacy_database(db_path, args.rows)
+        elapsed, steps = bench(db_path)
+    print(f"{args.rows} rows migrated in {elapsed:.2f}s")
+    print(f"{'version':>7} {'reports':>8} {'max gap s':>10}")
+    for version, (count, max_gap) in steps.items():
+        print(f"{version:>7} {count:>8} {max_gap:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import time
+from datetime import date
+
+from controlwork.i18n import ThemedQuote
+from controlwork.services.rotation import DailyRotation
+
+
+def _quote_id(item: ThemedQuote) -> str:
+    return f"{item.topic}|{item.author}|{item.text}"
+
+
+def legacy_pick(pool: list[ThemedQuote], slot: int, day_key: str) -> ThemedQuote:
+    ordered = sorted(pool, key=lambda item: hashlib.sha256(f"{day_key}|{_quote_id(item)}".encode("utf-8")).hexdigest())
+    return ordered[slot % len(ordered)]
+
+
+def bench_size(size: int, renders: int) -> tuple[float, float, float]:
+    pool = [ThemedQuote(f"topic{index % 7}", "en", f"Quote number {index}", f"Author {index % 97}") for index in range(size)]
+    today = date(2026, 2, 17)
+    day_key = f"{today.isoformat()}|en"
+
+    started = time.perf_counter()
+    for slot in range(renders):
+        legacy_pick(pool, slot, day_key)
+    legacy = (time.perf_counter() - started) / renders
+
+    rotation: DailyRotation[ThemedQuote] = DailyRotation(_quote_id)
+    started = time.perf_counter()
+    rotation.item_at(0, today, "en", 0, lambda: pool)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    for slot in range(renders):
+        rotation.item_at(slot, today, "en", 0, lambda: pool)
+    warm = (time.perf_counter() - started) / renders
+    return (legacy, cold, warm)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Daily quote slot lookup latency: per-render sort vs cached rotation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--renders", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'legacy ms':>10} {'cached cold ms':>15} {'cached warm us':>15}")
+    for size in args.sizes:
+        legacy, cold, warm = bench_size(size, args.renders)
+        print(f"{size:>8} {legacy * 1000:>10.2f} {cold * 1000:>15.2f} {warm * 1e6:>15.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
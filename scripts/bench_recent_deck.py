@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from controlwork.services.learning_content import LearningCard
+from controlwork.services.rotation import RecentDeck
+
+
+def _card_id(item: LearningCard) -> str:
+    return (
+        f"{item.english}|{item.russian}|{item.transcription or ''}|"
+        f"{item.example or ''}|{item.example_translation or ''}"
+    )
+
+
+def legacy_pick(pool: list[LearningCard], history: list[str], recent_window: int = 5) -> LearningCard:
+    recent = history[-recent_window:]
+    candidates = [item for item in pool if _card_id(item) not in recent]
+    if not candidates and history:
+        candidates = [item for item in pool if _card_id(item) != history[-1]]
+    if not candidates:
+        candidates = pool
+    selected = random.choice(candidates)
+    selected_id = _card_id(selected)
+    history[:] = ([item_id for item_id in history if item_id != selected_id] + [selected_id])[-recent_window:]
+    return selected
+
+
+def deck_pick(deck: RecentDeck[LearningCard], history: list[str], recent_window: int = 5) -> LearningCard:
+    index = deck.pick(history, recent_window)
+    selected_id = deck.ids[index]
+    history[:] = ([item_id for item_id in history if item_id != selected_id] + [selected_id])[-recent_window:]
+    return deck.items[index]
+
+
+def bench_size(size: int, picks: int) -> tuple[float, float, float]:
+    pool = [LearningCard(f"word{index}", f"слово{index}", None, f"Example {index}.", None) for index in range(size)]
+
+    history: list[str] = []
+    started = time.perf_counter()
+    for _ in range(picks):
+        legacy_pick(pool, history)
+    legacy = (time.perf_counter() - started) / picks
+
+    started = time.perf_counter()
+    deck = RecentDeck(pool, _card_id)
+    load = time.perf_counter() - started
+    history = []
+    started = time.perf_counter()
+    for _ in range(picks):
+        deck_pick(deck, history)
+    pick = (time.perf_counter() - started) / picks
+    return (legacy, load, pick)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Card selection latency with recent-history exclusion")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--picks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"{'cards':>8} {'legacy ms':>10} {'deck load ms':>13} {'deck pick us':>13}")
+    for size in args.sizes:
+        legacy, load, pick = bench_size(size, args.picks)
+        print(f"{size:>8} {legacy * 1000:>10.2f} {load * 1000:>13.2f} {pick * 1e6:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
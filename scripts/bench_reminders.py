@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import dataclass, field
+
+from controlwork.models import ReminderEvent
+from controlwork.services.reminder import ReminderController
+
+
+@dataclass
+class _LegacyReminderController:
+    soft_points: list[int]
+    hard_points: list[int]
+    _extra_soft: list[int] = field(default_factory=list)
+    _extra_hard: list[int] = field(default_factory=list)
+    _fired_soft: set[int] = field(default_factory=set)
+    _fired_hard: set[int] = field(default_factory=set)
+
+    def evaluate_due_events(self, active_minutes: int) -> list[ReminderEvent]:
+        if active_minutes <= 0:
+            return []
+        due: list[ReminderEvent] = []
+        for point in sorted(set(self.soft_points + self._extra_soft)):
+            if active_minutes >= point and point not in self._fired_soft:
+                self._fired_soft.add(point)
+                due.append(ReminderEvent(event_type="soft", point_min=point))
+        for point in sorted(set(self.hard_points + self._extra_hard)):
+            if active_minutes >= point and point not in self._fired_hard:
+                self._fired_hard.add(point)
+                due.append(ReminderEvent(event_type="hard", point_min=point))
+        due.sort(key=lambda event: (event.point_min, 0 if event.event_type == "soft" else 1))
+        return due
+
+    def add_snooze(self, event_type: str, current_minute: int, offset_minutes: int = 5) -> None:
+        target = max(1, current_minute + offset_minutes)
+        (self._extra_hard if event_type == "hard" else self._extra_soft).append(target)
+
+    def next_hard_point_min(self, active_minutes: int) -> int | None:
+        for point in sorted(set(self.hard_points + self._extra_hard)):
+            if point > active_minutes and point not in self._fired_hard:
+                return point
+        return None
+
+
+def bench(controller: object, seconds: int, snoozes: list[tuple[int, str]]) -> tuple[float, int]:
+    fired = 0
+    pending = dict(snoozes)
+    started = time.perf_counter()
+    for second in range(1, seconds + 1):
+        minute = second // 60
+        fired += len(controller.evaluate_due_events(minute))  # type: ignore[attr-defined]
+        controller.next_hard_point_min(minute)  # type: ignore[attr-defined]
+        kind = pending.pop(second, None)
+        if kind is not None:
+            controller.add_snooze(kind, minute, 5)  # type: ignore[attr-defined]
+    return ((time.perf_counter() - started) / seconds, fired)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-tick cost of ReminderController with many points and snoozes")
+    parser.add_argument("--points", type=int, default=300)
+    parser.add_argument("--snoozes", type=int, default=200)
+    parser.add_argument("--hours", type=float, default=8.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    seconds = int(args.hours * 3600)
+    horizon = seconds // 60
+    soft = rng.sample(range(1, horizon + 1), min(args.points, horizon))
+    hard = rng.sample(range(1, horizon + 1), min(args.points // 10 + 1, horizon))
+    snoozes = [(rng.randint(1, seconds), rng.choice(["soft", "hard"])) for _ in range(args.snoozes)]
+
+    print(f"{'controller':<10} {'us/tick':>9} {'fired':>7}")
+    for label, controller in (
+        ("legacy", _LegacyReminderController(list(soft), list(hard))),
+        ("heap", ReminderController(list(soft), list(hard))),
+    ):
+        per_tick, fired = bench(controller, seconds, snoozes)
+        print(f"{label:<10} {per_tick * 1e6:>9.2f} {fired:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from controlwork.models import AppSettings, TrackerState
+from controlwork.services.database import Database
+from controlwork.services.idle import IdleProvider
+from controlwork.services.reminder import ReminderController
+from controlwork.services.tracker import TrackerService
+from controlwork.simulation.runner import SIMULATION_START, SimulationClock
+from controlwork.simulation.traces import DEFAULT_PROFILES, generate_runs
+
+
+def bench_profile(index: int, days: int, seed: int, directory: Path) -> tuple[str, float, float, float]:
+    profile = DEFAULT_PROFILES[index]
+    rng = random.Random(seed)
+    clock = SimulationClock(SIMULATION_START)
+    settings = AppSettings().normalize()
+    database = Database(
+        directory / f"{profile.name}.db",
+        time_fn=lambda: (clock.current - SIMULATION_START).total_seconds(),
+    )
+    tracker = TrackerService(
+        settings=settings,
+        idle_provider=IdleProvider(),
+        reminder=ReminderController(settings.soft_points_min, settings.hard_points_min),
+        database=database,
+        clock=clock,
+    )
+    tracker.start_session()
+    next_settings_save = 3600
+    for seconds, first_idle in generate_runs(profile, days, rng):
+        done = 0
+        while done < seconds:
+            chunk = min(seconds - done, 60)
+            run_start = clock.current
+            clock.current = run_start + timedelta(seconds=chunk)
+            if first_idle is None:
+                outcome = tracker.advance_active_run(chunk, run_start)
+            else:
+                outcome = tracker.advance_run(chunk, first_idle + done, run_start)
+            done += chunk
+            for event in outcome.reminders:
+                if event.event_type != "hard":
+                    continue
+                roll = rng.random()
+                if roll < profile.snooze_prob:
+                    tracker.request_snooze("hard")
+                elif roll < profile.snooze_prob + profile.skip_prob:
+                    tracker.skip_break()
+                elif roll < profile.snooze_prob + profile.skip_prob + profile.take_break_prob:
+                    tracker.enter_break()
+            if tracker.state == TrackerState.IDLE and rng.random() < 0.01:
+                tracker.pause_session()
+                tracker.resume_session()
+            elapsed = (clock.current - SIMULATION_START).total_seconds()
+            if elapsed >= next_settings_save:
+                tracker.apply_settings(AppSettings().normalize())
+                next_settings_save += 3600
+    tracker.stop_session()
+    database.close()
+    hours = (clock.current - SIMULATION_START).total_seconds() / 3600
+    return (profile.name, hours, database.app_values_requested / hours, database.app_rows_written / hours)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="app_settings rows written per hour for tracker runtime state")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dir", type=Path, default=None, help="directory for the benchmark databases")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        print(f"{'profile':<11} {'hours':>7} {'before rows/h':>14} {'after rows/h':>13}")
+        for index in range(len(DEFAULT_PROFILES)):
+            name, hours, before, after = bench_profile(index, args.days, args.seed + index, Path(tmp))
+            print(f"{name:<11} {hours:>7.0f} {before:>14.1f} {after:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
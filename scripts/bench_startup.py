@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+_CHILD = """
+import resource, sys, time
+started = time.perf_counter()
+if sys.argv[1] == "gui":
+    from controlwork.app import ControlWorkApplication
+    app = ControlWorkApplication()
+    ready = time.perf_counter() - started
+    app._shutdown()
+else:
+    from controlwork.headless import HeadlessApplication
+    app = HeadlessApplication([])
+    ready = time.perf_counter() - started
+    app.shutdown()
+rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(ready, rss_kib)
+"""
+
+
+def bench_mode(mode: str, runs: int, home: Path) -> tuple[float, float, float]:
+    env = dict(os.environ, HOME=str(home), PYTHONPATH=str(SRC_DIR), QT_QPA_PLATFORM="offscreen")
+    ready: list[float] = []
+    wall: list[float] = []
+    rss: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", _CHILD, mode], capture_output=True, text=True, env=env, check=True
+        )
+        wall.append(time.perf_counter() - started)
+        ready_sec, rss_kib = proc.stdout.split()[-2:]
+        ready.append(float(ready_sec))
+        rss.append(float(rss_kib) / 1024)
+    return (statistics.median(ready), statistics.median(wall), statistics.median(rss))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup time and peak RSS of the GUI and headless modes")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        config_dir = home / ".config" / "controlwork"
+        config_dir.mkdir(parents=True)
+        (config_dir / "settings.json").write_text(json.dumps({"autostart_enabled": False}), encoding="utf-8")
+        print(f"{'mode':<9} {'ready ms':>9} {'process ms':>11} {'max RSS MiB':>12}")
+        for mode in ("gui", "headless"):
+            ready, wall, rss = bench_mode(mode, args.runs, home)
+            print(f"{mode:<9} {ready * 1000:>9.0f} {wall * 1000:>11.0f} {rss:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from controlwork.services.database import Database, to_epoch
+
+START = datetime(2016, 1, 1, 4, 0, 0)
+
+
+def fill_history(db: Database, years: int, seed: int) -> None:
+    rng = random.Random(seed)
+    sessions = []
+    reminders = []
+    for day in range(365 * years):
+        day_start = START + timedelta(days=day)
+        for hour in (5, 9, 14):
+            ts = day_start + timedelta(hours=hour, seconds=rng.randrange(3600))
+            sessions.append((ts.isoformat(), to_epoch(ts), rng.randrange(7200), rng.randrange(900), rng.randrange(600)))
+        for _ in range(20):
+            ts = day_start + timedelta(seconds=rng.randrange(86400))
+            action = rng.choice(("shown", "snooze", "skip", "ignore"))
+            reminders.append((ts.isoformat(), to_epoch(ts), "soft", 15, action))
+    db._conn.executemany(
+        "INSERT INTO sessions(started_at, started_epoch, active_sec, idle_sec, break_sec) VALUES (?,?,?,?,?)",
+        sessions,
+    )
+    db._conn.executemany(
+        "INSERT INTO reminder_events(ts, ts_epoch, type, point_min, action_taken) VALUES (?,?,?,?,?)",
+        reminders,
+    )
+    db._conn.commit()
+    db.rebuild_daily_rollups(f"{START:%H:%M}")
+    db._conn.execute("ANALYZE")
+
+
+def bench(db: Database, years: int, queries: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    durations = []
+    for _ in range(queries):
+        day_key = (START + timedelta(days=rng.randrange(365 * years))).isoformat()
+        t0 = time.perf_counter()
+        db.get_daily_rollup(day_key)
+        durations.append(time.perf_counter() - t0)
+    return durations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latency of the daily rollup read on a synthetic history")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--dir", type=Path, default=None, help="directory for the benchmark database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db = Database(Path(tmp) / "history.db")
+        fill_history(db, args.years, args.seed)
+        durations = bench(db, args.years, args.queries, args.seed)
+        db.close()
+    durations.sort()
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(f"{'years':>5} {'queries':>8} {'median ms':>10} {'p99 ms':>8}")
+    print(f"{args.years:>5} {args.queries:>8} {statistics.median(durations) * 1000:>10.3f} {p99 * 1000:>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
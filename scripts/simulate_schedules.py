@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from controlwork.models import AppSettings
+from controlwork.simulation.runner import simulate_population
+
+
+def _points(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay synthetic user profiles against reminder schedules")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--users", type=int, default=10, help="simulated users per profile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--schedule",
+        action="append",
+        default=None,
+        metavar="SOFT/HARD",
+        help="soft and hard points in minutes, e.g. 15,30,45/50 (repeatable)",
+    )
+    args = parser.parse_args()
+
+    schedules = args.schedule or ["15,30,45/50", "20,40/60", "25/45"]
+    print(
+        f"{'schedule':<14} {'profile':<11} {'active h':>9} {'soft':>6} {'hard':>6} "
+        f"{'snooze':>7} {'skip':>6} {'breaks':>7} {'sim s/s':>12}"
+    )
+    for schedule in schedules:
+        soft, hard = schedule.split("/")
+        settings = AppSettings(soft_points_min=_points(soft), hard_points_min=_points(hard)).normalize()
+        started = time.perf_counter()
+        reports = simulate_population(settings, days=args.days, users_per_profile=args.users, seed=args.seed)
+        elapsed = time.perf_counter() - started
+        rate = sum(report.simulated_sec for report in reports) / elapsed
+        for report in reports:
+            print(
+                f"{schedule:<14} {report.profile:<11} {report.active_sec / 3600:>9.1f} {report.soft_shown:>6} "
+                f"{report.hard_shown:>6} {report.snoozes:>7} {report.skips:>6} {report.breaks_completed:>7} "
+                f"{rate:>12,.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,22 +1,32 @@
 from __future__ import annotations
 
+import math
 import sys
+from typing import TYPE_CHECKING
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtGui import QAction
-from PySide6.QtWidgets import QApplication, QDialog, QMenu, QMessageBox, QStyle, QSystemTrayIcon
+from PySide6.QtWidgets import QApplication, QDialog, QMenu, QMessageBox, QProgressDialog, QStyle, QSystemTrayIcon
 
 from .i18n import tr
-from .models import AppSettings, ReminderEvent, TrackerState
+from .models import AppSettings, ReminderEvent, TickOutcome, TrackerState
 from .services.autostart import AutostartService
-from .services.database import Database
-from .services.idle import create_idle_provider
+from .services.database import BackgroundDatabase, MigrationProgress
+from .services.idle import SampledIdleProvider, create_idle_provider
 from .services.notification import NotificationService
 from .services.reminder import ReminderController
+from .services.schedule import rules_from_settings
+from .services.scheduler import TickScheduler, elapsed_clock
 from .services.tracker import TrackerService
 from .settings import AppPaths, SettingsService
-from .ui.break_overlay import BreakOverlay
-from .ui.main_window import FirstRunDialog, MainWindow, SettingsDialog
+from .ui.view_model import StatusViewModel
+
+if TYPE_CHECKING:
+    from .ui.break_overlay import BreakOverlay
+
+
+class _InputWaker(QObject):
+    input_detected = Signal()
 
 
 class ControlWorkApplication:
@@ -29,75 +39,97 @@ class ControlWorkApplication:
         self.settings = self.settings_service.load()
 
         if self.settings_service.is_first_run:
+            from .ui.dialogs import FirstRunDialog
+
             dialog = FirstRunDialog(self.settings)
             dialog.exec()
             self.settings_service.save(self.settings)
 
-        self.database = Database(self.paths.db_path)
+        self.tray_icon: QSystemTrayIcon | None = None
+        self.notification = NotificationService()
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(self.qt_app.style().standardIcon(QStyle.SP_ComputerIcon))
+            self.notification = NotificationService(self.tray_icon)
+            self._build_tray_menu()
+            self.tray_icon.show()
+            self.qt_app.processEvents()
+
+        self._migration_dialog: QProgressDialog | None = None
+        self.database = BackgroundDatabase(
+            self.paths.db_path,
+            profile=self.settings.db_profile,
+            progress=self._on_migration_progress,
+        )
+        if self._migration_dialog is not None:
+            self._migration_dialog.close()
+            self._migration_dialog = None
         self.autostart_service = AutostartService()
         self.autostart_service.set_enabled(self.settings.autostart_enabled)
 
-        self.main_window = MainWindow(self.settings)
-        self.main_window.set_settings(self.settings)
-        self.main_window.pause_toggle_requested.connect(self._toggle_pause)
-
-        self.break_overlay = BreakOverlay(self.settings.language, self.settings.reminder_tone)
-        self.break_overlay.start_break.connect(self._on_break_start)
-        self.break_overlay.snooze.connect(self._on_hard_snooze)
-        self.break_overlay.skip.connect(self._on_hard_skip)
-        self.break_overlay.continue_work.connect(self._on_break_continue)
-
-        self.reminder = ReminderController(self.settings.soft_points_min, self.settings.hard_points_min)
+        self.reminder = ReminderController(
+            self.settings.soft_points_min,
+            self.settings.hard_points_min,
+            rules_from_settings(self.settings),
+        )
+        self.idle_provider = SampledIdleProvider(create_idle_provider())
         self.tracker = TrackerService(
             settings=self.settings,
-            idle_provider=create_idle_provider(),
+            idle_provider=self.idle_provider,
             reminder=self.reminder,
             database=self.database,
         )
         self.tracker.start_session()
+        self._tray_texts: tuple[str, bool] | None = None
+        self._retranslate_tray()
 
-        self.tray_icon: QSystemTrayIcon | None = None
-        self.notification = NotificationService()
-        if QSystemTrayIcon.isSystemTrayAvailable():
-            self.tray_icon = QSystemTrayIcon(self.qt_app.style().standardIcon(QStyle.SP_ComputerIcon), self.main_window)
-            self.notification = NotificationService(self.tray_icon)
-            self._build_tray_menu()
-            self.tray_icon.activated.connect(self._on_tray_activated)
-            self.tray_icon.show()
+        from .ui.main_window import MainWindow
+
+        self.main_window = MainWindow(self.settings)
+        self.main_window.set_settings(self.settings)
+        self.main_window.set_review_store(self.database)
+        self.main_window.pause_toggle_requested.connect(self._toggle_pause)
         self.main_window.set_hide_to_tray_enabled(self.tray_icon is not None)
+        self.break_overlay: BreakOverlay | None = None
 
+        self.scheduler = TickScheduler()
+        self._tick_anchor = elapsed_clock()
         self.timer = QTimer()
-        self.timer.setInterval(1000)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self._on_tick)
-        self.timer.start()
+        self._input_waker = _InputWaker()
+        self._input_waker.input_detected.connect(self._on_tick)
 
-        self.main_window.update_state(self.tracker.state)
-        self.main_window.update_timers(
-            self.tracker.get_cycle_active_seconds(),
-            self.tracker.get_seconds_to_next_break(),
-        )
-        self.main_window.set_notice()
+        self.status_view = StatusViewModel()
+        self._update_status_view()
         self.main_window.show()
-        self.main_window.show_status_tab()
-        QTimer.singleShot(150, self.main_window.show_status_tab)
+        self._show_status()
+        QTimer.singleShot(150, self._show_status)
+        self._connect_tray()
+        self._schedule_next_tick()
+
+    def _on_migration_progress(self, progress: MigrationProgress) -> None:
+        if progress.total <= 1:
+            return
+        if self._migration_dialog is None:
+            self._migration_dialog = QProgressDialog(tr(self.settings.language, "db_migrating"), "", 0, 100)
+            self._migration_dialog.setWindowTitle("ControlWork")
+            self._migration_dialog.setCancelButton(None)
+            self._migration_dialog.setMinimumDuration(500)
+        self._migration_dialog.setValue(progress.done * 100 // progress.total)
+        self.qt_app.processEvents()
 
     def _build_tray_menu(self) -> None:
         if self.tray_icon is None:
             return
         lang = self.settings.language
         menu = QMenu()
+        self._tray_menu = menu
 
-        self.action_status = QAction(tr(lang, "menu_status"), self.main_window)
-        self.action_pause = QAction(tr(lang, "menu_pause"), self.main_window)
-        self.action_break_now = QAction(tr(lang, "menu_break_now"), self.main_window)
-        self.action_settings = QAction(tr(lang, "menu_settings"), self.main_window)
-        self.action_exit = QAction(tr(lang, "menu_exit"), self.main_window)
-
-        self.action_status.triggered.connect(self.main_window.show_status_tab)
-        self.action_pause.triggered.connect(self._toggle_pause)
-        self.action_break_now.triggered.connect(self._start_break_now)
-        self.action_settings.triggered.connect(self._open_settings_dialog)
-        self.action_exit.triggered.connect(self._shutdown)
+        self.action_status = QAction(tr(lang, "menu_status"), menu)
+        self.action_pause = QAction(tr(lang, "menu_pause"), menu)
+        self.action_break_now = QAction(tr(lang, "menu_break_now"), menu)
+        self.action_settings = QAction(tr(lang, "menu_settings"), menu)
+        self.action_exit = QAction(tr(lang, "menu_exit"), menu)
 
         menu.addAction(self.action_status)
         menu.addAction(self.action_pause)
@@ -106,41 +138,118 @@ class ControlWorkApplication:
         menu.addSeparator()
         menu.addAction(self.action_exit)
 
+        menu.setEnabled(False)
         self.tray_icon.setContextMenu(menu)
 
+    def _connect_tray(self) -> None:
+        if self.tray_icon is None:
+            return
+        self.action_status.triggered.connect(self._show_status)
+        self.action_pause.triggered.connect(self._toggle_pause)
+        self.action_break_now.triggered.connect(self._start_break_now)
+        self.action_settings.triggered.connect(self._open_settings_dialog)
+        self.action_exit.triggered.connect(self._shutdown)
+        self._tray_menu.aboutToShow.connect(self._retranslate_tray)
+        self._tray_menu.setEnabled(True)
+        self.tray_icon.activated.connect(self._on_tray_activated)
+
+    def _show_status(self) -> None:
+        self.main_window.show_status_tab()
+        self._sync_main_window()
+
+    def _update_status_view(self, state: TrackerState | None = None, notice: str | None = None) -> None:
+        self.status_view.update(
+            state=self.tracker.state if state is None else state,
+            work_seconds=self.tracker.get_cycle_active_seconds(),
+            until_break_seconds=self.tracker.get_seconds_to_next_break(),
+            notice=notice,
+        )
+        self._sync_main_window()
+
+    def _sync_main_window(self) -> None:
+        if not self.main_window.isVisible():
+            return
+        changes = self.status_view.take_changes()
+        view = self.status_view.current
+        if "state" in changes:
+            self.main_window.update_state(view.state)
+        if "work_seconds" in changes or "until_break_seconds" in changes:
+            self.main_window.update_timers(view.work_seconds, view.until_break_seconds)
+        if "notice" in changes:
+            self.main_window.set_notice(view.notice)
+        self.main_window.refresh_learning_block()
+
+    def _overlay(self) -> BreakOverlay:
+        if self.break_overlay is None:
+            from .ui.break_overlay import BreakOverlay
+
+            self.break_overlay = BreakOverlay(self.settings.language, self.settings.reminder_tone)
+            self.break_overlay.start_break.connect(self._on_break_start)
+            self.break_overlay.snooze.connect(self._on_hard_snooze)
+            self.break_overlay.skip.connect(self._on_hard_skip)
+            self.break_overlay.continue_work.connect(self._on_break_continue)
+        return self.break_overlay
+
+    def _overlay_visible(self) -> bool:
+        return self.break_overlay is not None and self.break_overlay.isVisible()
+
+    def _hide_overlay(self) -> None:
+        if self.break_overlay is not None:
+            self.break_overlay.hide()
+
     def _retranslate_tray(self) -> None:
         if self.tray_icon is None:
             return
         lang = self.settings.language
+        paused = self.tracker.state == TrackerState.PAUSED
+        if self._tray_texts == (lang, paused):
+            return
+        self._tray_texts = (lang, paused)
         self.action_status.setText(tr(lang, "menu_status"))
-        self.action_pause.setText(
-            tr(lang, "menu_resume") if self.tracker.state == TrackerState.PAUSED else tr(lang, "menu_pause")
-        )
+        self.action_pause.setText(tr(lang, "menu_resume") if paused else tr(lang, "menu_pause"))
         self.action_break_now.setText(tr(lang, "menu_break_now"))
         self.action_settings.setText(tr(lang, "menu_settings"))
         self.action_exit.setText(tr(lang, "menu_exit"))
 
-    def _on_tick(self) -> None:
-        outcome = self.tracker.tick()
-        self.main_window.update_state(outcome.state)
-        self.main_window.update_timers(
-            self.tracker.get_cycle_active_seconds(),
-            self.tracker.get_seconds_to_next_break(),
+    def _schedule_next_tick(self, idle_seconds: int | None = None) -> None:
+        if idle_seconds is None:
+            idle_seconds = self.idle_provider.get_idle_seconds()
+        visible = self.main_window.isVisible() or self._overlay_visible()
+        delay_sec = self.scheduler.next_delay_sec(self.tracker, idle_seconds, visible)
+        waiting_for_input = self.tracker.state == TrackerState.IDLE and not visible
+        wait_ms = max(0, math.ceil((self._tick_anchor + delay_sec - elapsed_clock()) * 1000))
+        self.idle_provider.follow_tick(
+            None if self.tracker.state == TrackerState.PAUSED else wait_ms / 1000,
+            self._input_waker.input_detected.emit if waiting_for_input else None,
         )
-        self.main_window.set_notice("status_idle_reset" if outcome.idle_timer_reset else None)
-        self.main_window.refresh_learning_block()
+        self.timer.start(wait_ms)
+
+    def _credit_elapsed(self, idle_seconds: int) -> TickOutcome | None:
+        elapsed = int(elapsed_clock() - self._tick_anchor)
+        if elapsed < 1:
+            return None
+        self._tick_anchor += elapsed
+        return self.tracker.advance(elapsed, idle_seconds)
+
+    def _on_tick(self) -> None:
+        idle_seconds = self.idle_provider.get_idle_seconds()
+        outcome = self._credit_elapsed(idle_seconds)
+        if outcome is None:
+            self._schedule_next_tick(idle_seconds)
+            return
+        self._update_status_view(outcome.state, "status_idle_reset" if outcome.idle_timer_reset else None)
 
         for event in outcome.reminders:
             self._handle_reminder(event)
 
-        if outcome.state == TrackerState.BREAK and outcome.break_remaining_sec is not None and self.break_overlay.isVisible():
-            self.break_overlay.set_break_mode(outcome.break_remaining_sec, outcome.break_idle_streak_sec)
+        if outcome.state == TrackerState.BREAK and outcome.break_remaining_sec is not None and self._overlay_visible():
+            self._overlay().set_break_mode(outcome.break_remaining_sec, outcome.break_idle_streak_sec)
 
         if outcome.break_completed:
-            self.break_overlay.hide()
+            self._hide_overlay()
             self.notification.notify(self._reminder_text("hard_title"), self._reminder_text("break_done"))
 
-        self._retranslate_tray()
+        self._schedule_next_tick(idle_seconds)
 
     def _handle_reminder(self, event: ReminderEvent) -> None:
         if event.event_type == "soft":
@@ -155,33 +264,40 @@ class ControlWorkApplication:
             self._reminder_text("hard_body"),
             critical=True,
         )
-        self.break_overlay.show_prompt(can_skip=self.tracker.can_skip_today())
+        self._overlay().show_prompt(can_skip=self.tracker.can_skip_today())
 
     def _toggle_pause(self) -> None:
+        self._on_tick()
         if self.tracker.state == TrackerState.PAUSED:
             self.tracker.resume_session()
         elif self.tracker.state != TrackerState.BREAK:
             self.tracker.pause_session()
+        self._update_status_view()
         self._retranslate_tray()
+        self._schedule_next_tick()
 
-    def _on_break_start(self) -> None:
+    def _enter_break(self) -> None:
         self.tracker.enter_break()
-        self.break_overlay.set_break_mode(self.settings.break_duration_min * 60, 0)
-        self.main_window.update_timers(
-            self.tracker.get_cycle_active_seconds(),
-            self.tracker.get_seconds_to_next_break(),
-        )
-        self.main_window.set_notice()
+        self._overlay().set_break_mode(self.settings.break_duration_min * 60, 0)
+        self._update_status_view()
+
+    def _on_break_start(self) -> None:
+        self._on_tick()
+        self._enter_break()
+        self._schedule_next_tick()
 
     def _start_break_now(self) -> None:
-        self._on_break_start()
-        self.main_window.update_state(self.tracker.state)
-        self.break_overlay.showFullScreen()
+        self._on_tick()
+        self._enter_break()
+        self._overlay().showFullScreen()
         self._retranslate_tray()
+        self._schedule_next_tick()
 
     def _on_hard_snooze(self) -> None:
+        self._on_tick()
         if self.tracker.request_snooze("hard"):
-            self.break_overlay.hide()
+            self._hide_overlay()
+            self._schedule_next_tick()
         else:
             self.notification.notify(
                 self._reminder_text("hard_title"),
@@ -190,8 +306,10 @@ class ControlWorkApplication:
             )
 
     def _on_hard_skip(self) -> None:
+        self._on_tick()
         if self.tracker.skip_break():
-            self.break_overlay.hide()
+            self._hide_overlay()
+            self._schedule_next_tick()
             return
         self.notification.notify(
             self._reminder_text("hard_title"),
@@ -200,33 +318,36 @@ class ControlWorkApplication:
         )
 
     def _on_break_continue(self) -> None:
+        self._on_tick()
         if not self.tracker.finish_break_early():
             return
-        self.break_overlay.hide()
-        self.main_window.update_state(self.tracker.state)
-        self.main_window.update_timers(
-            self.tracker.get_cycle_active_seconds(),
-            self.tracker.get_seconds_to_next_break(),
-        )
-        self.main_window.set_notice()
+        self._hide_overlay()
+        self._update_status_view()
+        self._schedule_next_tick()
         self.notification.notify(self._reminder_text("hard_title"), tr(self.settings.language, "break_shortened"))
 
     def _on_save_settings(self, settings: AppSettings) -> None:
         self.settings = settings
         self.settings_service.save(settings)
         self.tracker.apply_settings(settings)
+        self.database.apply_profile(settings.db_profile)
         self.autostart_service.set_enabled(settings.autostart_enabled)
 
         self.main_window.set_settings(settings)
         self.main_window.retranslate()
         self.main_window.refresh_learning_block(force=True)
+        self.status_view.invalidate()
+        self._update_status_view(notice=self.status_view.current.notice)
         learning_json_error = self.main_window.pop_learning_json_error()
         if learning_json_error is not None:
             QMessageBox.warning(self.main_window, "ControlWork", learning_json_error)
-        self.break_overlay.set_language(settings.language, settings.reminder_tone)
+        if self.break_overlay is not None:
+            self.break_overlay.set_language(settings.language, settings.reminder_tone)
         self._retranslate_tray()
 
     def _open_settings_dialog(self) -> None:
+        from .ui.dialogs import SettingsDialog
+
         dialog = SettingsDialog(self.settings, self.main_window)
         if dialog.exec() == QDialog.Accepted:
             self._on_save_settings(dialog.settings)
@@ -237,19 +358,24 @@ class ControlWorkApplication:
 
     def _on_tray_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         if reason == QSystemTrayIcon.Trigger:
-            self.main_window.show_status_tab()
+            self._show_status()
+            self._schedule_next_tick()
 
     def _shutdown(self) -> None:
         if self._shutdown_done:
             return
         self._shutdown_done = True
         self.timer.stop()
+        self._credit_elapsed(self.idle_provider.get_idle_seconds())
+        self.idle_provider.stop()
         self.settings_service.save(self.settings)
         self.tracker.stop_session()
-        self.database.close()
-        if self.tray_icon is not None:
-            self.tray_icon.hide()
-        self.qt_app.quit()
+        try:
+            self.database.close()
+        finally:
+            if self.tray_icon is not None:
+                self.tray_icon.hide()
+            self.qt_app.quit()
 
     def run(self) -> int:
         exit_code = self.qt_app.exec()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+from typing import Callable, Sequence
+
+from .i18n import tr
+from .models import ReminderEvent, TickOutcome, TrackerState
+from .services.database import Database
+from .services.idle import IdleProvider, SampledIdleProvider, create_idle_provider
+from .services.notification import NotificationSink, StreamNotificationSink
+from .services.reminder import ReminderController
+from .services.schedule import rules_from_settings
+from .services.scheduler import TickScheduler, elapsed_clock
+from .services.tracker import TrackerService
+from .settings import AppPaths, SettingsService
+
+_logger = logging.getLogger(__name__)
+
+
+class HeadlessApplication:
+    def __init__(
+        self,
+        sinks: Sequence[NotificationSink] | None = None,
+        paths: AppPaths | None = None,
+        idle_provider: IdleProvider | None = None,
+        elapsed_fn: Callable[[], float] = elapsed_clock,
+    ) -> None:
+        self.paths = paths or AppPaths()
+        self.settings_service = SettingsService(self.paths)
+        self.settings = self.settings_service.load()
+        if self.settings_service.is_first_run:
+            self.settings_service.save(self.settings)
+        self.sinks = [StreamNotificationSink()] if sinks is None else list(sinks)
+        self._shutdown_done = False
+        self._stopping = False
+        self._wake: asyncio.Event | None = None
+
+        self.database = Database(self.paths.db_path, profile=self.settings.db_profile)
+        self.reminder = ReminderController(
+            self.settings.soft_points_min,
+            self.settings.hard_points_min,
+            rules_from_settings(self.settings),
+        )
+        self.idle_provider = SampledIdleProvider(create_idle_provider()) if idle_provider is None else idle_provider
+        self.tracker = TrackerService(
+            settings=self.settings,
+            idle_provider=self.idle_provider,
+            reminder=self.reminder,
+            database=self.database,
+        )
+        self.tracker.start_session()
+
+        self.scheduler = TickScheduler()
+        self._elapsed_fn = elapsed_fn
+        self._tick_anchor = elapsed_fn()
+
+    def notify(self, title: str, message: str, critical: bool = False) -> None:
+        for sink in self.sinks:
+            try:
+                sink.notify(title, message, critical)
+            except Exception:
+                _logger.exception("notification sink %r failed", sink)
+
+    def on_tick(self) -> int:
+        idle_seconds = self.idle_provider.get_idle_seconds()
+        outcome = self._credit_elapsed(idle_seconds)
+        if outcome is None:
+            return idle_seconds
+        for event in outcome.reminders:
+            self._handle_reminder(event)
+        if outcome.break_completed:
+            self.notify(self._reminder_text("hard_title"), self._reminder_text("break_done"))
+        return idle_seconds
+
+    def next_delay_sec(self, idle_seconds: int) -> float:
+        delay_sec = self.scheduler.next_delay_sec(self.tracker, idle_seconds, visible=False)
+        return max(0.0, self._tick_anchor + delay_sec - self._elapsed_fn())
+
+    def toggle_pause(self) -> None:
+        self.on_tick()
+        if self.tracker.state == TrackerState.PAUSED:
+            self.tracker.resume_session()
+        elif self.tracker.state != TrackerState.BREAK:
+            self.tracker.pause_session()
+        self._wake_up()
+
+    def start_break(self) -> None:
+        self.on_tick()
+        if self.tracker.state == TrackerState.BREAK:
+            return
+        self.tracker.enter_break()
+        self._wake_up()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake_up()
+
+    async def run_async(self) -> int:
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._install_signal_handlers(loop)
+        wake = self._wake
+
+        def wake_from_sampler() -> None:
+            loop.call_soon_threadsafe(wake.set)
+
+        try:
+            while not self._stopping:
+                idle_seconds = self.on_tick()
+                delay_sec = self.next_delay_sec(idle_seconds)
+                if isinstance(self.idle_provider, SampledIdleProvider):
+                    self.idle_provider.follow_tick(
+                        None if self.tracker.state == TrackerState.PAUSED else delay_sec,
+                        wake_from_sampler if self.tracker.state == TrackerState.IDLE else None,
+                    )
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), delay_sec)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.shutdown()
+        return 0
+
+    def run(self) -> int:
+        return asyncio.run(self.run_async())
+
+    def shutdown(self) -> None:
+        if self._shutdown_done:
+            return
+        self._shutdown_done = True
+        self._credit_elapsed(self.idle_provider.get_idle_seconds())
+        if isinstance(self.idle_provider, SampledIdleProvider):
+            self.idle_provider.stop()
+        self.tracker.stop_session()
+        try:
+            self.database.close()
+        finally:
+            for sink in self.sinks:
+                sink.close()
+
+    def _credit_elapsed(self, idle_seconds: int) -> TickOutcome | None:
+        elapsed = int(self._elapsed_fn() - self._tick_anchor)
+        if elapsed < 1:
+            return None
+        self._tick_anchor += elapsed
+        return self.tracker.advance(elapsed, idle_seconds)
+
+    def _handle_reminder(self, event: ReminderEvent) -> None:
+        if event.event_type == "soft":
+            self.notify(
+                self._reminder_text("soft_title"),
+                self._reminder_text("soft_body", minutes=event.point_min),
+            )
+            return
+        self.notify(self._reminder_text("hard_title"), self._reminder_text("hard_body"), critical=True)
+
+    def _reminder_text(self, key: str, **kwargs: object) -> str:
+        return tr(self.settings.language, key, _tone=self.settings.reminder_tone, **kwargs)
+
+    def _wake_up(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> None:
+        handlers = [(signal.SIGINT, self.stop), (signal.SIGTERM, self.stop)]
+        if hasattr(signal, "SIGUSR1"):
+            handlers += [(signal.SIGUSR1, self.toggle_pause), (signal.SIGUSR2, self.start_break)]
+        for signum, handler in handlers:
+            try:
+                loop.add_signal_handler(signum, handler)
+            except (NotImplementedError, RuntimeError, ValueError):
+                continue
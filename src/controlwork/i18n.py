@@ -3,7 +3,6 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 
-from .themed_quotes_data import BASE_THEMED_QUOTES
 from .quote_models import ThemedQuote
 
 TEXTS = {
@@ -46,6 +45,7 @@ TEXTS = {
         "settings_browse": "Browse...",
         "settings_save": "Save settings",
         "saved_ok": "Settings saved",
+        "db_migrating": "Updating the statistics database...",
         "learning_json_invalid": "Learning JSON file is invalid. Continuing with quotes and irregular verbs.",
         "learning_json_unavailable": "Learning JSON file is unavailable. Continuing with quotes and irregular verbs.",
         "learning_example_prefix": "Example",
@@ -124,6 +124,7 @@ TEXTS = {
         "settings_browse": "Выбрать...",
         "settings_save": "Сохранить настройки",
         "saved_ok": "Настройки сохранены",
+        "db_migrating": "Обновление базы статистики...",
         "learning_json_invalid": "JSON-файл обучения невалиден. Продолжаем с цитатами и неправильными глаголами.",
         "learning_json_unavailable": "JSON-файл обучения недоступен. Продолжаем с цитатами и неправильными глаголами.",
         "learning_example_prefix": "Пример",
@@ -257,8 +258,6 @@ class IrregularVerb:
     translation: str
 
 
-THEMED_QUOTES: dict[str, dict[str, list[ThemedQuote]]] = BASE_THEMED_QUOTES
-
 IRREGULAR_VERBS: dict[str, list[IrregularVerb]] = {
     "ru": [
         IrregularVerb("be", "was/were", "been", "быть"),
@@ -369,9 +368,21 @@ IRREGULAR_VERBS: dict[str, list[IrregularVerb]] = {
 }
 
 
+def themed_quotes() -> dict[str, dict[str, list[ThemedQuote]]]:
+    from .themed_quotes_data import BASE_THEMED_QUOTES
+
+    return BASE_THEMED_QUOTES
+
+
+def __getattr__(name: str) -> object:
+    if name == "THEMED_QUOTES":
+        return themed_quotes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def random_thematic_quote(lang: str, previous: ThemedQuote | None = None) -> ThemedQuote:
     lang_key = "en" if lang == "en" else "ru"
-    pool = [quote for topic_quotes in THEMED_QUOTES[lang_key].values() for quote in topic_quotes]
+    pool = [quote for topic_quotes in themed_quotes()[lang_key].values() for quote in topic_quotes]
     if previous is not None:
         filtered = [quote for quote in pool if quote != previous]
         if filtered:
@@ -1,11 +1,46 @@
 from __future__ import annotations
 
+import argparse
+import shlex
 import sys
 
-from .app import ControlWorkApplication
 
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="controlwork")
+    parser.add_argument("--headless", action="store_true", help="run the tracker without Qt on an asyncio loop")
+    parser.add_argument(
+        "--notify",
+        action="append",
+        choices=("stdout", "desktop"),
+        default=None,
+        help="headless notification sink (repeatable, default: stdout)",
+    )
+    parser.add_argument(
+        "--notify-command",
+        action="append",
+        default=[],
+        metavar="COMMAND",
+        help="headless: run COMMAND per notification; {title}, {message} and {urgency} are substituted",
+    )
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+
+    if args.headless:
+        from .headless import HeadlessApplication
+        from .services.notification import (
+            CommandNotificationSink,
+            DesktopNotificationSink,
+            NotificationSink,
+            StreamNotificationSink,
+        )
+
+        sinks: list[NotificationSink] = []
+        for name in args.notify or ([] if args.notify_command else ["stdout"]):
+            sinks.append(StreamNotificationSink() if name == "stdout" else DesktopNotificationSink())
+        sinks.extend(CommandNotificationSink(shlex.split(command)) for command in args.notify_command)
+        return HeadlessApplication(sinks).run()
+
+    from .app import ControlWorkApplication
 
-def main() -> int:
     app = ControlWorkApplication()
     return app.run()
 
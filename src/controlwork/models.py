@@ -31,6 +31,8 @@ class AppSettings:
     learning_json_path: str = ""
     learning_json_paths: list[str] = field(default_factory=list)
     learning_recent_history: dict[str, list[str]] = field(default_factory=dict)
+    db_profile: str = "balanced"
+    reminder_rules: list[dict[str, object]] = field(default_factory=list)
 
     def normalize(self) -> "AppSettings":
         self.language = "en" if self.language == "en" else "ru"
@@ -39,8 +41,11 @@ class AppSettings:
         self.break_duration_min = max(1, int(self.break_duration_min))
         if self.reminder_tone not in REMINDER_TONES:
             self.reminder_tone = "friendly"
+        if self.db_profile not in DB_PROFILES:
+            self.db_profile = "balanced"
         self.soft_points_min = _normalize_points(self.soft_points_min)
         self.hard_points_min = _normalize_points(self.hard_points_min)
+        self.reminder_rules = _normalize_reminder_rules(self.reminder_rules)
         normalized_paths: list[str] = []
         for path in self.learning_json_paths or []:
             text = str(path).strip()
@@ -87,6 +92,44 @@ def _normalize_points(values: list[int]) -> list[int]:
     return normalized or [15]
 
 
+def _normalize_reminder_rules(payload: object) -> list[dict[str, object]]:
+    rules: list[dict[str, object]] = []
+    for raw in payload if isinstance(payload, list) else []:
+        if not isinstance(raw, dict) or raw.get("event_type") not in ("soft", "hard"):
+            continue
+        try:
+            rule: dict[str, object] = {
+                "event_type": raw["event_type"],
+                "at_min": max(0, int(raw.get("at_min", 0))),
+                "every_min": max(0, int(raw.get("every_min", 0))),
+                "until_min": max(0, int(raw.get("until_min", 0))),
+                "after": str(raw.get("after", "")),
+                "after_count": max(1, int(raw.get("after_count", 1))),
+                "window": str(raw.get("window", "")).strip(),
+            }
+        except (TypeError, ValueError):
+            continue
+        if rule["after"] not in REMINDER_RULE_TRIGGERS or not (rule["at_min"] or rule["every_min"]):
+            continue
+        if rule["window"] and not _is_time_window(str(rule["window"])):
+            continue
+        rules.append(rule)
+    return rules
+
+
+def _is_time_window(text: str) -> bool:
+    bounds = text.split("-")
+    if len(bounds) != 2:
+        return False
+    for bound in bounds:
+        parts = bound.split(":")
+        if len(parts) != 2 or not all(part.isdigit() for part in parts):
+            return False
+        if int(parts[0]) > 23 or int(parts[1]) > 59:
+            return False
+    return True
+
+
 def _normalize_learning_recent_history(payload: object) -> dict[str, list[str]]:
     allowed_keys = ("quotes", "verbs", "cards")
     result: dict[str, list[str]] = {}
@@ -113,3 +156,15 @@ REMINDER_TONES = (
     "motivation",
     "short",
 )
+
+DB_PROFILES = (
+    "durable",
+    "balanced",
+    "battery",
+)
+
+REMINDER_RULE_TRIGGERS = (
+    "",
+    "snooze",
+    "skip",
+)
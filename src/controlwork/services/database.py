@@ -1,21 +1,213 @@
 from __future__ import annotations
 
 import json
+import logging
+import queue
+import re
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    journal_mode: str
+    synchronous: str
+    cache_size_kib: int
+    mmap_size: int
+    temp_store: str
+    wal_autocheckpoint: int
+    flush_interval_sec: float
+
+
+CONNECTION_PROFILES: dict[str, ConnectionProfile] = {
+    "durable": ConnectionProfile("WAL", "FULL", 2048, 0, "DEFAULT", 1000, 1.0),
+    "balanced": ConnectionProfile("WAL", "NORMAL", 4096, 16 * 1024 * 1024, "MEMORY", 4000, 10.0),
+    "battery": ConnectionProfile("WAL", "NORMAL", 8192, 64 * 1024 * 1024, "MEMORY", 16000, 60.0),
+}
+
+_logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+
+_EPOCH_COLUMNS = (
+    ("sessions", "started_at", "started_epoch"),
+    ("reminder_events", "ts", "ts_epoch"),
+    ("break_events", "started_at", "started_epoch"),
+)
+
+ROLLUP_COLUMNS = (
+    "active_sec",
+    "idle_sec",
+    "break_sec",
+    "shown",
+    "snoozes",
+    "skips",
+    "ignores",
+    "completed_breaks",
+)
+
+_ROLLUP_SOURCES = (
+    ("sessions", "started_epoch", ("active_sec", "idle_sec", "break_sec", "0", "0", "0", "0", "0")),
+    (
+        "reminder_events",
+        "ts_epoch",
+        (
+            "0",
+            "0",
+            "0",
+            "action_taken = 'shown'",
+            "action_taken = 'snooze'",
+            "action_taken = 'skip'",
+            "action_taken = 'ignore'",
+            "0",
+        ),
+    ),
+    ("break_events", "started_epoch", ("0", "0", "0", "0", "0", "0", "0", "completed")),
+)
+
+_ROLLUP_RESET_TIME_KEY = "daily_rollups_reset_time"
+_SETTINGS_RESET_TIME_KEY = "workday_reset_time"
+_DEFAULT_RESET_TIME = "04:00"
+
+_MIGRATION_BATCH_ROWS = 50_000
+
+_MIGRATIONS = (
+    (1, "base schema", "_migrate_base_schema"),
+    (2, "epoch timestamp columns", "_migrate_epoch_columns"),
+    (3, "daily rollups", "_migrate_daily_rollups"),
+    (4, "learning reviews", "_migrate_learning_reviews"),
+)
+
+
+@dataclass(frozen=True)
+class MigrationProgress:
+    version: int
+    description: str
+    done: int
+    total: int
+
+
+class DatabaseWriteError(RuntimeError):
+    pass
+
+
+def to_epoch(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _ONE_SECOND
 
 
 class Database:
-    def __init__(self, path: Path) -> None:
-        self._conn = sqlite3.connect(path)
+    """SQLite persistence with a write-behind journal for per-tick mutations.
+
+    Session totals, break idle streaks, reminder events, learning card reviews
+    and changed cache values are buffered in memory (repeated updates to the
+    same row coalesce, cache values equal to the stored ones are dropped) and
+    written in a single transaction once ``flush_interval_sec`` has elapsed
+    since the previous commit, on ``flush()`` and before any immediate write or
+    read. As long as the owner keeps mutating (the tracker does so every tick),
+    a crash loses at most ``flush_interval_sec`` seconds of buffered
+    accounting. When no interval is given, the one from the connection profile
+    is used.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval_sec: float | None = None,
+        time_fn: Callable[[], float] = time.monotonic,
+        profile: str = "balanced",
+        progress: Callable[[MigrationProgress], None] | None = None,
+        check_same_thread: bool = True,
+    ) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=check_same_thread)
         self._conn.row_factory = sqlite3.Row
-        self._ensure_schema()
+        self._progress = progress
+        self._time_fn = time_fn
+        self._pending_sessions: dict[int, tuple[int, int, int]] = {}
+        self._pending_breaks: dict[int, int] = {}
+        self._pending_reminders: list[tuple[str, int, str, int, str]] = []
+        self._pending_rollups: dict[str, dict[str, int]] = {}
+        self._pending_app_values: dict[str, str] = {}
+        self._pending_reviews: dict[str, tuple[int, int, float, int, int]] = {}
+        self._app_values: dict[str, str] = {}
+        self.app_values_requested = 0
+        self.app_rows_written = 0
+        self._last_flush_at = time_fn()
+        self.apply_profile(profile)
+        if flush_interval_sec is not None:
+            self._flush_interval_sec = max(0.0, float(flush_interval_sec))
+        self._migrate()
+        self.app_values_requested = 0
+        self.app_rows_written = 0
+        self._app_values = {
+            row["key"]: row["value_json"] for row in self._conn.execute("SELECT key, value_json FROM app_settings")
+        }
 
     def close(self) -> None:
+        self.flush()
         self._conn.close()
 
-    def _ensure_schema(self) -> None:
+    def flush(self) -> None:
+        if self.has_pending_writes():
+            self._write_pending()
+            self._conn.commit()
+        self._last_flush_at = self._time_fn()
+
+    def has_pending_writes(self) -> bool:
+        return bool(
+            self._pending_sessions
+            or self._pending_breaks
+            or self._pending_reminders
+            or self._pending_rollups
+            or self._pending_app_values
+            or self._pending_reviews
+        )
+
+    def apply_profile(self, name: str) -> ConnectionProfile:
+        profile = CONNECTION_PROFILES.get(name)
+        if profile is None:
+            raise ValueError(f"unknown connection profile: {name}")
+        self.flush()
+        self._conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+        self._conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+        self._conn.execute(f"PRAGMA cache_size = {-profile.cache_size_kib}")
+        self._conn.execute(f"PRAGMA mmap_size = {profile.mmap_size}")
+        self._conn.execute(f"PRAGMA temp_store = {profile.temp_store}")
+        self._conn.execute(f"PRAGMA wal_autocheckpoint = {profile.wal_autocheckpoint}")
+        self.profile = profile
+        self._flush_interval_sec = profile.flush_interval_sec
+        return profile
+
+    def checkpoint(self) -> None:
+        self.flush()
+        self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def schema_version(self) -> int:
+        return int(self._conn.execute("PRAGMA user_version").fetchone()[0])
+
+    def _migrate(self) -> None:
+        current = self.schema_version()
+        for version, description, step_name in _MIGRATIONS:
+            if version <= current:
+                continue
+
+            def report(done: int, total: int, version: int = version, description: str = description) -> None:
+                if self._progress is not None:
+                    self._progress(MigrationProgress(version, description, done, total))
+
+            getattr(self, step_name)(report)
+            self._conn.execute(f"PRAGMA user_version = {version}")
+            self._conn.commit()
+
+    def _migrate_base_schema(self, report: Callable[[int, int], None]) -> None:
         self._conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS sessions (
@@ -49,147 +241,562 @@ class Database:
             );
             """
         )
+        report(1, 1)
+
+    def _migrate_epoch_columns(self, report: Callable[[int, int], None]) -> None:
+        for table, _, epoch_column in _EPOCH_COLUMNS:
+            if not self._has_column(table, epoch_column):
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {epoch_column} INTEGER")
         self._conn.commit()
 
+        bounds = [
+            int(self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0])
+            for table, _, _ in _EPOCH_COLUMNS
+        ]
+        total = sum(bounds)
+        done = 0
+        report(done, total)
+        for (table, text_column, epoch_column), max_id in zip(_EPOCH_COLUMNS, bounds):
+            for low in range(0, max_id, _MIGRATION_BATCH_ROWS):
+                high = min(max_id, low + _MIGRATION_BATCH_ROWS)
+                self._conn.execute(
+                    f"""
+                    UPDATE {table}
+                       SET {epoch_column} = CAST(strftime('%s', {text_column}) AS INTEGER)
+                     WHERE id > ? AND id <= ? AND {epoch_column} IS NULL
+                    """,
+                    (low, high),
+                )
+                self._conn.commit()
+                done += high - low
+                report(done, total)
+
+        self._conn.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS idx_sessions_started_epoch
+              ON sessions(started_epoch, active_sec, idle_sec, break_sec);
+            CREATE INDEX IF NOT EXISTS idx_reminder_events_ts_epoch_action
+              ON reminder_events(ts_epoch, action_taken);
+            CREATE INDEX IF NOT EXISTS idx_break_events_started_epoch
+              ON break_events(started_epoch);
+            """
+        )
+
+    def _migrate_daily_rollups(self, report: Callable[[int, int], None]) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+              day_key TEXT PRIMARY KEY,
+              active_sec INTEGER NOT NULL DEFAULT 0,
+              idle_sec INTEGER NOT NULL DEFAULT 0,
+              break_sec INTEGER NOT NULL DEFAULT 0,
+              shown INTEGER NOT NULL DEFAULT 0,
+              snoozes INTEGER NOT NULL DEFAULT 0,
+              skips INTEGER NOT NULL DEFAULT 0,
+              ignores INTEGER NOT NULL DEFAULT 0,
+              completed_breaks INTEGER NOT NULL DEFAULT 0
+            );
+            """
+        )
+        reset_time = _DEFAULT_RESET_TIME
+        row = self._conn.execute("SELECT value_json FROM app_settings WHERE key = ?", (_SETTINGS_RESET_TIME_KEY,)).fetchone()
+        if row is not None:
+            try:
+                cached = json.loads(row["value_json"])
+            except json.JSONDecodeError:
+                cached = None
+            if isinstance(cached, str) and re.fullmatch(r"\d{1,2}:\d{2}", cached):
+                reset_time = cached
+        self.rebuild_daily_rollups(reset_time, report)
+
+    def _migrate_learning_reviews(self, report: Callable[[int, int], None]) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS learning_reviews (
+              card_id TEXT PRIMARY KEY,
+              due_epoch INTEGER NOT NULL,
+              interval_sec INTEGER NOT NULL DEFAULT 0,
+              ease REAL NOT NULL DEFAULT 2.5,
+              repetitions INTEGER NOT NULL DEFAULT 0,
+              lapses INTEGER NOT NULL DEFAULT 0
+            );
+            """
+        )
+        report(1, 1)
+
+    def _has_column(self, table: str, column: str) -> bool:
+        return any(row["name"] == column for row in self._conn.execute(f"PRAGMA table_info({table})"))
+
     def close_open_sessions(self, ended_at: datetime) -> None:
-        self._conn.execute(
+        self._execute_now(
             "UPDATE sessions SET ended_at = ? WHERE ended_at IS NULL",
             (ended_at.isoformat(),),
         )
-        self._conn.commit()
 
     def create_session(self, started_at: datetime) -> int:
-        cur = self._conn.execute(
-            "INSERT INTO sessions(started_at) VALUES (?)",
-            (started_at.isoformat(),),
+        cur = self._execute_now(
+            "INSERT INTO sessions(started_at, started_epoch) VALUES (?, ?)",
+            (started_at.isoformat(), to_epoch(started_at)),
         )
-        self._conn.commit()
         return int(cur.lastrowid)
 
     def update_session_totals(self, session_id: int, active_sec: int, idle_sec: int, break_sec: int) -> None:
-        self._conn.execute(
-            """
-            UPDATE sessions
-               SET active_sec = ?, idle_sec = ?, break_sec = ?
-             WHERE id = ?
-            """,
-            (active_sec, idle_sec, break_sec, session_id),
-        )
-        self._conn.commit()
+        self._pending_sessions[session_id] = (active_sec, idle_sec, break_sec)
+        self._flush_if_due()
 
     def close_session(self, session_id: int, ended_at: datetime) -> None:
-        self._conn.execute(
+        self._execute_now(
             "UPDATE sessions SET ended_at = ? WHERE id = ?",
             (ended_at.isoformat(), session_id),
         )
-        self._conn.commit()
 
     def log_reminder(self, ts: datetime, event_type: str, point_min: int, action_taken: str) -> None:
-        self._conn.execute(
-            "INSERT INTO reminder_events(ts, type, point_min, action_taken) VALUES (?,?,?,?)",
-            (ts.isoformat(), event_type, point_min, action_taken),
-        )
-        self._conn.commit()
+        self._pending_reminders.append((ts.isoformat(), to_epoch(ts), event_type, point_min, action_taken))
+        self._flush_if_due()
 
     def start_break_event(self, started_at: datetime) -> int:
-        cur = self._conn.execute(
-            "INSERT INTO break_events(started_at) VALUES (?)",
-            (started_at.isoformat(),),
+        cur = self._execute_now(
+            "INSERT INTO break_events(started_at, started_epoch) VALUES (?, ?)",
+            (started_at.isoformat(), to_epoch(started_at)),
         )
-        self._conn.commit()
         return int(cur.lastrowid)
 
     def update_break_event(self, break_id: int, valid_idle_sec: int) -> None:
-        self._conn.execute(
-            "UPDATE break_events SET valid_idle_sec = ? WHERE id = ?",
-            (valid_idle_sec, break_id),
-        )
-        self._conn.commit()
+        self._pending_breaks[break_id] = valid_idle_sec
+        self._flush_if_due()
 
     def close_break_event(self, break_id: int, ended_at: datetime, completed: bool) -> None:
-        self._conn.execute(
+        self._execute_now(
             "UPDATE break_events SET ended_at = ?, completed = ? WHERE id = ?",
             (ended_at.isoformat(), 1 if completed else 0, break_id),
         )
-        self._conn.commit()
 
-    def get_today_stats(self, start_dt: datetime, end_dt: datetime) -> dict[str, int]:
-        range_params = (start_dt.isoformat(), end_dt.isoformat())
-        session_row = self._conn.execute(
-            """
-            SELECT
-              COALESCE(SUM(active_sec), 0) AS active_sec,
-              COALESCE(SUM(idle_sec), 0) AS idle_sec,
-              COALESCE(SUM(break_sec), 0) AS break_sec
-            FROM sessions
-            WHERE started_at >= ? AND started_at < ?
-            """,
-            range_params,
-        ).fetchone()
+    def add_rollup(self, day_key: str, **deltas: int) -> None:
+        pending = self._pending_rollups.get(day_key)
+        if pending is None:
+            pending = self._pending_rollups[day_key] = dict.fromkeys(ROLLUP_COLUMNS, 0)
+        for column, delta in deltas.items():
+            pending[column] += delta
+        self._flush_if_due()
 
-        reminder_rows = self._conn.execute(
-            """
-            SELECT action_taken, COUNT(*) AS cnt
-            FROM reminder_events
-            WHERE ts >= ? AND ts < ?
-            GROUP BY action_taken
+    def get_daily_rollup(self, day_key: str) -> dict[str, int]:
+        rollups = self.get_daily_rollups(day_key, day_key)
+        return rollups[0] if rollups else {"day_key": day_key, **dict.fromkeys(ROLLUP_COLUMNS, 0)}
+
+    def get_daily_rollups(self, first_day_key: str, last_day_key: str) -> list[dict[str, object]]:
+        self.flush()
+        rows = self._conn.execute(
+            f"""
+            SELECT day_key, {", ".join(ROLLUP_COLUMNS)}
+            FROM daily_rollups
+            WHERE day_key >= ? AND day_key <= ?
+            ORDER BY day_key
             """,
-            range_params,
+            (first_day_key, last_day_key),
         ).fetchall()
+        return [dict(row) for row in rows]
+
+    def ensure_daily_rollups(self, workday_reset_time: str) -> None:
+        if self.load_app_cache_value(_ROLLUP_RESET_TIME_KEY) != workday_reset_time:
+            self.rebuild_daily_rollups(workday_reset_time)
+
+    def rebuild_daily_rollups(
+        self,
+        workday_reset_time: str,
+        report: Callable[[int, int], None] | None = None,
+    ) -> None:
+        hh, mm = [int(part) for part in workday_reset_time.split(":")]
+        offset_sec = (hh * 60 + mm) * 60
+        day_key = f"strftime('%Y-%m-%dT', {{}} - {offset_sec}, 'unixepoch') || '{hh:02d}:{mm:02d}:00'"
+
+        self.flush()
+        self._conn.execute("DELETE FROM daily_rollups")
+        self._conn.commit()
+        bounds = [
+            int(self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0])
+            for table, _, _ in _ROLLUP_SOURCES
+        ]
+        total = sum(bounds)
+        done = 0
+        if report is not None:
+            report(done, total)
+        for (table, epoch_column, values), max_id in zip(_ROLLUP_SOURCES, bounds):
+            columns = ", ".join(f"{value} AS {column}" for value, column in zip(values, ROLLUP_COLUMNS))
+            for low in range(0, max_id, _MIGRATION_BATCH_ROWS):
+                high = min(max_id, low + _MIGRATION_BATCH_ROWS)
+                self._conn.execute(
+                    f"""
+                    INSERT INTO daily_rollups(day_key, {", ".join(ROLLUP_COLUMNS)})
+                    SELECT day_key, {", ".join(f"SUM({column})" for column in ROLLUP_COLUMNS)}
+                      FROM (
+                        SELECT {day_key.format(epoch_column)} AS day_key, {columns}
+                          FROM {table}
+                         WHERE id > ? AND id <= ?
+                      )
+                     WHERE true
+                     GROUP BY day_key
+                    ON CONFLICT(day_key)
+                    DO UPDATE SET {", ".join(f"{column} = {column} + excluded.{column}" for column in ROLLUP_COLUMNS)}
+                    """,
+                    (low, high),
+                )
+                self._conn.commit()
+                done += high - low
+                if report is not None:
+                    report(done, total)
+        self._stage_app_value(_ROLLUP_RESET_TIME_KEY, workday_reset_time)
+        self._write_pending()
+        self._commit()
+
+    def save_settings_cache(self, payload: dict[str, object]) -> None:
+        changed = [key for key, value in list(payload.items()) if self._stage_app_value(key, value)]
+        if changed:
+            self.flush()
+
+    def save_app_cache_value(self, key: str, value: object) -> None:
+        if self._stage_app_value(key, value):
+            self._flush_if_due()
+
+    def load_app_cache_value(self, key: str) -> object | None:
+        raw = self._pending_app_values.get(key, self._app_values.get(key))
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
 
-        action_counts = {row["action_taken"]: int(row["cnt"]) for row in reminder_rows}
+    def save_learning_review(
+        self,
+        card_id: str,
+        due_epoch: int,
+        interval_sec: int,
+        ease: float,
+        repetitions: int,
+        lapses: int,
+    ) -> None:
+        self._pending_reviews[card_id] = (due_epoch, interval_sec, ease, repetitions, lapses)
+        self._flush_if_due()
+
+    def load_learning_reviews(self) -> dict[str, tuple[int, int, float, int, int]]:
+        self.flush()
         return {
-            "active_sec": int(session_row["active_sec"]),
-            "idle_sec": int(session_row["idle_sec"]),
-            "break_sec": int(session_row["break_sec"]),
-            "snoozes": int(action_counts.get("snooze", 0)),
-            "skips": int(action_counts.get("skip", 0)),
+            row["card_id"]: (row["due_epoch"], row["interval_sec"], row["ease"], row["repetitions"], row["lapses"])
+            for row in self._conn.execute(
+                "SELECT card_id, due_epoch, interval_sec, ease, repetitions, lapses FROM learning_reviews"
+            )
         }
 
-    def get_skip_count(self, start_dt: datetime, end_dt: datetime) -> int:
-        row = self._conn.execute(
-            """
-            SELECT COUNT(*) AS cnt
-            FROM reminder_events
-            WHERE ts >= ? AND ts < ? AND action_taken = 'skip'
-            """,
-            (start_dt.isoformat(), end_dt.isoformat()),
-        ).fetchone()
-        return int(row["cnt"])
+    def _stage_app_value(self, key: str, value: object) -> bool:
+        self.app_values_requested += 1
+        raw = json.dumps(value, ensure_ascii=False)
+        if self._pending_app_values.get(key, self._app_values.get(key)) == raw:
+            return False
+        self._pending_app_values[key] = raw
+        return True
 
-    def save_settings_cache(self, payload: dict[str, object]) -> None:
-        for key, value in payload.items():
-            self._conn.execute(
+    def _execute_now(self, sql: str, params: tuple[object, ...]) -> sqlite3.Cursor:
+        self._write_pending()
+        cur = self._conn.execute(sql, params)
+        self._commit()
+        return cur
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._last_flush_at = self._time_fn()
+
+    def _flush_if_due(self) -> None:
+        if self._time_fn() - self._last_flush_at >= self._flush_interval_sec:
+            self.flush()
+
+    def _write_pending(self) -> None:
+        if self._pending_sessions:
+            self._conn.executemany(
+                """
+                UPDATE sessions
+                   SET active_sec = ?, idle_sec = ?, break_sec = ?
+                 WHERE id = ?
+                """,
+                [(*totals, session_id) for session_id, totals in self._pending_sessions.items()],
+            )
+            self._pending_sessions.clear()
+        if self._pending_breaks:
+            self._conn.executemany(
+                "UPDATE break_events SET valid_idle_sec = ? WHERE id = ?",
+                [(valid_idle_sec, break_id) for break_id, valid_idle_sec in self._pending_breaks.items()],
+            )
+            self._pending_breaks.clear()
+        if self._pending_reminders:
+            self._conn.executemany(
+                "INSERT INTO reminder_events(ts, ts_epoch, type, point_min, action_taken) VALUES (?,?,?,?,?)",
+                self._pending_reminders,
+            )
+            self._pending_reminders.clear()
+        if self._pending_rollups:
+            self._conn.executemany(
+                f"""
+                INSERT INTO daily_rollups(day_key, {", ".join(ROLLUP_COLUMNS)})
+                VALUES (?, {", ".join("?" for _ in ROLLUP_COLUMNS)})
+                ON CONFLICT(day_key)
+                DO UPDATE SET {", ".join(f"{column} = {column} + excluded.{column}" for column in ROLLUP_COLUMNS)}
+                """,
+                [
+                    (day_key, *(deltas[column] for column in ROLLUP_COLUMNS))
+                    for day_key, deltas in self._pending_rollups.items()
+                ],
+            )
+            self._pending_rollups.clear()
+        if self._pending_app_values:
+            self._conn.executemany(
                 """
                 INSERT INTO app_settings(key, value_json)
                 VALUES(?, ?)
                 ON CONFLICT(key)
                 DO UPDATE SET value_json = excluded.value_json
                 """,
-                (key, json.dumps(value, ensure_ascii=False)),
+                list(self._pending_app_values.items()),
             )
-        self._conn.commit()
+            self.app_rows_written += len(self._pending_app_values)
+            self._app_values.update(self._pending_app_values)
+            self._pending_app_values.clear()
+        if self._pending_reviews:
+            self._conn.executemany(
+                """
+                INSERT INTO learning_reviews(card_id, due_epoch, interval_sec, ease, repetitions, lapses)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(card_id)
+                DO UPDATE SET due_epoch = excluded.due_epoch,
+                              interval_sec = excluded.interval_sec,
+                              ease = excluded.ease,
+                              repetitions = excluded.repetitions,
+                              lapses = excluded.lapses
+                """,
+                [(card_id, *state) for card_id, state in self._pending_reviews.items()],
+            )
+            self._pending_reviews.clear()
 
-    def save_app_cache_value(self, key: str, value: object) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO app_settings(key, value_json)
-            VALUES(?, ?)
-            ON CONFLICT(key)
-            DO UPDATE SET value_json = excluded.value_json
-            """,
-            (key, json.dumps(value, ensure_ascii=False)),
+
+_Command = Tuple[str, Tuple[object, ...], Dict[str, object], Optional["Future[object]"]]
+
+
+class BackgroundDatabase:
+    """Runs ``Database`` writes on a dedicated writer thread.
+
+    Mutations are queued on a bounded queue and return immediately; calls that
+    need a result (new row ids, fresh cache reads) wait on a future. Session and
+    break total updates, cache values and learning reviews supersede each other,
+    so only the latest value per row or key is kept and they never wait for
+    queue space; every other command blocks while the queue is full. Stats
+    reads use a separate connection and see data as of the last write-behind
+    flush. A failed fire-and-forget command is logged and raised as
+    ``DatabaseWriteError`` from the next ``submit()`` or from ``close()``.
+    """
+
+    _COALESCIBLE = frozenset(
+        {"update_session_totals", "update_break_event", "save_app_cache_value", "save_learning_review"}
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        max_queue: int = 1024,
+        profile: str = "balanced",
+        flush_interval_sec: float | None = None,
+        progress: Callable[[MigrationProgress], None] | None = None,
+    ) -> None:
+        self._database = Database(
+            path,
+            flush_interval_sec=flush_interval_sec,
+            profile=profile,
+            progress=progress,
+            check_same_thread=False,
         )
-        self._conn.commit()
+        self._reader = Database(path, profile=profile)
+        self._queue: queue.Queue[_Command | None] = queue.Queue(maxsize=max(1, max_queue))
+        self._latest: dict[tuple[str, object], tuple[object, ...]] = {}
+        self._latest_lock = threading.Lock()
+        self._closed = False
+        self.coalesced_commands = 0
+        self.failed_commands = 0
+        self.last_error: BaseException | None = None
+        self._unreported_error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="controlwork-db-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def profile(self) -> ConnectionProfile:
+        return self._database.profile
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._reader.close()
+        self._raise_unreported_error()
+
+    def submit(self, name: str, *args: object, **kwargs: object) -> Future[object]:
+        self._raise_unreported_error()
+        future: Future[object] = Future()
+        self._put((name, args, kwargs, future))
+        return future
+
+    def flush(self) -> None:
+        self._post("flush")
+
+    def checkpoint(self) -> None:
+        self._post("checkpoint")
+
+    def apply_profile(self, name: str) -> ConnectionProfile:
+        self._reader.apply_profile(name)
+        return self.submit("apply_profile", name).result()  # type: ignore[return-value]
+
+    def has_pending_writes(self) -> bool:
+        return bool(self.submit("has_pending_writes").result())
+
+    def schema_version(self) -> int:
+        return self._reader.schema_version()
+
+    def close_open_sessions(self, ended_at: datetime) -> None:
+        self._post("close_open_sessions", ended_at)
+
+    def create_session(self, started_at: datetime) -> int:
+        return int(self.submit("create_session", started_at).result())  # type: ignore[arg-type]
+
+    def update_session_totals(self, session_id: int, active_sec: int, idle_sec: int, break_sec: int) -> None:
+        self._post("update_session_totals", session_id, active_sec, idle_sec, break_sec)
+
+    def close_session(self, session_id: int, ended_at: datetime) -> None:
+        self._post("close_session", session_id, ended_at)
+
+    def log_reminder(self, ts: datetime, event_type: str, point_min: int, action_taken: str) -> None:
+        self._post("log_reminder", ts, event_type, point_min, action_taken)
+
+    def start_break_event(self, started_at: datetime) -> int:
+        return int(self.submit("start_break_event", started_at).result())  # type: ignore[arg-type]
+
+    def update_break_event(self, break_id: int, valid_idle_sec: int) -> None:
+        self._post("update_break_event", break_id, valid_idle_sec)
+
+    def close_break_event(self, break_id: int, ended_at: datetime, completed: bool) -> None:
+        self._post("close_break_event", break_id, ended_at, completed)
+
+    def add_rollup(self, day_key: str, **deltas: int) -> None:
+        self._post("add_rollup", day_key, **deltas)
+
+    def get_daily_rollup(self, day_key: str) -> dict[str, int]:
+        return self._reader.get_daily_rollup(day_key)
+
+    def get_daily_rollups(self, first_day_key: str, last_day_key: str) -> list[dict[str, object]]:
+        return self._reader.get_daily_rollups(first_day_key, last_day_key)
+
+    def ensure_daily_rollups(self, workday_reset_time: str) -> None:
+        self.submit("ensure_daily_rollups", workday_reset_time).result()
+
+    def rebuild_daily_rollups(self, workday_reset_time: str) -> None:
+        self.submit("rebuild_daily_rollups", workday_reset_time).result()
+
+    def save_settings_cache(self, payload: dict[str, object]) -> None:
+        self._post("save_settings_cache", dict(payload))
+
+    def save_app_cache_value(self, key: str, value: object) -> None:
+        self._post("save_app_cache_value", key, value)
 
     def load_app_cache_value(self, key: str) -> object | None:
-        row = self._conn.execute(
-            "SELECT value_json FROM app_settings WHERE key = ?",
-            (key,),
-        ).fetchone()
-        if row is None:
-            return None
+        return self.submit("load_app_cache_value", key).result()
+
+    def save_learning_review(
+        self,
+        card_id: str,
+        due_epoch: int,
+        interval_sec: int,
+        ease: float,
+        repetitions: int,
+        lapses: int,
+    ) -> None:
+        self._post("save_learning_review", card_id, due_epoch, interval_sec, ease, repetitions, lapses)
+
+    def load_learning_reviews(self) -> dict[str, tuple[int, int, float, int, int]]:
+        return self.submit("load_learning_reviews").result()  # type: ignore[return-value]
+
+    def _post(self, name: str, *args: object, **kwargs: object) -> None:
+        if name in self._COALESCIBLE:
+            if self._closed:
+                raise RuntimeError("database writer is closed")
+            with self._latest_lock:
+                superseded = (name, args[0]) in self._latest
+                self._latest[(name, args[0])] = args
+            if superseded:
+                self.coalesced_commands += 1
+                return
+            try:
+                self._queue.put_nowait(("_apply_latest", (), {}, None))
+            except queue.Full:
+                pass
+            return
+        self._put((name, args, kwargs, None))
+
+    def _put(self, command: _Command) -> None:
+        if self._closed:
+            raise RuntimeError("database writer is closed")
+        self._queue.put(command)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                command = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                self._apply_latest()
+                self._database._flush_if_due()
+                continue
+            if command is None:
+                break
+            if command[0] != "_apply_latest":
+                self._execute(*command)
+            self._apply_latest()
+        self._apply_latest()
         try:
-            return json.loads(row["value_json"])
-        except json.JSONDecodeError:
-            return None
+            self._database.close()
+        except Exception as exc:
+            self._record_failure("close", exc)
+
+    def _record_failure(self, name: str, exc: BaseException) -> None:
+        self.failed_commands += 1
+        self.last_error = exc
+        self._unreported_error = exc
+        _logger.error("background database command %s failed", name, exc_info=exc)
+
+    def _raise_unreported_error(self) -> None:
+        exc, self._unreported_error = self._unreported_error, None
+        if exc is not None:
+            raise DatabaseWriteError(f"background database write failed: {exc!r}") from exc
+
+    def _apply_latest(self) -> None:
+        if not self._latest:
+            return
+        with self._latest_lock:
+            pending = list(self._latest.items())
+            self._latest.clear()
+        for (name, _), args in pending:
+            self._execute(name, args, {}, None)
+
+    def _execute(
+        self,
+        name: str,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+        future: Future[object] | None,
+    ) -> None:
+        try:
+            result = getattr(self._database, name)(*args, **kwargs)
+        except BaseException as exc:
+            if future is not None:
+                self.failed_commands += 1
+                self.last_error = exc
+                future.set_exception(exc)
+            else:
+                self._record_failure(name, exc)
+            return
+        if future is not None:
+            future.set_result(result)
@@ -1,49 +1,101 @@
 from __future__ import annotations
 
 import ctypes
+import ctypes.util
+import os
 import platform
 import subprocess
+import threading
+import time
 from dataclasses import dataclass
+from typing import Callable, Mapping
 
 
 class IdleProvider:
+    name = "none"
+
     def get_idle_seconds(self) -> int:
+        value = self.query_idle_seconds()
+        return 0 if value is None else value
+
+    def query_idle_seconds(self) -> int | None:
         return 0
 
 
-@dataclass
+class _LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", ctypes.c_uint),
+        ("dwTime", ctypes.c_uint),
+    ]
+
+
 class WindowsIdleProvider(IdleProvider):
-    def get_idle_seconds(self) -> int:
-        class LASTINPUTINFO(ctypes.Structure):
-            _fields_ = [
-                ("cbSize", ctypes.c_uint),
-                ("dwTime", ctypes.c_uint),
-            ]
-
-        user32 = ctypes.windll.user32
-        kernel32 = ctypes.windll.kernel32
-        info = LASTINPUTINFO()
-        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
-        if not user32.GetLastInputInfo(ctypes.byref(info)):
-            return 0
-        tick_count = kernel32.GetTickCount()
-        elapsed_ms = tick_count - info.dwTime
+    name = "win32"
+
+    def __init__(self) -> None:
+        self._user32 = ctypes.windll.user32  # type: ignore[attr-defined]
+        self._kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        self._info = _LASTINPUTINFO()
+        self._info.cbSize = ctypes.sizeof(_LASTINPUTINFO)
+
+    def query_idle_seconds(self) -> int | None:
+        if not self._user32.GetLastInputInfo(ctypes.byref(self._info)):
+            return None
+        tick_count = self._kernel32.GetTickCount()
+        elapsed_ms = tick_count - self._info.dwTime
         return max(0, int(elapsed_ms / 1000))
 
 
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [
+        ("window", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+        ("kind", ctypes.c_int),
+        ("til_or_since", ctypes.c_ulong),
+        ("idle", ctypes.c_ulong),
+        ("event_mask", ctypes.c_ulong),
+    ]
+
+
+class XScreenSaverIdleProvider(IdleProvider):
+    name = "xss"
+
+    def __init__(self) -> None:
+        x11_path = ctypes.util.find_library("X11")
+        xss_path = ctypes.util.find_library("Xss")
+        if x11_path is None or xss_path is None:
+            raise OSError("libX11/libXss not found")
+        self._x11 = ctypes.cdll.LoadLibrary(x11_path)
+        self._xss = ctypes.cdll.LoadLibrary(xss_path)
+        self._x11.XOpenDisplay.restype = ctypes.c_void_p
+        self._x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(_XScreenSaverInfo)
+        self._xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_ulong,
+            ctypes.POINTER(_XScreenSaverInfo),
+        ]
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        self._root = self._x11.XDefaultRootWindow(self._display)
+        self._info = self._xss.XScreenSaverAllocInfo()
+        if not self._info:
+            raise OSError("XScreenSaverAllocInfo failed")
+
+    def query_idle_seconds(self) -> int | None:
+        if not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info):
+            return None
+        return max(0, int(self._info.contents.idle / 1000))
+
+
 @dataclass
-class LinuxIdleProvider(IdleProvider):
-    def get_idle_seconds(self) -> int:
-        dbus_value = self._get_idle_via_screensaver_dbus()
-        if dbus_value is not None:
-            return dbus_value
-        x11_value = self._get_idle_via_xprintidle()
-        if x11_value is not None:
-            return x11_value
-        return 0
+class DBusScreenSaverIdleProvider(IdleProvider):
+    name = "dbus-send"
 
-    @staticmethod
-    def _get_idle_via_screensaver_dbus() -> int | None:
+    def query_idle_seconds(self) -> int | None:
         cmd = [
             "dbus-send",
             "--session",
@@ -65,8 +117,12 @@ class LinuxIdleProvider(IdleProvider):
                 return max(0, int(value / 1000))
         return None
 
-    @staticmethod
-    def _get_idle_via_xprintidle() -> int | None:
+
+@dataclass
+class XPrintIdleProvider(IdleProvider):
+    name = "xprintidle"
+
+    def query_idle_seconds(self) -> int | None:
         try:
             proc = subprocess.run(["xprintidle"], capture_output=True, text=True, check=False, timeout=0.3)
         except (OSError, subprocess.SubprocessError):
@@ -79,10 +135,188 @@ class LinuxIdleProvider(IdleProvider):
             return None
 
 
+class IdleProviderChain(IdleProvider):
+    def __init__(
+        self,
+        backends: list[IdleProvider],
+        time_fn: Callable[[], float] = time.monotonic,
+        initial_backoff_sec: float = 1.0,
+        max_backoff_sec: float = 300.0,
+    ) -> None:
+        self.backends = list(backends)
+        self.active: IdleProvider | None = None
+        self.latency_sec: dict[str, float] = {}
+        self.failures: dict[str, int] = {}
+        self._time_fn = time_fn
+        self._initial_backoff_sec = initial_backoff_sec
+        self._max_backoff_sec = max_backoff_sec
+        self._retry_at: list[float] = [0.0] * len(self.backends)
+        self.query_idle_seconds()
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return "none" if self.active is None else self.active.name
+
+    @property
+    def active_latency_sec(self) -> float | None:
+        return None if self.active is None else self.latency_sec.get(self.active.name)
+
+    def query_idle_seconds(self) -> int | None:
+        now = self._time_fn()
+        for index, backend in enumerate(self.backends):
+            if self._retry_at[index] > now:
+                continue
+            started = time.perf_counter()
+            value = backend.query_idle_seconds()
+            latency = time.perf_counter() - started
+            previous = self.latency_sec.get(backend.name)
+            self.latency_sec[backend.name] = latency if previous is None else previous * 0.8 + latency * 0.2
+            if value is None:
+                failures = self.failures.get(backend.name, 0) + 1
+                self.failures[backend.name] = failures
+                backoff = min(self._max_backoff_sec, self._initial_backoff_sec * 2 ** (failures - 1))
+                self._retry_at[index] = now + backoff
+                continue
+            self.failures[backend.name] = 0
+            self.active = backend
+            return value
+        self.active = None
+        return None
+
+
+class LinuxIdleProvider(IdleProviderChain):
+    def __init__(self, backends: list[IdleProvider] | None = None, **kwargs: object) -> None:
+        super().__init__(linux_idle_backends() if backends is None else backends, **kwargs)  # type: ignore[arg-type]
+
+
+def is_wayland_session(environ: Mapping[str, str] | None = None) -> bool:
+    environ = os.environ if environ is None else environ
+    return bool(environ.get("WAYLAND_DISPLAY")) or environ.get("XDG_SESSION_TYPE", "").lower() == "wayland"
+
+
+def linux_idle_backends(environ: Mapping[str, str] | None = None) -> list[IdleProvider]:
+    # Under Wayland, XWayland answers XScreenSaver queries but only sees input
+    # sent to X11 clients, so the compositor's D-Bus service has to come first.
+    backends: list[IdleProvider] = []
+    try:
+        backends.append(XScreenSaverIdleProvider())
+    except (OSError, AttributeError):
+        pass
+    dbus = DBusScreenSaverIdleProvider()
+    if is_wayland_session(environ):
+        backends.insert(0, dbus)
+    else:
+        backends.append(dbus)
+    backends.append(XPrintIdleProvider())
+    return backends
+
+
+@dataclass(frozen=True)
+class IdleSample:
+    idle_sec: int | None
+    age_sec: float
+    stale: bool
+
+
+class SampledIdleProvider(IdleProvider):
+    def __init__(
+        self,
+        inner: IdleProvider,
+        interval_sec: float = 1.0,
+        stale_after_sec: float | None = None,
+        time_fn: Callable[[], float] = time.monotonic,
+        start: bool = True,
+        lead_sec: float = 0.25,
+        wait_fn: Callable[[threading.Event, float | None], bool] = threading.Event.wait,
+    ) -> None:
+        self.inner = inner
+        self.interval_sec = interval_sec
+        self.stale_after_sec = interval_sec * 3 if stale_after_sec is None else stale_after_sec
+        self.lead_sec = lead_sec
+        self._time_fn = time_fn
+        self._wait_fn = wait_fn
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._period_sec: float | None = interval_sec
+        self._thread: threading.Thread | None = None
+        self._sample: tuple[int | None, float] = (None, float("-inf"))
+        self.on_input: Callable[[], None] | None = None
+        self.sample_now()
+        if start:
+            self.start()
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return self.inner.name
+
+    @property
+    def period_sec(self) -> float | None:
+        return self._period_sec
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._run, name="controlwork-idle-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(1.0, self.interval_sec * 2))
+            self._thread = None
+
+    def follow_tick(self, next_tick_sec: float | None, on_input: Callable[[], None] | None = None) -> None:
+        self.on_input = on_input
+        if on_input is not None:
+            self._period_sec = self.interval_sec
+        elif next_tick_sec is None:
+            self._period_sec = None
+        else:
+            self._period_sec = max(self.interval_sec, next_tick_sec - self.lead_sec)
+        self._wakeup.set()
+
+    def sample_now(self) -> None:
+        try:
+            value = self.inner.query_idle_seconds()
+        except Exception:
+            value = None
+        previous = self._sample[0]
+        self._sample = (value, self._time_fn())
+        callback = self.on_input
+        if callback is not None and value is not None and previous is not None and value < previous:
+            self.on_input = None
+            callback()
+
+    def latest_sample(self) -> IdleSample:
+        value, taken_at = self._sample
+        age_sec = max(0.0, self._time_fn() - taken_at)
+        period_sec = self.interval_sec if self._period_sec is None else self._period_sec
+        return IdleSample(value, age_sec, age_sec > self.stale_after_sec + period_sec - self.interval_sec)
+
+    def query_idle_seconds(self) -> int | None:
+        sample = self.latest_sample()
+        return None if sample.stale else sample.idle_sec
+
+    def _run(self) -> None:
+        while True:
+            woken = self._wait_fn(self._wakeup, self._period_sec)
+            if self._stop.is_set():
+                return
+            if not woken:
+                self.sample_now()
+                continue
+            self._wakeup.clear()
+            if self._period_sec is not None and self.latest_sample().stale:
+                self.sample_now()
+
+
 def create_idle_provider() -> IdleProvider:
     system = platform.system()
     if system == "Windows":
-        return WindowsIdleProvider()
+        return IdleProviderChain([WindowsIdleProvider()])
     if system == "Linux":
         return LinuxIdleProvider()
     return IdleProvider()
@@ -17,6 +17,13 @@ class LearningCard:
     example_translation: str | None = None
 
 
+def learning_card_id(card: LearningCard) -> str:
+    return (
+        f"{card.english}|{card.russian}|{card.transcription or ''}|"
+        f"{card.example or ''}|{card.example_translation or ''}"
+    )
+
+
 def validate_learning_cards_payload(payload: object) -> list[LearningCard]:
     if not isinstance(payload, list):
         raise LearningContentError("payload must be a list")
@@ -1,19 +1,79 @@
 from __future__ import annotations
 
+import logging
 import platform
+import re
 import subprocess
-from dataclasses import dataclass
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, TextIO
 
-from PySide6.QtWidgets import QSystemTrayIcon
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QSystemTrayIcon
+
+_logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\{(title|message|urgency)\}")
+
+
+def _executor_field() -> ThreadPoolExecutor:
+    return field(
+        default_factory=lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix="controlwork-notify"),
+        init=False,
+        repr=False,
+    )
+
+
+class NotificationSink:
+    def notify(self, title: str, message: str, critical: bool = False) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
 
 
 @dataclass
-class NotificationService:
+class StreamNotificationSink(NotificationSink):
+    stream: TextIO = field(default_factory=lambda: sys.stdout)
+
+    def notify(self, title: str, message: str, critical: bool = False) -> None:
+        marker = "!" if critical else "-"
+        self.stream.write(f"{datetime.now():%H:%M:%S} {marker} {title}: {message}\n")
+        self.stream.flush()
+
+
+@dataclass
+class CommandNotificationSink(NotificationSink):
+    command: list[str]
+    timeout_sec: float = 5.0
+    _executor: ThreadPoolExecutor = _executor_field()
+
+    def notify(self, title: str, message: str, critical: bool = False) -> None:
+        values = {"title": title, "message": message, "urgency": "critical" if critical else "normal"}
+        args = [_PLACEHOLDER.sub(lambda match: values[match.group(1)], part) for part in self.command]
+        self._executor.submit(self._run, args)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _run(self, args: list[str]) -> None:
+        try:
+            subprocess.run(args, check=False, timeout=self.timeout_sec)
+        except (OSError, subprocess.SubprocessError) as exc:
+            _logger.warning("notification command %r failed: %s", args[0] if args else "", exc)
+
+
+@dataclass
+class NotificationService(NotificationSink):
     tray_icon: QSystemTrayIcon | None = None
 
     def notify(self, title: str, message: str, critical: bool = False) -> None:
         #self._try_native_backend(title, message, critical)
         if self.tray_icon is not None:
+            from PySide6.QtWidgets import QSystemTrayIcon
+
             self.tray_icon.showMessage(
                 title,
                 message,
@@ -63,3 +123,20 @@ class NotificationService:
             notifier.show(toast)
         except Exception:
             return
+
+
+@dataclass
+class DesktopNotificationSink(NotificationService):
+    _executor: ThreadPoolExecutor = _executor_field()
+
+    def notify(self, title: str, message: str, critical: bool = False) -> None:
+        self._executor.submit(self._run, title, message, critical)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _run(self, title: str, message: str, critical: bool) -> None:
+        try:
+            self._try_native_backend(title, message, critical)
+        except Exception:
+            _logger.exception("desktop notification failed")
@@ -1,61 +1,123 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass, field
+from datetime import datetime
 
 from ..models import ReminderEvent
+from .schedule import SNOOZE_POINT, CompiledSchedule, ReminderRule, rules_from_points
 
 
 @dataclass
 class ReminderController:
     soft_points: list[int]
     hard_points: list[int]
-    _extra_soft: list[int] = field(default_factory=list)
-    _extra_hard: list[int] = field(default_factory=list)
-    _fired_soft: set[int] = field(default_factory=set)
-    _fired_hard: set[int] = field(default_factory=set)
+    rules: list[ReminderRule] | None = None
+    _schedule: CompiledSchedule = field(init=False, repr=False)
+    _pending: dict[str, list[tuple[int, int]]] = field(default_factory=dict, init=False, repr=False)
+    _fired: dict[str, set[int]] = field(default_factory=dict, init=False, repr=False)
+    _trigger_counts: dict[str, int] = field(default_factory=dict, init=False, repr=False)
 
-    def evaluate_due_events(self, active_minutes: int) -> list[ReminderEvent]:
+    def __post_init__(self) -> None:
+        self._compile()
+        self.reset_cycle()
+
+    def evaluate_due_events(self, active_minutes: int, now: datetime | None = None) -> list[ReminderEvent]:
         if active_minutes <= 0:
             return []
+        soft_top = self._peek("soft")
+        hard_top = self._peek("hard")
+        if (soft_top is None or soft_top > active_minutes) and (hard_top is None or hard_top > active_minutes):
+            return []
 
-        due: list[ReminderEvent] = []
-        soft_candidates = sorted(set(self.soft_points + self._extra_soft))
-        hard_candidates = sorted(set(self.hard_points + self._extra_hard))
-
-        for point in soft_candidates:
-            if active_minutes >= point and point not in self._fired_soft:
-                self._fired_soft.add(point)
-                due.append(ReminderEvent(event_type="soft", point_min=point))
-
-        for point in hard_candidates:
-            if active_minutes >= point and point not in self._fired_hard:
-                self._fired_hard.add(point)
-                due.append(ReminderEvent(event_type="hard", point_min=point))
-
+        due = [
+            ReminderEvent(event_type=event_type, point_min=point)
+            for event_type in ("soft", "hard")
+            for point in self._pop_due(event_type, active_minutes, now)
+        ]
         due.sort(key=lambda event: (event.point_min, 0 if event.event_type == "soft" else 1))
         return due
 
     def add_snooze(self, event_type: str, current_minute: int, offset_minutes: int = 5) -> None:
         target = max(1, current_minute + offset_minutes)
-        if event_type == "hard":
-            self._extra_hard.append(target)
-        else:
-            self._extra_soft.append(target)
+        kind = "hard" if event_type == "hard" else "soft"
+        if target not in self._fired[kind]:
+            heapq.heappush(self._pending[kind], (target, SNOOZE_POINT))
+        self._record("snooze", current_minute)
+
+    def record_skip(self, current_minute: int) -> None:
+        self._record("skip", current_minute)
 
     def reset_cycle(self) -> None:
-        self._extra_soft.clear()
-        self._extra_hard.clear()
-        self._fired_soft.clear()
-        self._fired_hard.clear()
+        self._pending = {event_type: self._schedule.seed(event_type) for event_type in ("soft", "hard")}
+        self._fired = {"soft": set(), "hard": set()}
+        self._trigger_counts = {"snooze": 0, "skip": 0}
 
-    def update_points(self, soft_points: list[int], hard_points: list[int]) -> None:
+    def update_points(
+        self,
+        soft_points: list[int],
+        hard_points: list[int],
+        rules: list[ReminderRule] | None = None,
+    ) -> None:
         self.soft_points = sorted(set(soft_points))
         self.hard_points = sorted(set(hard_points))
+        self.rules = rules
+        self._compile()
         self.reset_cycle()
 
     def next_hard_point_min(self, active_minutes: int) -> int | None:
-        hard_candidates = sorted(set(self.hard_points + self._extra_hard))
-        for point in hard_candidates:
-            if point > active_minutes and point not in self._fired_hard:
-                return point
-        return None
+        top = self._peek("hard")
+        if top is None or top > active_minutes:
+            return top
+        upcoming = []
+        for point, index in self._pending["hard"]:
+            if point <= active_minutes:
+                next_point = self._schedule.next_after(index, point, active_minutes)
+                if next_point is None:
+                    continue
+                point = next_point
+            if point not in self._fired["hard"]:
+                upcoming.append(point)
+        return min(upcoming) if upcoming else None
+
+    def next_due_point_min(self, active_minutes: int) -> int | None:
+        tops = [top for top in (self._peek("soft"), self._peek("hard")) if top is not None]
+        if not tops:
+            return None
+        return max(min(tops), active_minutes)
+
+    def _compile(self) -> None:
+        rules = self.rules if self.rules is not None else rules_from_points(self.soft_points, self.hard_points)
+        self._schedule = CompiledSchedule(rules)
+
+    def _record(self, trigger: str, current_minute: int) -> None:
+        self._trigger_counts[trigger] += 1
+        for event_type, point, index in self._schedule.activated(
+            trigger, self._trigger_counts[trigger], current_minute
+        ):
+            heapq.heappush(self._pending[event_type], (point, index))
+
+    def _peek(self, event_type: str) -> int | None:
+        heap = self._pending[event_type]
+        fired = self._fired[event_type]
+        while heap and heap[0][0] in fired:
+            point, index = heapq.heappop(heap)
+            next_point = self._schedule.next_after(index, point, point)
+            if next_point is not None:
+                heapq.heappush(heap, (next_point, index))
+        return heap[0][0] if heap else None
+
+    def _pop_due(self, event_type: str, active_minutes: int, now: datetime | None) -> list[int]:
+        heap = self._pending[event_type]
+        fired = self._fired[event_type]
+        due: list[int] = []
+        while heap and heap[0][0] <= active_minutes:
+            point, index = heapq.heappop(heap)
+            next_point = self._schedule.next_after(index, point, active_minutes)
+            if next_point is not None:
+                heapq.heappush(heap, (next_point, index))
+            if point in fired or not self._schedule.allows(index, now):
+                continue
+            fired.add(point)
+            due.append(point)
+        return due
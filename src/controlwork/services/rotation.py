@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from datetime import date
+from typing import Callable, Generic, Hashable, Sequence, TypeVar
+
+_T = TypeVar("_T")
+
+_MAX_REJECTIONS = 32
+
+
+def daily_order(pool: Sequence[_T], item_id_fn: Callable[[_T], str], day_key: str) -> list[_T]:
+    if not pool:
+        raise ValueError("pool must not be empty")
+    prefix = f"{day_key}|".encode("utf-8")
+    return sorted(pool, key=lambda item: hashlib.sha256(prefix + item_id_fn(item).encode("utf-8")).digest())
+
+
+class DailyRotation(Generic[_T]):
+    def __init__(self, item_id_fn: Callable[[_T], str]) -> None:
+        self._item_id_fn = item_id_fn
+        self._key: tuple[date, str, Hashable] | None = None
+        self._ordered: list[_T] = []
+        self.builds = 0
+
+    def ordered(self, day: date, lang_key: str, version: Hashable, pool_fn: Callable[[], Sequence[_T]]) -> list[_T]:
+        key = (day, lang_key, version)
+        if key != self._key:
+            self._ordered = daily_order(pool_fn(), self._item_id_fn, f"{day.isoformat()}|{lang_key}")
+            self._key = key
+            self.builds += 1
+        return self._ordered
+
+    def item_at(
+        self,
+        slot: int,
+        day: date,
+        lang_key: str,
+        version: Hashable,
+        pool_fn: Callable[[], Sequence[_T]],
+    ) -> _T:
+        ordered = self.ordered(day, lang_key, version, pool_fn)
+        return ordered[slot % len(ordered)]
+
+    def invalidate(self) -> None:
+        self._key = None
+        self._ordered = []
+
+
+class RecentDeck(Generic[_T]):
+    def __init__(self, items: Sequence[_T], item_id_fn: Callable[[_T], str]) -> None:
+        if not items:
+            raise ValueError("pool must not be empty")
+        self.items = items
+        self.ids = [item_id_fn(item) for item in items]
+
+    def pick(self, history: Sequence[str], recent_window: int = 5) -> int:
+        recent = set(history[-recent_window:]) if recent_window > 0 else set()
+        count = len(self.ids)
+        if count > 2 * len(recent):
+            for _ in range(_MAX_REJECTIONS):
+                index = random.randrange(count)
+                if self.ids[index] not in recent:
+                    return index
+
+        candidates = [index for index, item_id in enumerate(self.ids) if item_id not in recent]
+        if not candidates and history:
+            last_id = history[-1]
+            candidates = [index for index, item_id in enumerate(self.ids) if item_id != last_id]
+        if not candidates:
+            candidates = list(range(count))
+        return random.choice(candidates)
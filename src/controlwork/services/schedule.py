@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Sequence
+
+from ..models import AppSettings
+
+SNOOZE_POINT = -1
+
+
+@dataclass(frozen=True)
+class ReminderRule:
+    event_type: str
+    at_min: int = 0
+    every_min: int = 0
+    until_min: int = 0
+    after: str = ""
+    after_count: int = 1
+    window: str = ""
+
+
+class CompiledSchedule:
+    def __init__(self, rules: Sequence[ReminderRule]) -> None:
+        self.rules = tuple(rules)
+        self._seeds: dict[str, list[tuple[int, int]]] = {"soft": [], "hard": []}
+        self._triggers: dict[tuple[str, int], list[int]] = {}
+        self._windows: list[tuple[int, int] | None] = []
+        for index, rule in enumerate(self.rules):
+            self._windows.append(_parse_window(rule.window))
+            if rule.after:
+                self._triggers.setdefault((rule.after, rule.after_count), []).append(index)
+                continue
+            first = rule.at_min or rule.every_min
+            if first > 0:
+                self._seeds[rule.event_type].append((first, index))
+        for seeds in self._seeds.values():
+            seeds.sort()
+
+    def seed(self, event_type: str) -> list[tuple[int, int]]:
+        return list(self._seeds[event_type])
+
+    def next_after(self, index: int, point: int, active_minutes: int) -> int | None:
+        if index == SNOOZE_POINT:
+            return None
+        rule = self.rules[index]
+        if rule.every_min <= 0:
+            return None
+        next_point = point + rule.every_min
+        if next_point <= active_minutes:
+            next_point += rule.every_min * ((active_minutes - next_point) // rule.every_min + 1)
+        if rule.until_min and next_point > rule.until_min:
+            return None
+        return next_point
+
+    def activated(self, trigger: str, count: int, current_minute: int) -> list[tuple[str, int, int]]:
+        activated = []
+        for index in self._triggers.get((trigger, count), ()):
+            rule = self.rules[index]
+            activated.append((rule.event_type, current_minute + (rule.at_min or rule.every_min), index))
+        return activated
+
+    def allows(self, index: int, now: datetime | None) -> bool:
+        if index == SNOOZE_POINT or now is None:
+            return True
+        window = self._windows[index]
+        if window is None:
+            return True
+        minute_of_day = now.hour * 60 + now.minute
+        start, end = window
+        if start <= end:
+            return start <= minute_of_day < end
+        return minute_of_day >= start or minute_of_day < end
+
+
+def rules_from_points(soft_points: Sequence[int], hard_points: Sequence[int]) -> list[ReminderRule]:
+    rules = [ReminderRule("soft", at_min=point) for point in sorted(set(soft_points))]
+    rules.extend(ReminderRule("hard", at_min=point) for point in sorted(set(hard_points)))
+    return rules
+
+
+def rules_from_settings(settings: AppSettings) -> list[ReminderRule] | None:
+    if not settings.reminder_rules:
+        return None
+    return [ReminderRule(**rule) for rule in settings.reminder_rules]  # type: ignore[arg-type]
+
+
+def _parse_window(window: str) -> tuple[int, int] | None:
+    if not window:
+        return None
+    start, end = window.split("-")
+    start_hh, start_mm = [int(part) for part in start.split(":")]
+    end_hh, end_mm = [int(part) for part in end.split(":")]
+    return (start_hh * 60 + start_mm, end_hh * 60 + end_mm)
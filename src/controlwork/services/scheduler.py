@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from ..models import TrackerState
+from .tracker import TrackerService
+
+
+def elapsed_clock() -> float:
+    if hasattr(time, "CLOCK_BOOTTIME"):
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+    return time.monotonic()
+
+
+@dataclass
+class TickScheduler:
+    visible_interval_sec: int = 1
+    max_interval_sec: int = 10
+
+    def next_delay_sec(self, tracker: TrackerService, idle_seconds: int, visible: bool) -> int:
+        if visible:
+            return self.visible_interval_sec
+        candidates = [self.max_interval_sec, tracker.get_seconds_to_day_rollover()]
+        settings = tracker.settings
+        if tracker.state == TrackerState.BREAK:
+            candidates.append(settings.break_duration_min * 60 - tracker.break_elapsed_sec)
+        elif tracker.state == TrackerState.ACTIVE:
+            candidates.append(settings.idle_threshold_sec - idle_seconds)
+            to_reminder = tracker.get_seconds_to_next_reminder()
+            if to_reminder is not None:
+                candidates.append(to_reminder)
+        elif tracker.state == TrackerState.IDLE:
+            if settings.idle_reset_after_sec > idle_seconds:
+                candidates.append(settings.idle_reset_after_sec - idle_seconds)
+        return max(1, min(candidates))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import astuple, dataclass
+from typing import TYPE_CHECKING, Sequence
+
+from .learning_content import LearningCard, learning_card_id
+
+if TYPE_CHECKING:
+    from .database import BackgroundDatabase, Database
+
+DAY_SEC = 86400
+RELEARN_SEC = 600
+MIN_EASE = 1.3
+
+QUALITY_GOOD = 4
+QUALITY_EASY = 5
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    due_epoch: int
+    interval_sec: int = 0
+    ease: float = 2.5
+    repetitions: int = 0
+    lapses: int = 0
+
+
+def sm2_review(state: ReviewState, quality: int, now_epoch: int) -> ReviewState:
+    quality = max(0, min(5, int(quality)))
+    ease = max(MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    if quality < 3:
+        return ReviewState(now_epoch + RELEARN_SEC, RELEARN_SEC, ease, 0, state.lapses + 1)
+    if state.repetitions == 0:
+        interval_sec = DAY_SEC
+    elif state.repetitions == 1:
+        interval_sec = 6 * DAY_SEC
+    else:
+        interval_sec = int(round(state.interval_sec * state.ease))
+    return ReviewState(now_epoch + interval_sec, interval_sec, ease, state.repetitions + 1, state.lapses)
+
+
+class LearningScheduler:
+    def __init__(
+        self,
+        store: Database | BackgroundDatabase,
+        cards: Sequence[LearningCard],
+        now_epoch: float,
+    ) -> None:
+        stored = store.load_learning_reviews()
+        self._store = store
+        self._cards: dict[str, LearningCard] = {}
+        self._order: dict[str, int] = {}
+        self._states: dict[str, ReviewState] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        self.reviews = 0
+        for card in cards:
+            card_id = learning_card_id(card)
+            if card_id in self._cards:
+                continue
+            raw = stored.get(card_id)
+            state = ReviewState(*raw) if raw is not None else ReviewState(int(now_epoch))
+            self._order[card_id] = len(self._cards)
+            self._cards[card_id] = card
+            self._states[card_id] = state
+            self._heap.append((state.due_epoch, self._order[card_id], card_id))
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def state(self, card: LearningCard) -> ReviewState | None:
+        return self._states.get(learning_card_id(card))
+
+    def next_due(self, now_epoch: float) -> LearningCard | None:
+        heap = self._heap
+        while heap:
+            due_epoch, _, card_id = heap[0]
+            if self._states[card_id].due_epoch != due_epoch:
+                heapq.heappop(heap)
+                continue
+            return self._cards[card_id] if due_epoch <= now_epoch else None
+        return None
+
+    def review(self, card: LearningCard, quality: int, now_epoch: float) -> ReviewState:
+        card_id = learning_card_id(card)
+        state = sm2_review(self._states[card_id], quality, int(now_epoch))
+        self._states[card_id] = state
+        heapq.heappush(self._heap, (state.due_epoch, self._order[card_id], card_id))
+        self._store.save_learning_review(card_id, *astuple(state))
+        self.reviews += 1
+        return state
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import math
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from typing import Callable
 
 from ..models import AppSettings, ReminderEvent, TickOutcome, TrackerState
-from .database import Database
+from .database import BackgroundDatabase, Database
 from .idle import IdleProvider
 from .reminder import ReminderController
+from .schedule import rules_from_settings
+from .workday import WorkdayCalendar
 
 
 @dataclass
@@ -17,13 +21,19 @@ class SystemClock:
 
 class TrackerService:
     _STATE_CACHE_KEY = "runtime_tracker_state_v1"
+    _ROLLUP_ACTION_COLUMNS = {
+        "shown": "shown",
+        "snooze": "snoozes",
+        "skip": "skips",
+        "ignore": "ignores",
+    }
 
     def __init__(
         self,
         settings: AppSettings,
         idle_provider: IdleProvider,
         reminder: ReminderController,
-        database: Database,
+        database: Database | BackgroundDatabase,
         clock: SystemClock | None = None,
     ) -> None:
         self.settings = settings
@@ -45,18 +55,24 @@ class TrackerService:
         self.break_idle_streak_sec = 0
         self.break_max_idle_streak_sec = 0
         self._idle_timer_reset = False
+        self._last_idle_seconds = 0
 
         self.snooze_hour_bucket = 0
         self.snooze_count_in_bucket = 0
         self.skip_count_today = 0
-        self.current_day_key = self._day_window(self.clock.now())[0].isoformat()
+        self.calendar = WorkdayCalendar(settings.workday_reset_time)
+        now = self.clock.now()
+        self.calendar.window(now)
+        self._day_ordinal = self.calendar.ordinal(now)
+        self.current_day_key = self.calendar.key_for_ordinal(self._day_ordinal)
 
     def start_session(self) -> None:
         now = self.clock.now()
-        self._restore_runtime_state(now)
-        self.database.close_open_sessions(now)
+        alive_at = self._restore_runtime_state(now)
+        self.database.close_open_sessions(alive_at or now)
         self.session_id = self.database.create_session(now)
-        self.skip_count_today = self.database.get_skip_count(*self._day_window(now))
+        self.database.ensure_daily_rollups(self.settings.workday_reset_time)
+        self.skip_count_today = self._load_skip_count()
         self.database.save_settings_cache(asdict(self.settings))
         self._persist_runtime_state()
 
@@ -73,12 +89,27 @@ class TrackerService:
 
     def apply_settings(self, settings: AppSettings) -> None:
         self.settings = settings
-        self.reminder.update_points(settings.soft_points_min, settings.hard_points_min)
+        self.reminder.update_points(settings.soft_points_min, settings.hard_points_min, rules_from_settings(settings))
         self.database.save_settings_cache(asdict(settings))
+        if settings.workday_reset_time != self.calendar.reset_time:
+            self._apply_reset_time(settings.workday_reset_time)
+
+    def _apply_reset_time(self, reset_time: str) -> None:
+        now = self.clock.now()
+        if self.session_id is not None:
+            self.database.update_session_totals(self.session_id, self.active_sec, self.idle_sec, self.break_sec)
+        self.calendar = WorkdayCalendar(reset_time)
+        self.calendar.window(now)
+        self._day_ordinal = self.calendar.ordinal(now)
+        self.current_day_key = self.calendar.key_for_ordinal(self._day_ordinal)
+        self.database.ensure_daily_rollups(reset_time)
+        self.skip_count_today = self._load_skip_count()
+        self._persist_runtime_state()
 
     def pause_session(self) -> None:
         self.state = TrackerState.PAUSED
         self._persist_runtime_state()
+        self.database.checkpoint()
 
     def resume_session(self) -> None:
         if self.state == TrackerState.PAUSED:
@@ -98,14 +129,16 @@ class TrackerService:
         current_min = max(1, self.cycle_active_sec // 60)
         self.reminder.add_snooze(event_type, current_min, 5)
         self.snooze_count_in_bucket += 1
-        self.database.log_reminder(self.clock.now(), event_type, current_min, "snooze")
+        self._log_reminder(self.clock.now(), event_type, current_min, "snooze")
         return True
 
     def skip_break(self) -> bool:
         if not self.can_skip_today():
             return False
         self.skip_count_today += 1
-        self.database.log_reminder(self.clock.now(), "hard", max(1, self.cycle_active_sec // 60), "skip")
+        current_min = max(1, self.cycle_active_sec // 60)
+        self.reminder.record_skip(current_min)
+        self._log_reminder(self.clock.now(), "hard", current_min, "skip")
         self._persist_runtime_state()
         return True
 
@@ -116,6 +149,7 @@ class TrackerService:
         self.break_max_idle_streak_sec = 0
         self.break_event_id = self.database.start_break_event(self.clock.now())
         self._persist_runtime_state()
+        self.database.checkpoint()
 
     def finish_break_early(self) -> bool:
         if self.state != TrackerState.BREAK:
@@ -124,7 +158,68 @@ class TrackerService:
         return True
 
     def tick(self) -> TickOutcome:
-        now = self.clock.now()
+        return self._step(self.clock.now(), self.idle_provider.get_idle_seconds)
+
+    def advance(self, elapsed_sec: int, idle_seconds_at_end: int) -> TickOutcome:
+        if elapsed_sec <= 0:
+            return TickOutcome(state=self.state)
+        start = self.clock.now() - timedelta(seconds=elapsed_sec)
+        idle_seconds_at_end = max(0, idle_seconds_at_end)
+        last_input_sec = max(1, elapsed_sec - idle_seconds_at_end)
+        outcome = TickOutcome(state=self.state)
+        if last_input_sec > 1:
+            _merge_outcome(outcome, self.advance_run(last_input_sec - 1, self._last_idle_seconds + 1, start))
+        _merge_outcome(
+            outcome,
+            self.advance_run(
+                elapsed_sec - last_input_sec + 1,
+                idle_seconds_at_end - elapsed_sec + last_input_sec,
+                start + timedelta(seconds=last_input_sec - 1),
+            ),
+        )
+        return outcome
+
+    def advance_active_run(self, seconds: int, start: datetime | None = None) -> TickOutcome:
+        """Credit ``seconds`` during which input kept idle time below the threshold."""
+        return self.advance_run(seconds, self.settings.idle_threshold_sec - seconds, start)
+
+    def advance_run(self, seconds: int, first_idle: int, start: datetime | None = None) -> TickOutcome:
+        """Credit ``seconds`` whose idle time grows by one per second from ``first_idle``.
+
+        Second ``n`` (zero-based) after ``start`` is treated as having ``first_idle + n``
+        idle seconds; ``start`` defaults to ``seconds`` before the clock's now. Use
+        ``advance_active_run`` for runs with input inside them.
+        """
+        if start is None:
+            start = self.clock.now() - timedelta(seconds=seconds)
+        previous_state = self.state
+        outcome = TickOutcome(state=self.state, idle_timer_reset=self._idle_timer_reset)
+        self._idle_timer_reset = False
+        done = 0
+        while done < seconds:
+            ts = start + timedelta(seconds=done + 1)
+            self._roll_day_if_needed(ts)
+            if self.session_id is None:
+                self.start_session()
+            day_end = self.calendar.window(ts)[1]
+            span = min(seconds - done, max(1, math.ceil((day_end - ts).total_seconds())))
+            if self.state == TrackerState.PAUSED:
+                self._idle_timer_reset = False
+                done += span
+            elif self.state == TrackerState.BREAK:
+                done += self._credit_break(ts, span, first_idle + done, outcome)
+            else:
+                done += self._credit_work(ts, span, first_idle + done, outcome)
+        self._last_idle_seconds = first_idle + seconds - 1
+        outcome.state = self.state
+        self._flush_session_totals()
+        if self.state == TrackerState.IDLE and previous_state != TrackerState.IDLE:
+            self.database.checkpoint()
+        elif self.state != previous_state:
+            self.database.flush()
+        return outcome
+
+    def _step(self, now: datetime, idle_seconds_fn: Callable[[], int]) -> TickOutcome:
         self._roll_day_if_needed(now)
 
         if self.session_id is None:
@@ -139,7 +234,7 @@ class TrackerService:
             return outcome
 
         if self.state == TrackerState.BREAK:
-            self._tick_break()
+            self._tick_break(idle_seconds_fn)
             remaining = max(0, self.settings.break_duration_min * 60 - self.break_elapsed_sec)
             outcome.state = self.state
             outcome.break_remaining_sec = remaining
@@ -152,10 +247,12 @@ class TrackerService:
             self._flush_session_totals()
             return outcome
 
-        idle_seconds = self.idle_provider.get_idle_seconds()
+        previous_state = self.state
+        idle_seconds = self._last_idle_seconds = idle_seconds_fn()
         if idle_seconds >= self.settings.idle_threshold_sec:
             self.state = TrackerState.IDLE
             self.idle_sec += 1
+            self.database.add_rollup(self.current_day_key, idle_sec=1)
             if self.settings.idle_reset_after_sec > 0 and idle_seconds >= self.settings.idle_reset_after_sec:
                 self.cycle_active_sec = 0
                 self._idle_timer_reset = True
@@ -164,22 +261,29 @@ class TrackerService:
             self.state = TrackerState.ACTIVE
             self.active_sec += 1
             self.cycle_active_sec += 1
+            self.database.add_rollup(self.current_day_key, active_sec=1)
             active_minutes = self.cycle_active_sec // 60
-            reminders = self.reminder.evaluate_due_events(active_minutes)
+            reminders = self.reminder.evaluate_due_events(active_minutes, now)
             if reminders:
                 for event in reminders:
-                    self.database.log_reminder(now, event.event_type, event.point_min, "shown")
+                    self._log_reminder(now, event.event_type, event.point_min, "shown")
                 outcome.reminders = reminders
 
         outcome.state = self.state
         self._flush_session_totals()
+        if self.state == TrackerState.IDLE and previous_state != TrackerState.IDLE:
+            self.database.checkpoint()
+        elif self.state != previous_state:
+            self.database.flush()
         return outcome
 
     def acknowledge_ignore(self, event: ReminderEvent) -> None:
-        self.database.log_reminder(self.clock.now(), event.event_type, event.point_min, "ignore")
+        self._log_reminder(self.clock.now(), event.event_type, event.point_min, "ignore")
 
     def get_today_stats(self) -> dict[str, int]:
-        return self.database.get_today_stats(*self._day_window(self.clock.now()))
+        day_key = self.calendar.day_key(self.clock.now())
+        rollup = self.database.get_daily_rollup(day_key)
+        return {key: int(value) for key, value in rollup.items() if key != "day_key"}
 
     def get_cycle_active_seconds(self) -> int:
         return self.cycle_active_sec
@@ -193,10 +297,20 @@ class TrackerService:
             return None
         return max(0, next_hard_min * 60 - self.cycle_active_sec)
 
-    def _tick_break(self) -> None:
+    def get_seconds_to_next_reminder(self) -> int | None:
+        next_point_min = self.reminder.next_due_point_min(self.cycle_active_sec // 60)
+        if next_point_min is None:
+            return None
+        return max(0, next_point_min * 60 - self.cycle_active_sec)
+
+    def get_seconds_to_day_rollover(self) -> int:
+        return self.calendar.seconds_to_end(self.clock.now())
+
+    def _tick_break(self, idle_seconds_fn: Callable[[], int]) -> None:
         self.break_sec += 1
         self.break_elapsed_sec += 1
-        idle_seconds = self.idle_provider.get_idle_seconds()
+        self.database.add_rollup(self.current_day_key, break_sec=1)
+        idle_seconds = self._last_idle_seconds = idle_seconds_fn()
 
         if idle_seconds >= self.settings.idle_threshold_sec:
             self.break_idle_streak_sec += 1
@@ -207,23 +321,95 @@ class TrackerService:
         if self.break_event_id is not None:
             self.database.update_break_event(self.break_event_id, self.break_max_idle_streak_sec)
 
-    def _complete_break(self, completed: bool) -> None:
+    def _credit_break(self, ts: datetime, span: int, first_idle: int, outcome: TickOutcome) -> int:
+        duration_sec = self.settings.break_duration_min * 60
+        seconds = min(span, max(1, duration_sec - self.break_elapsed_sec))
+        threshold = self.settings.idle_threshold_sec
+        last_idle = first_idle + seconds - 1
+        if first_idle >= threshold:
+            self.break_idle_streak_sec += seconds
+        elif last_idle >= threshold:
+            self.break_idle_streak_sec = last_idle - threshold + 1
+        else:
+            self.break_idle_streak_sec = 0
+        self.break_max_idle_streak_sec = max(self.break_max_idle_streak_sec, self.break_idle_streak_sec)
+        self.break_sec += seconds
+        self.break_elapsed_sec += seconds
+        self.database.add_rollup(self.current_day_key, break_sec=seconds)
+        if self.break_event_id is not None:
+            self.database.update_break_event(self.break_event_id, self.break_max_idle_streak_sec)
+        self._idle_timer_reset = False
+
+        remaining = max(0, duration_sec - self.break_elapsed_sec)
+        outcome.break_remaining_sec = remaining
+        outcome.break_idle_streak_sec = self.break_idle_streak_sec
+        outcome.break_idle_max_streak_sec = self.break_max_idle_streak_sec
+        if remaining <= 0:
+            self._complete_break(completed=True, ts=ts + timedelta(seconds=seconds - 1))
+            outcome.break_completed = True
+        return seconds
+
+    def _credit_work(self, ts: datetime, span: int, first_idle: int, outcome: TickOutcome) -> int:
+        active = min(span, max(0, self.settings.idle_threshold_sec - first_idle))
+        credited = 0
+        while credited < active:
+            to_reminder = self.get_seconds_to_next_reminder()
+            seconds = active - credited if to_reminder is None else min(active - credited, max(1, to_reminder))
+            self.cycle_active_sec += seconds
+            credited += seconds
+            reached_at = ts + timedelta(seconds=credited - 1)
+            reminders = self.reminder.evaluate_due_events(self.cycle_active_sec // 60, reached_at)
+            for event in reminders:
+                self._log_reminder(reached_at, event.event_type, event.point_min, "shown")
+            outcome.reminders.extend(reminders)
+        if active:
+            self.state = TrackerState.ACTIVE
+            self.active_sec += active
+            self.database.add_rollup(self.current_day_key, active_sec=active)
+        self._idle_timer_reset = False
+
+        idle = span - active
+        if idle:
+            self.state = TrackerState.IDLE
+            self.idle_sec += idle
+            self.database.add_rollup(self.current_day_key, idle_sec=idle)
+            reset_after_sec = self.settings.idle_reset_after_sec
+            if reset_after_sec > 0 and first_idle + span - 1 >= reset_after_sec:
+                self.cycle_active_sec = 0
+                self._idle_timer_reset = True
+                outcome.idle_timer_reset = True
+        outcome.break_remaining_sec = None
+        return span
+
+    def _complete_break(self, completed: bool, ts: datetime | None = None) -> None:
         self.state = TrackerState.ACTIVE
         self.cycle_active_sec = 0
         self.snooze_hour_bucket = 0
         self.snooze_count_in_bucket = 0
         self.reminder.reset_cycle()
         if self.break_event_id is not None:
-            self.database.close_break_event(self.break_event_id, self.clock.now(), completed=completed)
+            self.database.close_break_event(self.break_event_id, ts or self.clock.now(), completed=completed)
             self.break_event_id = None
+        if completed:
+            self.database.add_rollup(self.current_day_key, completed_breaks=1)
         self._persist_runtime_state()
+        self.database.checkpoint()
 
     def _roll_day_if_needed(self, now: datetime) -> None:
-        current = self._day_window(now)[0].isoformat()
-        if current == self.current_day_key:
+        ordinal = self.calendar.ordinal(now)
+        if ordinal == self._day_ordinal:
             return
-        self.current_day_key = current
-        self.skip_count_today = self.database.get_skip_count(*self._day_window(now))
+        self.calendar.window(now)
+        self._day_ordinal = ordinal
+        self.current_day_key = self.calendar.key_for_ordinal(ordinal)
+        if self.session_id is not None:
+            self.database.update_session_totals(self.session_id, self.active_sec, self.idle_sec, self.break_sec)
+            self.database.close_session(self.session_id, now)
+            self.active_sec = 0
+            self.idle_sec = 0
+            self.break_sec = 0
+            self.session_id = self.database.create_session(now)
+        self.skip_count_today = self._load_skip_count()
         self.cycle_active_sec = 0
         self.break_elapsed_sec = 0
         self.snooze_hour_bucket = 0
@@ -231,28 +417,39 @@ class TrackerService:
         self.state = TrackerState.ACTIVE
         self._persist_runtime_state()
 
+    def _log_reminder(self, ts: datetime, event_type: str, point_min: int, action_taken: str) -> None:
+        self.database.log_reminder(ts, event_type, point_min, action_taken)
+        self.database.add_rollup(self.current_day_key, **{self._ROLLUP_ACTION_COLUMNS[action_taken]: 1})
+
+    def _load_skip_count(self) -> int:
+        return int(self.database.get_daily_rollup(self.current_day_key)["skips"])
+
     def _flush_session_totals(self) -> None:
         if self.session_id is not None:
             self.database.update_session_totals(self.session_id, self.active_sec, self.idle_sec, self.break_sec)
+            self._persist_runtime_state()
 
-    def _day_window(self, now: datetime) -> tuple[datetime, datetime]:
-        hh, mm = [int(part) for part in self.settings.workday_reset_time.split(":")]
-        reset_today = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        if now < reset_today:
-            start = reset_today - timedelta(days=1)
-        else:
-            start = reset_today
-        return (start, start + timedelta(days=1))
-
-    def _restore_runtime_state(self, now: datetime) -> None:
+    def _restore_runtime_state(self, now: datetime) -> datetime | None:
         payload = self.database.load_app_cache_value(self._STATE_CACHE_KEY)
         if not isinstance(payload, dict):
-            return
+            return None
+
+        alive_at = _parse_timestamp(payload.get("alive_at"))
+        if alive_at is not None and alive_at > now:
+            alive_at = None
+        session_id = payload.get("session_id")
+        totals = [payload.get("active_sec"), payload.get("idle_sec"), payload.get("break_sec")]
+        if isinstance(session_id, int) and all(isinstance(value, int) and value >= 0 for value in totals):
+            self.database.update_session_totals(session_id, *totals)  # type: ignore[arg-type]
+            self.database.close_session(session_id, alive_at or now)
+        break_event_id = payload.get("break_event_id")
+        if isinstance(break_event_id, int):
+            self.database.close_break_event(break_event_id, alive_at or now, completed=False)
 
         cached_day_key = payload.get("day_key")
-        current_day_key = self._day_window(now)[0].isoformat()
+        current_day_key = self.calendar.day_key(now)
         if cached_day_key != current_day_key:
-            return
+            return alive_at
 
         cycle_active_sec = payload.get("cycle_active_sec")
         if isinstance(cycle_active_sec, int) and cycle_active_sec >= 0:
@@ -269,11 +466,18 @@ class TrackerService:
         snooze_count_in_bucket = payload.get("snooze_count_in_bucket")
         if isinstance(snooze_count_in_bucket, int) and snooze_count_in_bucket >= 0:
             self.snooze_count_in_bucket = snooze_count_in_bucket
+        return alive_at
 
     def _persist_runtime_state(self) -> None:
         self.database.save_app_cache_value(
             self._STATE_CACHE_KEY,
             {
+                "alive_at": self.clock.now().isoformat(),
+                "session_id": self.session_id,
+                "break_event_id": self.break_event_id,
+                "active_sec": self.active_sec,
+                "idle_sec": self.idle_sec,
+                "break_sec": self.break_sec,
                 "day_key": self.current_day_key,
                 "cycle_active_sec": self.cycle_active_sec,
                 "break_elapsed_sec": self.break_elapsed_sec,
@@ -281,3 +485,22 @@ class TrackerService:
                 "snooze_count_in_bucket": self.snooze_count_in_bucket,
             },
         )
+
+
+def _parse_timestamp(value: object) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _merge_outcome(outcome: TickOutcome, part: TickOutcome) -> None:
+    outcome.state = part.state
+    outcome.reminders.extend(part.reminders)
+    outcome.break_remaining_sec = part.break_remaining_sec
+    outcome.break_idle_streak_sec = part.break_idle_streak_sec
+    outcome.break_idle_max_streak_sec = part.break_idle_max_streak_sec
+    outcome.break_completed = outcome.break_completed or part.break_completed
+    outcome.idle_timer_reset = outcome.idle_timer_reset or part.idle_timer_reset
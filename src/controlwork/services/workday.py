@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+
+class WorkdayCalendar:
+    def __init__(self, reset_time: str = "04:00") -> None:
+        hh, mm = [int(part) for part in reset_time.split(":")]
+        self.reset_time = reset_time
+        self.hour = hh
+        self.minute = mm
+        self.offset_sec = hh * 3600 + mm * 60
+        self._key_suffix = f"T{hh:02d}:{mm:02d}:00"
+        self._ordinal = 0
+        self._start: datetime | None = None
+        self._end: datetime | None = None
+
+    def ordinal(self, ts: datetime) -> int:
+        if self._start is not None and self._start <= ts < self._end:  # type: ignore[operator]
+            return self._ordinal
+        ordinal = ts.toordinal()
+        if ts.hour * 3600 + ts.minute * 60 + ts.second < self.offset_sec:
+            ordinal -= 1
+            if ts.fold and self._reset_is_repeated(ts):
+                ordinal += 1
+        return ordinal
+
+    def window(self, ts: datetime) -> tuple[datetime, datetime]:
+        ordinal = self.ordinal(ts)
+        if self._start is None or ordinal != self._ordinal:
+            start = datetime.combine(date.fromordinal(ordinal), time(self.hour, self.minute), tzinfo=ts.tzinfo)
+            self._ordinal = ordinal
+            self._start = start
+            self._end = start + timedelta(days=1)
+        return (self._start, self._end)  # type: ignore[return-value]
+
+    def day_key(self, ts: datetime) -> str:
+        return self.key_for_ordinal(self.ordinal(ts))
+
+    def key_for_ordinal(self, ordinal: int) -> str:
+        return date.fromordinal(ordinal).isoformat() + self._key_suffix
+
+    def seconds_to_end(self, now: datetime) -> int:
+        end = self.window(now)[1]
+        if now.tzinfo is None:
+            remaining = (end - now).total_seconds()
+        else:
+            remaining = end.timestamp() - now.timestamp()
+        return max(0, int(remaining))
+
+    def _reset_is_repeated(self, ts: datetime) -> bool:
+        # The wall clock went back over the reset time: the first pass already started the new day.
+        reset = ts.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if ts.tzinfo is None:
+            return reset.replace(fold=0).timestamp() != reset.replace(fold=1).timestamp()
+        return reset.replace(fold=0).utcoffset() != reset.replace(fold=1).utcoffset()
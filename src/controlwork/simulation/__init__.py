@@ -0,0 +1 @@
+"""Offline replay of idle traces through the tracker."""
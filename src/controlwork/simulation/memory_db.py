@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from ..services.database import ROLLUP_COLUMNS
+
+
+class MemoryDatabase:
+    def __init__(self) -> None:
+        self.sessions: dict[int, list[object]] = {}
+        self.break_events: dict[int, list[object]] = {}
+        self.reminder_events: list[tuple[datetime, str, int, str]] = []
+        self.rollups: dict[str, dict[str, int]] = {}
+        self.app_cache: dict[str, str] = {}
+        self.settings_cache: dict[str, object] = {}
+
+    def close(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def checkpoint(self) -> None:
+        pass
+
+    def close_open_sessions(self, ended_at: datetime) -> None:
+        for session in self.sessions.values():
+            if session[1] is None:
+                session[1] = ended_at
+
+    def create_session(self, started_at: datetime) -> int:
+        session_id = len(self.sessions) + 1
+        self.sessions[session_id] = [started_at, None, 0, 0, 0]
+        return session_id
+
+    def update_session_totals(self, session_id: int, active_sec: int, idle_sec: int, break_sec: int) -> None:
+        self.sessions[session_id][2:] = [active_sec, idle_sec, break_sec]
+
+    def close_session(self, session_id: int, ended_at: datetime) -> None:
+        self.sessions[session_id][1] = ended_at
+
+    def log_reminder(self, ts: datetime, event_type: str, point_min: int, action_taken: str) -> None:
+        self.reminder_events.append((ts, event_type, point_min, action_taken))
+
+    def start_break_event(self, started_at: datetime) -> int:
+        break_id = len(self.break_events) + 1
+        self.break_events[break_id] = [started_at, None, 0, False]
+        return break_id
+
+    def update_break_event(self, break_id: int, valid_idle_sec: int) -> None:
+        self.break_events[break_id][2] = valid_idle_sec
+
+    def close_break_event(self, break_id: int, ended_at: datetime, completed: bool) -> None:
+        self.break_events[break_id][1] = ended_at
+        self.break_events[break_id][3] = completed
+
+    def add_rollup(self, day_key: str, **deltas: int) -> None:
+        rollup = self.rollups.get(day_key)
+        if rollup is None:
+            rollup = self.rollups[day_key] = dict.fromkeys(ROLLUP_COLUMNS, 0)
+        for column, delta in deltas.items():
+            rollup[column] += delta
+
+    def get_daily_rollup(self, day_key: str) -> dict[str, int]:
+        return {"day_key": day_key, **self.rollups.get(day_key, dict.fromkeys(ROLLUP_COLUMNS, 0))}
+
+    def get_daily_rollups(self, first_day_key: str, last_day_key: str) -> list[dict[str, object]]:
+        return [
+            {"day_key": day_key, **rollup}
+            for day_key, rollup in sorted(self.rollups.items())
+            if first_day_key <= day_key <= last_day_key
+        ]
+
+    def ensure_daily_rollups(self, workday_reset_time: str) -> None:
+        pass
+
+    def save_settings_cache(self, payload: dict[str, object]) -> None:
+        self.settings_cache.update(payload)
+
+    def save_app_cache_value(self, key: str, value: object) -> None:
+        self.app_cache[key] = json.dumps(value, ensure_ascii=False)
+
+    def load_app_cache_value(self, key: str) -> object | None:
+        raw = self.app_cache.get(key)
+        return None if raw is None else json.loads(raw)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from ..models import AppSettings, ReminderEvent, TrackerState
+from ..services.idle import IdleProvider
+from ..services.reminder import ReminderController
+from ..services.schedule import rules_from_settings
+from ..services.tracker import TrackerService
+from .memory_db import MemoryDatabase
+from .traces import DEFAULT_PROFILES, IdleRun, UserProfile, generate_runs
+
+SIMULATION_START = datetime(2026, 1, 5, 8, 0, 0)
+
+
+@dataclass
+class SimulationClock:
+    current: datetime
+
+    def now(self) -> datetime:
+        return self.current
+
+
+@dataclass
+class SimulationReport:
+    profile: str
+    simulated_sec: int = 0
+    active_sec: int = 0
+    idle_sec: int = 0
+    break_sec: int = 0
+    soft_shown: int = 0
+    hard_shown: int = 0
+    snoozes: int = 0
+    skips: int = 0
+    ignores: int = 0
+    breaks_started: int = 0
+    breaks_completed: int = 0
+
+    def merge(self, other: SimulationReport) -> None:
+        for item in fields(self):
+            if item.name != "profile":
+                setattr(self, item.name, getattr(self, item.name) + getattr(other, item.name))
+
+
+def simulate(
+    settings: AppSettings,
+    runs: Sequence[IdleRun],
+    profile: UserProfile | None = None,
+    seed: int = 0,
+    start: datetime = SIMULATION_START,
+) -> SimulationReport:
+    rng = random.Random(seed)
+    clock = SimulationClock(start)
+    database = MemoryDatabase()
+    tracker = TrackerService(
+        settings=settings,
+        idle_provider=IdleProvider(),
+        reminder=ReminderController(settings.soft_points_min, settings.hard_points_min, rules_from_settings(settings)),
+        database=database,  # type: ignore[arg-type]
+        clock=clock,
+    )
+    tracker.start_session()
+    break_duration_sec = settings.break_duration_min * 60
+
+    for seconds, first_idle in runs:
+        done = 0
+        while done < seconds:
+            chunk = seconds - done
+            if tracker.state == TrackerState.BREAK:
+                chunk = min(chunk, max(1, break_duration_sec - tracker.break_elapsed_sec))
+            elif tracker.state != TrackerState.PAUSED:
+                to_reminder = tracker.get_seconds_to_next_reminder()
+                if to_reminder is not None:
+                    chunk = min(chunk, max(1, to_reminder))
+            run_start = clock.current
+            clock.current = run_start + timedelta(seconds=chunk)
+            if first_idle is None:
+                outcome = tracker.advance_active_run(chunk, run_start)
+            else:
+                outcome = tracker.advance_run(chunk, first_idle + done, run_start)
+            done += chunk
+            for event in outcome.reminders:
+                if event.event_type == "hard" and profile is not None:
+                    _respond_to_hard_reminder(tracker, event, profile, rng)
+    tracker.stop_session()
+
+    report = SimulationReport(profile="trace" if profile is None else profile.name)
+    report.simulated_sec = int((clock.current - start).total_seconds())
+    for rollup in database.rollups.values():
+        report.active_sec += rollup["active_sec"]
+        report.idle_sec += rollup["idle_sec"]
+        report.break_sec += rollup["break_sec"]
+        report.snoozes += rollup["snoozes"]
+        report.skips += rollup["skips"]
+        report.ignores += rollup["ignores"]
+        report.breaks_completed += rollup["completed_breaks"]
+    for _, event_type, _, action_taken in database.reminder_events:
+        if action_taken == "shown":
+            if event_type == "hard":
+                report.hard_shown += 1
+            else:
+                report.soft_shown += 1
+    report.breaks_started = len(database.break_events)
+    return report
+
+
+def simulate_population(
+    settings: AppSettings,
+    profiles: Sequence[UserProfile] = DEFAULT_PROFILES,
+    days: int = 30,
+    users_per_profile: int = 1,
+    seed: int = 0,
+) -> list[SimulationReport]:
+    reports = []
+    for profile_index, profile in enumerate(profiles):
+        report = SimulationReport(profile=profile.name)
+        for user in range(users_per_profile):
+            user_seed = seed * 1_000_003 + profile_index * 10_007 + user
+            runs = generate_runs(profile, days, random.Random(user_seed))
+            report.merge(simulate(settings, runs, profile, seed=user_seed))
+        reports.append(report)
+    return reports
+
+
+def _respond_to_hard_reminder(
+    tracker: TrackerService,
+    event: ReminderEvent,
+    profile: UserProfile,
+    rng: random.Random,
+) -> None:
+    roll = rng.random()
+    if roll < profile.snooze_prob:
+        if tracker.request_snooze("hard"):
+            return
+    elif roll < profile.snooze_prob + profile.skip_prob:
+        if tracker.skip_break():
+            return
+    elif roll >= profile.snooze_prob + profile.skip_prob + profile.take_break_prob:
+        tracker.acknowledge_ignore(event)
+        return
+    tracker.enter_break()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+IdleRun = Tuple[int, Optional[int]]
+
+DAY_SEC = 24 * 3600
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    name: str
+    workday_hours: float = 8.0
+    start_jitter_sec: int = 1800
+    burst_sec: tuple[int, int] = (300, 2400)
+    pause_sec: tuple[int, int] = (10, 150)
+    long_pause_prob: float = 0.1
+    long_pause_sec: tuple[int, int] = (600, 2700)
+    take_break_prob: float = 0.6
+    snooze_prob: float = 0.3
+    skip_prob: float = 0.05
+
+
+DEFAULT_PROFILES = (
+    UserProfile("focused", burst_sec=(1200, 3600), long_pause_prob=0.05, take_break_prob=0.8, snooze_prob=0.15),
+    UserProfile("fragmented", burst_sec=(120, 900), pause_sec=(20, 400), long_pause_prob=0.2),
+    UserProfile("resistant", workday_hours=10.0, take_break_prob=0.2, snooze_prob=0.6, skip_prob=0.2),
+)
+
+
+def generate_runs(profile: UserProfile, days: int, rng: random.Random) -> list[IdleRun]:
+    runs: list[IdleRun] = []
+    for _ in range(days):
+        elapsed = rng.randint(0, profile.start_jitter_sec)
+        if elapsed:
+            runs.append((elapsed, 1))
+        workday_end = elapsed + int(profile.workday_hours * 3600)
+        while elapsed < workday_end:
+            busy = min(rng.randint(*profile.burst_sec), workday_end - elapsed)
+            runs.append((busy, None))
+            elapsed += busy
+            if rng.random() < profile.long_pause_prob:
+                pause = rng.randint(*profile.long_pause_sec)
+            else:
+                pause = rng.randint(*profile.pause_sec)
+            pause = min(pause, DAY_SEC - elapsed)
+            runs.append((pause, 1))
+            elapsed += pause
+        if elapsed < DAY_SEC:
+            runs.append((DAY_SEC - elapsed, 1))
+    return _merge_runs(runs)
+
+
+def runs_from_idle_trace(trace: Sequence[int], idle_threshold_sec: int) -> list[IdleRun]:
+    runs: list[IdleRun] = []
+    index = 0
+    while index < len(trace):
+        end = index + 1
+        if trace[index] < idle_threshold_sec:
+            while end < len(trace) and trace[end] < idle_threshold_sec:
+                end += 1
+            runs.append((end - index, None))
+        else:
+            while end < len(trace) and trace[end] == trace[end - 1] + 1:
+                end += 1
+            runs.append((end - index, trace[index]))
+        index = end
+    return runs
+
+
+def total_seconds(runs: Sequence[IdleRun]) -> int:
+    return sum(seconds for seconds, _ in runs)
+
+
+def _merge_runs(runs: list[IdleRun]) -> list[IdleRun]:
+    merged: list[IdleRun] = []
+    for seconds, first_idle in runs:
+        if seconds <= 0:
+            continue
+        if merged and (merged[-1][1] is None) == (first_idle is None):
+            merged[-1] = (merged[-1][0] + seconds, merged[-1][1])
+        else:
+            merged.append((seconds, first_idle))
+    return merged
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Sequence
+
+import numpy as np
+
+from ..models import AppSettings, ReminderEvent
+from ..services.workday import WorkdayCalendar
+
+STATE_ACTIVE = 0
+STATE_IDLE = 1
+STATE_BREAK = 2
+
+
+@dataclass
+class ReplayResult:
+    states: np.ndarray
+    cycle_active_sec: np.ndarray
+    reminders: list[tuple[int, ReminderEvent]]
+    active_sec: int
+    idle_sec: int
+    break_sec: int
+    idle_resets: int
+    breaks_completed: int
+
+
+def replay_idle_trace(
+    idle_seconds: Sequence[int] | np.ndarray,
+    settings: AppSettings,
+    start: datetime,
+    break_starts: Sequence[int] = (),
+) -> ReplayResult:
+    if settings.reminder_rules:
+        raise ValueError("vectorized replay supports soft/hard point lists only")
+    idle = np.asarray(idle_seconds, dtype=np.int64)
+    n = len(idle)
+    seconds = np.arange(n)
+    rollovers = _rollover_indices(start, n, settings.workday_reset_time)
+
+    in_break = np.zeros(n, dtype=bool)
+    completions: list[int] = []
+    duration_sec = settings.break_duration_min * 60
+    for started_after in sorted(set(break_starts)):
+        first = started_after + 1
+        if first >= n:
+            continue
+        if completions and completions[-1] >= first:
+            completions.pop()
+        position = int(np.searchsorted(rollovers, first, side="left"))
+        next_rollover = int(rollovers[position]) if position < len(rollovers) else n
+        last = started_after + duration_sec
+        if next_rollover <= last:
+            in_break[first:next_rollover] = True
+            continue
+        in_break[first : last + 1] = True
+        if last < n:
+            completions.append(last)
+    completion_idx = np.asarray(completions, dtype=np.int64)
+
+    is_idle = ~in_break & (idle >= settings.idle_threshold_sec)
+    active = ~in_break & ~is_idle
+    states = np.where(in_break, STATE_BREAK, np.where(is_idle, STATE_IDLE, STATE_ACTIVE)).astype(np.int8)
+
+    cumulative = np.cumsum(active, dtype=np.int64)
+    reset_base = np.full(n, -1, dtype=np.int64)
+    idle_reset = np.zeros(n, dtype=bool)
+    if settings.idle_reset_after_sec > 0:
+        idle_reset = is_idle & (idle >= settings.idle_reset_after_sec)
+        reset_base[idle_reset] = cumulative[idle_reset]
+    reset_base[rollovers] = cumulative[rollovers] - active[rollovers]
+    reset_base[completion_idx] = cumulative[completion_idx]
+    base = np.maximum(np.maximum.accumulate(reset_base), 0) if n else reset_base
+    cycle = cumulative - base
+
+    epoch = np.searchsorted(completion_idx, seconds, side="left")
+    stride = n + 2
+    running = np.maximum.accumulate(epoch * stride + np.where(active, cycle, -1)) if n else cycle
+    reminders: list[tuple[int, int, int, ReminderEvent]] = []
+    for order, event_type, points in (
+        (0, "soft", sorted(set(settings.soft_points_min))),
+        (1, "hard", sorted(set(settings.hard_points_min))),
+    ):
+        if not points or not n:
+            continue
+        epochs = np.arange(len(completion_idx) + 1)
+        point_arr = np.asarray(points, dtype=np.int64)
+        targets = (epochs[:, None] * stride + point_arr[None, :] * 60).ravel()
+        fired_at = np.searchsorted(running, targets, side="left")
+        target_epoch = np.repeat(epochs, len(points))
+        target_point = np.tile(point_arr, len(epochs))
+        hit = fired_at < n
+        hit[hit] = epoch[fired_at[hit]] == target_epoch[hit]
+        for second, point in zip(fired_at[hit].tolist(), target_point[hit].tolist()):
+            reminders.append((second, point, order, ReminderEvent(event_type=event_type, point_min=point)))
+    reminders.sort(key=lambda item: item[:3])
+
+    return ReplayResult(
+        states=states,
+        cycle_active_sec=cycle,
+        reminders=[(second, event) for second, _, _, event in reminders],
+        active_sec=int(active.sum()),
+        idle_sec=int(is_idle.sum()),
+        break_sec=int(in_break.sum()),
+        idle_resets=int(np.count_nonzero(idle_reset & ~np.concatenate(([False], idle_reset[:-1])))),
+        breaks_completed=len(completions),
+    )
+
+
+def _rollover_indices(start: datetime, n: int, workday_reset_time: str) -> np.ndarray:
+    boundary = WorkdayCalendar(workday_reset_time).window(start)[1]
+    first = max(0, math.ceil((boundary - start).total_seconds()) - 1)
+    return np.arange(first, n, 24 * 3600, dtype=np.int64)
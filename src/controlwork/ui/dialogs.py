@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..i18n import tr
+from ..models import AppSettings, REMINDER_TONES
+
+
+class FirstRunDialog(QDialog):
+    def __init__(self, settings: AppSettings) -> None:
+        super().__init__()
+        self.settings = settings
+        self.setModal(True)
+
+        self.lang_combo = QComboBox()
+        self.lang_combo.addItems(["ru", "en"])
+        self.lang_combo.setCurrentText(settings.language)
+
+        self.soft_edit = QLineEdit(",".join(str(v) for v in settings.soft_points_min))
+        self.hard_edit = QLineEdit(",".join(str(v) for v in settings.hard_points_min))
+
+        self.break_spin = QSpinBox()
+        self.break_spin.setRange(1, 180)
+        self.break_spin.setValue(settings.break_duration_min)
+
+        self.tone_combo = QComboBox()
+        for tone in REMINDER_TONES:
+            self.tone_combo.addItem(tone, tone)
+        tone_idx = self.tone_combo.findData(settings.reminder_tone)
+        if tone_idx >= 0:
+            self.tone_combo.setCurrentIndex(tone_idx)
+
+        self.idle_spin = QSpinBox()
+        self.idle_spin.setRange(30, 3600)
+        self.idle_spin.setValue(settings.idle_threshold_sec)
+
+        self.idle_reset_spin = QSpinBox()
+        self.idle_reset_spin.setRange(0, 36000)
+        self.idle_reset_spin.setValue(settings.idle_reset_after_sec)
+
+        self.autostart_check = QCheckBox()
+        self.autostart_check.setChecked(settings.autostart_enabled)
+
+        form = QFormLayout()
+        form.addRow("language", self.lang_combo)
+        form.addRow("soft", self.soft_edit)
+        form.addRow("hard", self.hard_edit)
+        form.addRow("break(min)", self.break_spin)
+        form.addRow("tone", self.tone_combo)
+        form.addRow("idle(sec)", self.idle_spin)
+        form.addRow("idle reset(sec)", self.idle_reset_spin)
+        form.addRow("autostart", self.autostart_check)
+
+        apply_btn = QPushButton("apply")
+        apply_btn.clicked.connect(self._on_apply)
+
+        root = QVBoxLayout()
+        root.addLayout(form)
+        root.addWidget(apply_btn)
+        self.setLayout(root)
+        self._retranslate(settings.language)
+
+    def _retranslate(self, language: str) -> None:
+        self.setWindowTitle(tr(language, "first_run_title"))
+        for idx, tone in enumerate(REMINDER_TONES):
+            self.tone_combo.setItemText(idx, tr(language, "tone_" + tone))
+
+    def _on_apply(self) -> None:
+        soft_points = _parse_points(self.soft_edit.text())
+        hard_points = _parse_points(self.hard_edit.text())
+        if not soft_points or not hard_points:
+            QMessageBox.warning(self, "Error", tr(self.settings.language, "parse_error"))
+            return
+        self.settings.language = self.lang_combo.currentText()  # type: ignore[assignment]
+        self.settings.soft_points_min = soft_points
+        self.settings.hard_points_min = hard_points
+        self.settings.break_duration_min = self.break_spin.value()
+        self.settings.reminder_tone = str(self.tone_combo.currentData() or "friendly")
+        self.settings.idle_threshold_sec = self.idle_spin.value()
+        self.settings.autostart_enabled = self.autostart_check.isChecked()
+        self.settings.normalize()
+        self.accept()
+
+
+class SettingsDialog(QDialog):
+    def __init__(self, settings: AppSettings, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.settings = settings
+        self.setModal(True)
+
+        self.language_combo = QComboBox()
+        self.language_combo.addItems(["ru", "en"])
+
+        self.autostart_checkbox = QCheckBox()
+        self.idle_spin = QSpinBox()
+        self.idle_spin.setRange(30, 3600)
+
+        self.idle_reset_spin = QSpinBox()
+        self.idle_reset_spin.setRange(0, 36000)
+
+        self.break_spin = QSpinBox()
+        self.break_spin.setRange(1, 180)
+
+        self.tone_combo = QComboBox()
+        for tone in REMINDER_TONES:
+            self.tone_combo.addItem(tone, tone)
+
+        self.soft_edit = QLineEdit()
+        self.hard_edit = QLineEdit()
+        self.reset_edit = QLineEdit()
+        self.learning_path_edit = QLineEdit()
+        self.learning_browse_btn = QPushButton()
+        self.learning_browse_btn.clicked.connect(self._browse_learning_json)
+        learning_path_row = QHBoxLayout()
+        learning_path_row.addWidget(self.learning_path_edit)
+        learning_path_row.addWidget(self.learning_browse_btn)
+
+        form = QFormLayout()
+        self.language_label = QLabel()
+        self.autostart_label = QLabel()
+        self.idle_label = QLabel()
+        self.idle_reset_label = QLabel()
+        self.break_label = QLabel()
+        self.tone_label = QLabel()
+        self.soft_label = QLabel()
+        self.hard_label = QLabel()
+        self.reset_label = QLabel()
+        self.learning_path_label = QLabel()
+
+        form.addRow(self.language_label, self.language_combo)
+        form.addRow(self.autostart_label, self.autostart_checkbox)
+        form.addRow(self.idle_label, self.idle_spin)
+        form.addRow(self.idle_reset_label, self.idle_reset_spin)
+        form.addRow(self.break_label, self.break_spin)
+        form.addRow(self.tone_label, self.tone_combo)
+        form.addRow(self.soft_label, self.soft_edit)
+        form.addRow(self.hard_label, self.hard_edit)
+        form.addRow(self.reset_label, self.reset_edit)
+        form.addRow(self.learning_path_label, learning_path_row)
+
+        self.cancel_btn = QPushButton()
+        self.save_btn = QPushButton()
+        self.cancel_btn.clicked.connect(self.reject)
+        self.save_btn.clicked.connect(self._on_save)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.cancel_btn)
+        buttons.addWidget(self.save_btn)
+
+        root = QVBoxLayout()
+        root.addLayout(form)
+        root.addLayout(buttons)
+        self.setLayout(root)
+
+        self.set_settings(settings)
+        self.retranslate()
+
+    def set_settings(self, settings: AppSettings) -> None:
+        self.settings = settings
+        self.language_combo.setCurrentText(settings.language)
+        self.autostart_checkbox.setChecked(settings.autostart_enabled)
+        self.idle_spin.setValue(settings.idle_threshold_sec)
+        self.idle_reset_spin.setValue(settings.idle_reset_after_sec)
+        self.break_spin.setValue(settings.break_duration_min)
+        tone_idx = self.tone_combo.findData(settings.reminder_tone)
+        if tone_idx >= 0:
+            self.tone_combo.setCurrentIndex(tone_idx)
+        self.soft_edit.setText(",".join(str(v) for v in settings.soft_points_min))
+        self.hard_edit.setText(",".join(str(v) for v in settings.hard_points_min))
+        self.reset_edit.setText(settings.workday_reset_time)
+        self.learning_path_edit.setText(_format_learning_paths(settings.learning_json_paths))
+
+    def retranslate(self) -> None:
+        lang = self.settings.language
+        self.setWindowTitle(tr(lang, "menu_settings"))
+        self.language_label.setText(tr(lang, "settings_language"))
+        self.autostart_label.setText(tr(lang, "settings_autostart"))
+        self.idle_label.setText(tr(lang, "settings_idle"))
+        self.idle_reset_label.setText(tr(lang, "settings_idle_reset"))
+        self.break_label.setText(tr(lang, "settings_break"))
+        self.tone_label.setText(tr(lang, "settings_tone"))
+        self.soft_label.setText(tr(lang, "settings_soft"))
+        self.hard_label.setText(tr(lang, "settings_hard"))
+        self.reset_label.setText(tr(lang, "settings_reset"))
+        self.learning_path_label.setText(tr(lang, "settings_learning_json"))
+        self.learning_browse_btn.setText(tr(lang, "settings_browse"))
+        self.cancel_btn.setText(tr(lang, "btn_cancel"))
+        self.save_btn.setText(tr(lang, "settings_save"))
+        for idx, tone in enumerate(REMINDER_TONES):
+            self.tone_combo.setItemText(idx, tr(lang, "tone_" + tone))
+
+    def _on_save(self) -> None:
+        soft_points = _parse_points(self.soft_edit.text())
+        hard_points = _parse_points(self.hard_edit.text())
+        if not soft_points or not hard_points:
+            QMessageBox.warning(self, "Error", tr(self.settings.language, "parse_error"))
+            return
+
+        next_settings = replace(
+            self.settings,
+            language=self.language_combo.currentText(),
+            autostart_enabled=self.autostart_checkbox.isChecked(),
+            idle_threshold_sec=self.idle_spin.value(),
+            idle_reset_after_sec=self.idle_reset_spin.value(),
+            break_duration_min=self.break_spin.value(),
+            reminder_tone=str(self.tone_combo.currentData() or "friendly"),
+            soft_points_min=soft_points,
+            hard_points_min=hard_points,
+            workday_reset_time=self.reset_edit.text().strip() or "04:00",
+            learning_json_paths=_parse_learning_paths(self.learning_path_edit.text()),
+        )
+        next_settings.normalize()
+        self.settings = next_settings
+        self.accept()
+
+    def _browse_learning_json(self) -> None:
+        selected, _ = QFileDialog.getOpenFileNames(
+            self,
+            tr(self.settings.language, "settings_learning_json"),
+            "",
+            "JSON Files (*.json);;All Files (*)",
+        )
+        if not selected:
+            return
+        existing = _parse_learning_paths(self.learning_path_edit.text())
+        for path in selected:
+            if path not in existing:
+                existing.append(path)
+        self.learning_path_edit.setText(_format_learning_paths(existing))
+
+
+def _parse_points(raw: str) -> list[int]:
+    values: list[int] = []
+    for chunk in raw.split(","):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        try:
+            value = int(chunk)
+        except ValueError:
+            return []
+        if value > 0:
+            values.append(value)
+    values = sorted(set(values))
+    return values
+
+
+def _parse_learning_paths(raw: str) -> list[str]:
+    paths: list[str] = []
+    for chunk in raw.replace(";", "\n").splitlines():
+        path = chunk.strip()
+        if path and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def _format_learning_paths(paths: list[str]) -> str:
+    return "; ".join(paths)
@@ -1,45 +1,40 @@
 from __future__ import annotations
 
-import hashlib
-import random
 import time
 from datetime import date
 from html import escape
-from dataclasses import replace
-from typing import Callable, TypeVar
+from typing import TYPE_CHECKING, Callable, TypeVar
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QGuiApplication
 from PySide6.QtWidgets import (
-    QCheckBox,
-    QComboBox,
-    QDialog,
-    QFileDialog,
     QFrame,
-    QFormLayout,
     QHBoxLayout,
     QLabel,
-    QLineEdit,
     QMainWindow,
-    QMessageBox,
     QPushButton,
     QScrollArea,
     QSizePolicy,
-    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
 from ..i18n import (
     IRREGULAR_VERBS,
-    THEMED_QUOTES,
     IrregularVerb,
     ThemedQuote,
     format_thematic_quote_author,
+    themed_quotes,
     tr,
 )
-from ..models import AppSettings, REMINDER_TONES, TrackerState
-from ..services.learning_content import LearningCard, LearningContentError, load_learning_cards
+from ..models import AppSettings, TrackerState
+from ..services.rotation import DailyRotation, RecentDeck, daily_order
+from .theme import LIGHT_THEME, main_window_stylesheet
+
+if TYPE_CHECKING:
+    from ..services.database import BackgroundDatabase, Database
+    from ..services.learning_content import LearningCard
+    from ..services.spaced_repetition import LearningScheduler
 
 _T = TypeVar("_T")
 
@@ -53,229 +48,6 @@ class ClickableLabel(QLabel):
         super().mousePressEvent(event)
 
 
-class FirstRunDialog(QDialog):
-    def __init__(self, settings: AppSettings) -> None:
-        super().__init__()
-        self.settings = settings
-        self.setModal(True)
-
-        self.lang_combo = QComboBox()
-        self.lang_combo.addItems(["ru", "en"])
-        self.lang_combo.setCurrentText(settings.language)
-
-        self.soft_edit = QLineEdit(",".join(str(v) for v in settings.soft_points_min))
-        self.hard_edit = QLineEdit(",".join(str(v) for v in settings.hard_points_min))
-
-        self.break_spin = QSpinBox()
-        self.break_spin.setRange(1, 180)
-        self.break_spin.setValue(settings.break_duration_min)
-
-        self.tone_combo = QComboBox()
-        for tone in REMINDER_TONES:
-            self.tone_combo.addItem(tone, tone)
-        tone_idx = self.tone_combo.findData(settings.reminder_tone)
-        if tone_idx >= 0:
-            self.tone_combo.setCurrentIndex(tone_idx)
-
-        self.idle_spin = QSpinBox()
-        self.idle_spin.setRange(30, 3600)
-        self.idle_spin.setValue(settings.idle_threshold_sec)
-
-        self.idle_reset_spin = QSpinBox()
-        self.idle_reset_spin.setRange(0, 36000)
-        self.idle_reset_spin.setValue(settings.idle_reset_after_sec)
-
-        self.autostart_check = QCheckBox()
-        self.autostart_check.setChecked(settings.autostart_enabled)
-
-        form = QFormLayout()
-        form.addRow("language", self.lang_combo)
-        form.addRow("soft", self.soft_edit)
-        form.addRow("hard", self.hard_edit)
-        form.addRow("break(min)", self.break_spin)
-        form.addRow("tone", self.tone_combo)
-        form.addRow("idle(sec)", self.idle_spin)
-        form.addRow("idle reset(sec)", self.idle_reset_spin)
-        form.addRow("autostart", self.autostart_check)
-
-        apply_btn = QPushButton("apply")
-        apply_btn.clicked.connect(self._on_apply)
-
-        root = QVBoxLayout()
-        root.addLayout(form)
-        root.addWidget(apply_btn)
-        self.setLayout(root)
-        self._retranslate(settings.language)
-
-    def _retranslate(self, language: str) -> None:
-        self.setWindowTitle(tr(language, "first_run_title"))
-        for idx, tone in enumerate(REMINDER_TONES):
-            self.tone_combo.setItemText(idx, tr(language, "tone_" + tone))
-
-    def _on_apply(self) -> None:
-        soft_points = _parse_points(self.soft_edit.text())
-        hard_points = _parse_points(self.hard_edit.text())
-        if not soft_points or not hard_points:
-            QMessageBox.warning(self, "Error", tr(self.settings.language, "parse_error"))
-            return
-        self.settings.language = self.lang_combo.currentText()  # type: ignore[assignment]
-        self.settings.soft_points_min = soft_points
-        self.settings.hard_points_min = hard_points
-        self.settings.break_duration_min = self.break_spin.value()
-        self.settings.reminder_tone = str(self.tone_combo.currentData() or "friendly")
-        self.settings.idle_threshold_sec = self.idle_spin.value()
-        self.settings.autostart_enabled = self.autostart_check.isChecked()
-        self.settings.normalize()
-        self.accept()
-
-
-class SettingsDialog(QDialog):
-    def __init__(self, settings: AppSettings, parent: QWidget | None = None) -> None:
-        super().__init__(parent)
-        self.settings = settings
-        self.setModal(True)
-
-        self.language_combo = QComboBox()
-        self.language_combo.addItems(["ru", "en"])
-
-        self.autostart_checkbox = QCheckBox()
-        self.idle_spin = QSpinBox()
-        self.idle_spin.setRange(30, 3600)
-
-        self.idle_reset_spin = QSpinBox()
-        self.idle_reset_spin.setRange(0, 36000)
-
-        self.break_spin = QSpinBox()
-        self.break_spin.setRange(1, 180)
-
-        self.tone_combo = QComboBox()
-        for tone in REMINDER_TONES:
-            self.tone_combo.addItem(tone, tone)
-
-        self.soft_edit = QLineEdit()
-        self.hard_edit = QLineEdit()
-        self.reset_edit = QLineEdit()
-        self.learning_path_edit = QLineEdit()
-        self.learning_browse_btn = QPushButton()
-        self.learning_browse_btn.clicked.connect(self._browse_learning_json)
-        learning_path_row = QHBoxLayout()
-        learning_path_row.addWidget(self.learning_path_edit)
-        learning_path_row.addWidget(self.learning_browse_btn)
-
-        form = QFormLayout()
-        self.language_label = QLabel()
-        self.autostart_label = QLabel()
-        self.idle_label = QLabel()
-        self.idle_reset_label = QLabel()
-        self.break_label = QLabel()
-        self.tone_label = QLabel()
-        self.soft_label = QLabel()
-        self.hard_label = QLabel()
-        self.reset_label = QLabel()
-        self.learning_path_label = QLabel()
-
-        form.addRow(self.language_label, self.language_combo)
-        form.addRow(self.autostart_label, self.autostart_checkbox)
-        form.addRow(self.idle_label, self.idle_spin)
-        form.addRow(self.idle_reset_label, self.idle_reset_spin)
-        form.addRow(self.break_label, self.break_spin)
-        form.addRow(self.tone_label, self.tone_combo)
-        form.addRow(self.soft_label, self.soft_edit)
-        form.addRow(self.hard_label, self.hard_edit)
-        form.addRow(self.reset_label, self.reset_edit)
-        form.addRow(self.learning_path_label, learning_path_row)
-
-        self.cancel_btn = QPushButton()
-        self.save_btn = QPushButton()
-        self.cancel_btn.clicked.connect(self.reject)
-        self.save_btn.clicked.connect(self._on_save)
-
-        buttons = QHBoxLayout()
-        buttons.addWidget(self.cancel_btn)
-        buttons.addWidget(self.save_btn)
-
-        root = QVBoxLayout()
-        root.addLayout(form)
-        root.addLayout(buttons)
-        self.setLayout(root)
-
-        self.set_settings(settings)
-        self.retranslate()
-
-    def set_settings(self, settings: AppSettings) -> None:
-        self.settings = settings
-        self.language_combo.setCurrentText(settings.language)
-        self.autostart_checkbox.setChecked(settings.autostart_enabled)
-        self.idle_spin.setValue(settings.idle_threshold_sec)
-        self.idle_reset_spin.setValue(settings.idle_reset_after_sec)
-        self.break_spin.setValue(settings.break_duration_min)
-        tone_idx = self.tone_combo.findData(settings.reminder_tone)
-        if tone_idx >= 0:
-            self.tone_combo.setCurrentIndex(tone_idx)
-        self.soft_edit.setText(",".join(str(v) for v in settings.soft_points_min))
-        self.hard_edit.setText(",".join(str(v) for v in settings.hard_points_min))
-        self.reset_edit.setText(settings.workday_reset_time)
-        self.learning_path_edit.setText(_format_learning_paths(settings.learning_json_paths))
-
-    def retranslate(self) -> None:
-        lang = self.settings.language
-        self.setWindowTitle(tr(lang, "menu_settings"))
-        self.language_label.setText(tr(lang, "settings_language"))
-        self.autostart_label.setText(tr(lang, "settings_autostart"))
-        self.idle_label.setText(tr(lang, "settings_idle"))
-        self.idle_reset_label.setText(tr(lang, "settings_idle_reset"))
-        self.break_label.setText(tr(lang, "settings_break"))
-        self.tone_label.setText(tr(lang, "settings_tone"))
-        self.soft_label.setText(tr(lang, "settings_soft"))
-        self.hard_label.setText(tr(lang, "settings_hard"))
-        self.reset_label.setText(tr(lang, "settings_reset"))
-        self.learning_path_label.setText(tr(lang, "settings_learning_json"))
-        self.learning_browse_btn.setText(tr(lang, "settings_browse"))
-        self.cancel_btn.setText(tr(lang, "btn_cancel"))
-        self.save_btn.setText(tr(lang, "settings_save"))
-        for idx, tone in enumerate(REMINDER_TONES):
-            self.tone_combo.setItemText(idx, tr(lang, "tone_" + tone))
-
-    def _on_save(self) -> None:
-        soft_points = _parse_points(self.soft_edit.text())
-        hard_points = _parse_points(self.hard_edit.text())
-        if not soft_points or not hard_points:
-            QMessageBox.warning(self, "Error", tr(self.settings.language, "parse_error"))
-            return
-
-        next_settings = replace(
-            self.settings,
-            language=self.language_combo.currentText(),
-            autostart_enabled=self.autostart_checkbox.isChecked(),
-            idle_threshold_sec=self.idle_spin.value(),
-            idle_reset_after_sec=self.idle_reset_spin.value(),
-            break_duration_min=self.break_spin.value(),
-            reminder_tone=str(self.tone_combo.currentData() or "friendly"),
-            soft_points_min=soft_points,
-            hard_points_min=hard_points,
-            workday_reset_time=self.reset_edit.text().strip() or "04:00",
-            learning_json_paths=_parse_learning_paths(self.learning_path_edit.text()),
-        )
-        next_settings.normalize()
-        self.settings = next_settings
-        self.accept()
-
-    def _browse_learning_json(self) -> None:
-        selected, _ = QFileDialog.getOpenFileNames(
-            self,
-            tr(self.settings.language, "settings_learning_json"),
-            "",
-            "JSON Files (*.json);;All Files (*)",
-        )
-        if not selected:
-            return
-        existing = _parse_learning_paths(self.learning_path_edit.text())
-        for path in selected:
-            if path not in existing:
-                existing.append(path)
-        self.learning_path_edit.setText(_format_learning_paths(existing))
-
-
 class MainWindow(QMainWindow):
     pause_toggle_requested = Signal()
 
@@ -285,6 +57,12 @@ class MainWindow(QMainWindow):
         self._size_without_learning_block = (240, 140)
         self._fixed_learning_scroll_height = 80
         self._current_state = TrackerState.ACTIVE
+        self._theme_name = LIGHT_THEME.name
+        self._quote_rotation: DailyRotation[ThemedQuote] = DailyRotation(
+            lambda item: f"{item.topic}|{item.author}|{item.text}"
+        )
+        self._quote_pool_version = 0
+        self._recent_decks: dict[str, RecentDeck] = {}
         self.settings = settings
         self._hide_to_tray_enabled = True
         self._learning_block_visible = False
@@ -293,6 +71,9 @@ class MainWindow(QMainWindow):
         self._current_verb: IrregularVerb | None = None
         self._custom_cards: list[LearningCard] = []
         self._current_card: LearningCard | None = None
+        self._review_store: Database | BackgroundDatabase | None = None
+        self._learning_scheduler: LearningScheduler | None = None
+        self._shown_card: LearningCard | None = None
         self._custom_json_error_keys: list[str] = []
         self._custom_json_error_shown = False
         self._recent_history = self._normalized_recent_history(settings.learning_recent_history)
@@ -414,11 +195,16 @@ class MainWindow(QMainWindow):
 
     def set_settings(self, settings: AppSettings) -> None:
         self.settings = settings
+        self._quote_pool_version += 1
         self._custom_json_error_shown = False
         self._recent_history = self._normalized_recent_history(settings.learning_recent_history)
         self._reload_custom_cards()
         self.refresh_learning_block(force=True)
 
+    def set_review_store(self, store: Database | BackgroundDatabase) -> None:
+        self._review_store = store
+        self._rebuild_learning_scheduler()
+
     def set_hide_to_tray_enabled(self, enabled: bool) -> None:
         self._hide_to_tray_enabled = enabled
 
@@ -493,6 +279,8 @@ class MainWindow(QMainWindow):
         slot = int(time.time() // 30)
         if not force and self._last_learning_slot == slot:
             return
+        if self._last_learning_slot != slot:
+            self._grade_shown_card(easy=False)
         self._last_learning_slot = slot
         learning_slot = slot % 3
 
@@ -504,23 +292,24 @@ class MainWindow(QMainWindow):
             self._render_irregular_verb()
             return
 
-        if self._custom_cards:
-            self._render_custom_card()
+        card = self._next_custom_card()
+        if card is not None:
+            self._render_custom_card(card)
             return
 
         self._render_quote()
 
     def _render_quote(self) -> None:
         lang_key = "en" if self.settings.language == "en" else "ru"
-        pool = self._daily_quote_pool(lang_key)
-        ordered_pool = self._daily_ordered_pool(
-            pool,
-            item_id_fn=lambda item: f"{item.topic}|{item.author}|{item.text}",
-            day_key=f"{date.today().isoformat()}|{lang_key}",
-        )
+        today = date.today()
         seconds_since_midnight = int(time.time() % 86400)
-        slot_index = (seconds_since_midnight // 30) % len(ordered_pool)
-        quote = ordered_pool[slot_index]
+        quote = self._quote_rotation.item_at(
+            seconds_since_midnight // 30,
+            today,
+            lang_key,
+            self._quote_pool_version,
+            lambda: self._daily_quote_pool(lang_key, today),
+        )
         self._current_quote = quote
         topic = tr(self.settings.language, f"quote_topic_{quote.topic}")
         author = format_thematic_quote_author(quote)
@@ -553,15 +342,26 @@ class MainWindow(QMainWindow):
             )
         )
 
-    def _render_custom_card(self) -> None:
-        card = self._select_with_recent_ids(
-            self._custom_cards,
-            item_id_fn=lambda item: (
-                f"{item.english}|{item.russian}|{item.transcription or ''}|"
-                f"{item.example or ''}|{item.example_translation or ''}"
-            ),
-            history_key="cards",
-        )
+    def _next_custom_card(self) -> LearningCard | None:
+        if self._learning_scheduler is None:
+            if not self._custom_cards:
+                return None
+            from ..services.learning_content import learning_card_id
+
+            return self._select_with_recent_ids(self._custom_cards, item_id_fn=learning_card_id, history_key="cards")
+        if self._shown_card is None:
+            self._shown_card = self._learning_scheduler.next_due(time.time())
+        return self._shown_card
+
+    def _grade_shown_card(self, easy: bool) -> None:
+        card, self._shown_card = self._shown_card, None
+        if card is None or self._learning_scheduler is None:
+            return
+        from ..services.spaced_repetition import QUALITY_EASY, QUALITY_GOOD
+
+        self._learning_scheduler.review(card, QUALITY_EASY if easy else QUALITY_GOOD, time.time())
+
+    def _render_custom_card(self, card: LearningCard) -> None:
         self._current_card = card
         topic = tr(self.settings.language, "quote_topic_custom_json")
 
@@ -580,10 +380,14 @@ class MainWindow(QMainWindow):
     def _reload_custom_cards(self) -> None:
         self._custom_cards = []
         self._current_card = None
+        self._learning_scheduler = None
+        self._shown_card = None
         self._custom_json_error_keys = []
         paths = self.settings.learning_json_paths
         if not paths:
             return
+        from ..services.learning_content import LearningContentError, load_learning_cards
+
         for path in paths:
             try:
                 self._custom_cards.extend(load_learning_cards(path))
@@ -591,6 +395,16 @@ class MainWindow(QMainWindow):
                 self._custom_json_error_keys.append("learning_json_unavailable")
             except (OSError, ValueError, LearningContentError):
                 self._custom_json_error_keys.append("learning_json_invalid")
+        self._rebuild_learning_scheduler()
+
+    def _rebuild_learning_scheduler(self) -> None:
+        self._learning_scheduler = None
+        self._shown_card = None
+        if self._review_store is None or not self._custom_cards:
+            return
+        from ..services.spaced_repetition import LearningScheduler
+
+        self._learning_scheduler = LearningScheduler(self._review_store, self._custom_cards, time.time())
 
     def pop_learning_json_error(self) -> str | None:
         if self._custom_json_error_shown or not self._custom_json_error_keys:
@@ -629,62 +443,36 @@ class MainWindow(QMainWindow):
         history_key: str,
         recent_window: int = 5,
     ) -> _T:
-        if not pool:
-            raise ValueError("pool must not be empty")
+        deck = self._recent_decks.get(history_key)
+        if deck is None or deck.items is not pool or len(deck.ids) != len(pool):
+            deck = RecentDeck(pool, item_id_fn)
+            self._recent_decks[history_key] = deck
 
         history = self._recent_history.setdefault(history_key, [])
-        recent = history[-recent_window:]
-        candidates = [item for item in pool if item_id_fn(item) not in recent]
-
-        if not candidates and history:
-            last_id = history[-1]
-            candidates = [item for item in pool if item_id_fn(item) != last_id]
-
-        if not candidates:
-            candidates = pool
-
-        selected = random.choice(candidates)
-        selected_id = item_id_fn(selected)
+        index = deck.pick(history, recent_window)
+        selected_id = deck.ids[index]
         updated = [item_id for item_id in history if item_id != selected_id]
         updated.append(selected_id)
         self._recent_history[history_key] = updated[-recent_window:]
         self._sync_recent_history_to_settings()
-        return selected
+        return deck.items[index]
 
-    def _daily_ordered_pool(
-        self,
-        pool: list[_T],
-        item_id_fn: Callable[[_T], str],
-        day_key: str,
-    ) -> list[_T]:
-        if not pool:
-            raise ValueError("pool must not be empty")
-
-        return sorted(
-            pool,
-            key=lambda item: hashlib.sha256(f"{day_key}|{item_id_fn(item)}".encode("utf-8")).hexdigest(),
-        )
-
-    def _daily_quote_pool(self, lang_key: str) -> list[ThemedQuote]:
-        topics = list(THEMED_QUOTES[lang_key].keys())
+    def _daily_quote_pool(self, lang_key: str, today: date) -> list[ThemedQuote]:
+        topics = list(themed_quotes()[lang_key].keys())
         if not topics:
             return []
 
-        today = date.today()
-        day_key = f"{today.isoformat()}|{lang_key}|topics"
-        ordered_topics = sorted(
-            topics,
-            key=lambda topic: hashlib.sha256(f"{day_key}|{topic}".encode("utf-8")).hexdigest(),
-        )
+        ordered_topics = daily_order(topics, str, f"{today.isoformat()}|{lang_key}|topics")
         topic_count = min(3, len(ordered_topics))
         if topic_count == len(ordered_topics):
             chosen_topics = ordered_topics
         else:
             start_index = today.toordinal() % len(ordered_topics)
             chosen_topics = [ordered_topics[(start_index + offset) % len(ordered_topics)] for offset in range(topic_count)]
-        return [quote for topic in chosen_topics for quote in THEMED_QUOTES[lang_key][topic]]
+        return [quote for topic in chosen_topics for quote in themed_quotes()[lang_key][topic]]
 
     def _on_quote_click(self) -> None:
+        self._grade_shown_card(easy=True)
         self._last_learning_slot = None
         self.refresh_learning_block(force=True)
 
@@ -718,127 +506,25 @@ class MainWindow(QMainWindow):
         parts.append("</div>")
         return "".join(parts)
 
+    def set_theme(self, theme_name: str) -> None:
+        if theme_name == self._theme_name:
+            return
+        self._theme_name = theme_name
+        self._apply_styles()
+
     def _apply_styles(self) -> None:
-        self.setStyleSheet(
-            """
-            QMainWindow {
-                background-color: #F6F8FB;
-            }
-            QWidget#mainRoot {
-                background-color: #F6F8FB;
-            }
-            QWidget {
-                color: #1F2937;
-                font-family: "Segoe UI";
-                font-size: 11px;
-            }
-            QFrame#timerCard, QFrame#learningCard {
-                background-color: #FFFFFF;
-                border: 1px solid #D5DCE6;
-                border-radius: 5px;
-            }
-            QLabel#sectionTitle {
-                color: #1F2937;
-                font-weight: 800;
-            }
-            QLabel#workTimeValue {
-                font-family: "Consolas";
-                font-size: 16px;
-                font-weight: 700;
-                color: #111827;
-            }
-            QLabel#secondaryText {
-                color: #4B5563;
-                font-size: 10px;
-            }
-            QLabel#stateBadge {
-                border-radius: 999px;
-                padding: 1px 5px;
-                font-size: 10px;
-                font-weight: 600;
-                background-color: #DBEAFE;
-                color: #1E40AF;
-            }
-            QLabel#learningText {
-                color: #1F2937;
-                font-size: 13px;
-                background-color: transparent;
-            }
-            QScrollArea {
-                background-color: transparent;
-                border: none;
-            }
-            QScrollArea > QWidget > QWidget {
-                background-color: transparent;
-            }
-            QPushButton {
-                min-height: 20px;
-                border-radius: 5px;
-                font-size: 11px;
-                padding: 2px 10px;
-            }
-            QPushButton#primaryButton {
-                background-color: #2563EB;
-                color: #FFFFFF;
-                border: 1px solid #2563EB;
-                font-weight: 600;
-            }
-            QPushButton#primaryButton:hover {
-                background-color: #1D4ED8;
-                border-color: #1D4ED8;
-            }
-            QPushButton#primaryButton:pressed {
-                background-color: #1E40AF;
-                border-color: #1E40AF;
-            }
-            QPushButton#secondaryButton {
-                background-color: #FFFFFF;
-                color: #1F2937;
-                border: 1px solid #D5DCE6;
-            }
-            QPushButton#secondaryButton:hover {
-                background-color: #F3F6FA;
-            }
-            QPushButton#secondaryButton:pressed {
-                background-color: #E8EEF7;
-            }
-            QPushButton:focus {
-                border: 1px solid #93C5FD;
-            }
-            QScrollBar:vertical {
-                background: transparent;
-                width: 6px;
-                margin: 1px;
-            }
-            QScrollBar::handle:vertical {
-                background: #C7D2E0;
-                border-radius: 4px;
-                min-height: 18px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QPushButton:disabled {
-                opacity: 0.5;
-            }
-            """
-        )
+        self.setStyleSheet(main_window_stylesheet(self._theme_name))
         self.quote_label.setObjectName("learningText")
         self.quote_label.setContentsMargins(0, 0, 0, 0)
         self.quote_label.style().unpolish(self.quote_label)
         self.quote_label.style().polish(self.quote_label)
 
     def _apply_status_badge_style(self, state: TrackerState) -> None:
-        style_map = {
-            TrackerState.ACTIVE: ("#DBEAFE", "#1E40AF"),
-            TrackerState.IDLE: ("#E5E7EB", "#374151"),
-            TrackerState.BREAK: ("#D1FAE5", "#065F46"),
-            TrackerState.PAUSED: ("#FEF3C7", "#92400E"),
-        }
-        bg, fg = style_map[state]
-        self.state_badge_label.setStyleSheet(
-            f"background-color: {bg}; color: {fg}; border-radius: 999px; padding: 3px 10px; font-size: 13px; font-weight: 600;"
-        )
+        if self.state_badge_label.property("state") == state.value:
+            return
+        self.state_badge_label.setProperty("state", state.value)
+        self.state_badge_label.style().unpolish(self.state_badge_label)
+        self.state_badge_label.style().polish(self.state_badge_label)
 
     def closeEvent(self, event) -> None:  # type: ignore[override]
         if self._hide_to_tray_enabled:
@@ -848,35 +534,6 @@ class MainWindow(QMainWindow):
         event.accept()
 
 
-def _parse_points(raw: str) -> list[int]:
-    values: list[int] = []
-    for chunk in raw.split(","):
-        chunk = chunk.strip()
-        if not chunk:
-            continue
-        try:
-            value = int(chunk)
-        except ValueError:
-            return []
-        if value > 0:
-            values.append(value)
-    values = sorted(set(values))
-    return values
-
-
-def _parse_learning_paths(raw: str) -> list[str]:
-    paths: list[str] = []
-    for chunk in raw.replace(";", "\n").splitlines():
-        path = chunk.strip()
-        if path and path not in paths:
-            paths.append(path)
-    return paths
-
-
-def _format_learning_paths(paths: list[str]) -> str:
-    return "; ".join(paths)
-
-
 def _format_duration(seconds: int) -> str:
     total = max(0, int(seconds))
     hours = total // 3600
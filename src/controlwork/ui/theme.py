@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ..models import TrackerState
+
+
+@dataclass(frozen=True)
+class Theme:
+    name: str
+    background: str
+    surface: str
+    border: str
+    text: str
+    strong_text: str
+    secondary_text: str
+    accent: str
+    accent_hover: str
+    accent_pressed: str
+    secondary_hover: str
+    secondary_pressed: str
+    focus: str
+    scrollbar: str
+    badges: tuple[tuple[TrackerState, str, str], ...]
+
+
+LIGHT_THEME = Theme(
+    name="light",
+    background="#F6F8FB",
+    surface="#FFFFFF",
+    border="#D5DCE6",
+    text="#1F2937",
+    strong_text="#111827",
+    secondary_text="#4B5563",
+    accent="#2563EB",
+    accent_hover="#1D4ED8",
+    accent_pressed="#1E40AF",
+    secondary_hover="#F3F6FA",
+    secondary_pressed="#E8EEF7",
+    focus="#93C5FD",
+    scrollbar="#C7D2E0",
+    badges=(
+        (TrackerState.ACTIVE, "#DBEAFE", "#1E40AF"),
+        (TrackerState.IDLE, "#E5E7EB", "#374151"),
+        (TrackerState.BREAK, "#D1FAE5", "#065F46"),
+        (TrackerState.PAUSED, "#FEF3C7", "#92400E"),
+    ),
+)
+
+THEMES: dict[str, Theme] = {LIGHT_THEME.name: LIGHT_THEME}
+
+
+@lru_cache(maxsize=None)
+def main_window_stylesheet(theme_name: str = LIGHT_THEME.name) -> str:
+    theme = THEMES.get(theme_name, LIGHT_THEME)
+    badges = "".join(
+        f"""
+            QLabel#stateBadge[state="{state.value}"] {{
+                background-color: {bg};
+                color: {fg};
+            }}"""
+        for state, bg, fg in theme.badges
+    )
+    return f"""
+            QMainWindow {{
+                background-color: {theme.background};
+            }}
+            QWidget#mainRoot {{
+                background-color: {theme.background};
+            }}
+            QWidget {{
+                color: {theme.text};
+                font-family: "Segoe UI";
+                font-size: 11px;
+            }}
+            QFrame#timerCard, QFrame#learningCard {{
+                background-color: {theme.surface};
+                border: 1px solid {theme.border};
+                border-radius: 5px;
+            }}
+            QLabel#sectionTitle {{
+                color: {theme.text};
+                font-weight: 800;
+            }}
+            QLabel#workTimeValue {{
+                font-family: "Consolas";
+                font-size: 16px;
+                font-weight: 700;
+                color: {theme.strong_text};
+            }}
+            QLabel#secondaryText {{
+                color: {theme.secondary_text};
+                font-size: 10px;
+            }}
+            QLabel#stateBadge {{
+                border-radius: 999px;
+                padding: 3px 10px;
+                font-size: 13px;
+                font-weight: 600;
+            }}{badges}
+            QLabel#learningText {{
+                color: {theme.text};
+                font-size: 13px;
+                background-color: transparent;
+            }}
+            QScrollArea {{
+                background-color: transparent;
+                border: none;
+            }}
+            QScrollArea > QWidget > QWidget {{
+                background-color: transparent;
+            }}
+            QPushButton {{
+                min-height: 20px;
+                border-radius: 5px;
+                font-size: 11px;
+                padding: 2px 10px;
+            }}
+            QPushButton#primaryButton {{
+                background-color: {theme.accent};
+                color: {theme.surface};
+                border: 1px solid {theme.accent};
+                font-weight: 600;
+            }}
+            QPushButton#primaryButton:hover {{
+                background-color: {theme.accent_hover};
+                border-color: {theme.accent_hover};
+            }}
+            QPushButton#primaryButton:pressed {{
+                background-color: {theme.accent_pressed};
+                border-color: {theme.accent_pressed};
+            }}
+            QPushButton#secondaryButton {{
+                background-color: {theme.surface};
+                color: {theme.text};
+                border: 1px solid {theme.border};
+            }}
+            QPushButton#secondaryButton:hover {{
+                background-color: {theme.secondary_hover};
+            }}
+            QPushButton#secondaryButton:pressed {{
+                background-color: {theme.secondary_pressed};
+            }}
+            QPushButton:focus {{
+                border: 1px solid {theme.focus};
+            }}
+            QScrollBar:vertical {{
+                background: transparent;
+                width: 6px;
+                margin: 1px;
+            }}
+            QScrollBar::handle:vertical {{
+                background: {theme.scrollbar};
+                border-radius: 4px;
+                min-height: 18px;
+            }}
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+                height: 0px;
+            }}
+            QPushButton:disabled {{
+                opacity: 0.5;
+            }}
+            """
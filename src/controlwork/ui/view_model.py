@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+
+from ..models import TrackerState
+
+
+@dataclass(frozen=True)
+class StatusView:
+    state: TrackerState = TrackerState.ACTIVE
+    work_seconds: int = 0
+    until_break_seconds: int | None = None
+    notice: str | None = None
+
+
+class StatusViewModel:
+    def __init__(self) -> None:
+        self.current = StatusView()
+        self._pushed: StatusView | None = None
+
+    def update(self, **values: object) -> None:
+        self.current = replace(self.current, **values)  # type: ignore[arg-type]
+
+    def invalidate(self) -> None:
+        self._pushed = None
+
+    def take_changes(self) -> dict[str, object]:
+        pushed, self._pushed = self._pushed, self.current
+        changes: dict[str, object] = {}
+        for item in fields(StatusView):
+            value = getattr(self.current, item.name)
+            if pushed is None or getattr(pushed, item.name) != value:
+                changes[item.name] = value
+        return changes
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from controlwork.models import DB_PROFILES
+from controlwork.services.database import (
+    CONNECTION_PROFILES,
+    BackgroundDatabase,
+    Database,
+    DatabaseWriteError,
+    MigrationProgress,
+    to_epoch,
+)
+
+
+def test_buffered_updates_coalesce_into_one_transaction(tmp_path: Path) -> None:
+    now = [0.0]
+    db = Database(tmp_path / "test.db", flush_interval_sec=10, time_fn=lambda: now[0])
+    session_id = db.create_session(datetime(2026, 2, 17, 12, 0, 0))
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+
+    for second in range(1, 10):
+        now[0] = float(second)
+        db.update_session_totals(session_id, second, 0, 0)
+    assert statements == []
+
+    now[0] = 10.0
+    db.update_session_totals(session_id, 10, 0, 0)
+    updates = [sql for sql in statements if "UPDATE sessions" in sql]
+    assert len(updates) == 1
+    assert "10" in updates[0]
+    assert sum(1 for sql in statements if sql.strip() == "COMMIT") == 1
+    db.close()
+
+
+def test_zero_interval_writes_through(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db", flush_interval_sec=0)
+    session_id = db.create_session(datetime(2026, 2, 17, 12, 0, 0))
+    db.update_session_totals(session_id, 5, 1, 0)
+    assert db.has_pending_writes() is False
+    db.close()
+
+
+def test_settings_cache_writes_only_changed_keys(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db", flush_interval_sec=10, time_fn=lambda: 0.0)
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    db.save_settings_cache({"language": "en", "idle_threshold_sec": 120, "soft_points_min": [15, 30]})
+    assert db.app_rows_written == 3
+    assert sum(1 for sql in statements if sql.strip() == "COMMIT") == 1
+
+    statements.clear()
+    db.save_settings_cache({"language": "en", "idle_threshold_sec": 120, "soft_points_min": [15, 30]})
+    assert statements == []
+    db.save_settings_cache({"language": "ru", "idle_threshold_sec": 120, "soft_points_min": [15, 30]})
+    assert db.app_rows_written == 4
+    assert db.app_values_requested == 9
+    db.close()
+
+    reopened = Database(tmp_path / "test.db")
+    assert reopened.load_app_cache_value("language") == "ru"
+    assert reopened.load_app_cache_value("soft_points_min") == [15, 30]
+    reopened.close()
+
+
+def test_cache_value_bursts_coalesce_and_unchanged_values_are_dropped(tmp_path: Path) -> None:
+    now = [0.0]
+    db = Database(tmp_path / "test.db", flush_interval_sec=10, time_fn=lambda: now[0])
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    for second in range(1, 6):
+        now[0] = float(second)
+        db.save_app_cache_value("state", {"cycle_active_sec": second})
+    assert statements == []
+    assert db.load_app_cache_value("state") == {"cycle_active_sec": 5}
+
+    db.flush()
+    assert db.app_rows_written == 1
+    statements.clear()
+    db.save_app_cache_value("state", {"cycle_active_sec": 5})
+    assert db.has_pending_writes() is False
+    now[0] = 60.0
+    db.save_app_cache_value("state", {"cycle_active_sec": 5})
+    assert statements == []
+    db.close()
+
+
+def test_connection_profile_pragmas_applied(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db", profile="durable")
+    assert db._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db._conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+
+    db.apply_profile("battery")
+    assert db._conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert db._conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+    assert db._conn.execute("PRAGMA cache_size").fetchone()[0] == -CONNECTION_PROFILES["battery"].cache_size_kib
+    db.close()
+
+
+def test_connection_profiles_match_settings_choices() -> None:
+    assert tuple(CONNECTION_PROFILES) == DB_PROFILES
+
+
+def test_unknown_connection_profile_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        Database(tmp_path / "test.db", profile="turbo")
+
+
+def test_checkpoint_flushes_pending_writes(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db", flush_interval_sec=3600)
+    session_id = db.create_session(datetime(2026, 2, 17, 12, 0, 0))
+    db.update_session_totals(session_id, 7, 0, 0)
+    db.checkpoint()
+    assert db.has_pending_writes() is False
+    assert db._conn.execute("SELECT active_sec FROM sessions").fetchone()[0] == 7
+    db.close()
+
+
+LEGACY_SCHEMA = """
+CREATE TABLE sessions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  started_at TEXT NOT NULL,
+  ended_at TEXT,
+  active_sec INTEGER NOT NULL DEFAULT 0,
+  idle_sec INTEGER NOT NULL DEFAULT 0,
+  break_sec INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE reminder_events (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  ts TEXT NOT NULL,
+  type TEXT NOT NULL,
+  point_min INTEGER NOT NULL,
+  action_taken TEXT NOT NULL
+);
+CREATE TABLE break_events (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  started_at TEXT NOT NULL,
+  ended_at TEXT,
+  valid_idle_sec INTEGER NOT NULL DEFAULT 0,
+  completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE app_settings (
+  key TEXT PRIMARY KEY,
+  value_json TEXT NOT NULL
+);
+"""
+
+
+def _make_legacy_database(db_path: Path, reminder_rows: int) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute(
+        """
+        WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n + 1 < ?)
+        INSERT INTO reminder_events(ts, type, point_min, action_taken)
+        SELECT strftime('%Y-%m-%dT%H:%M:%S', 1451606400 + n * 300, 'unixepoch'), 'soft', 15, 'shown' FROM seq
+        """,
+        (reminder_rows,),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_database_is_backfilled_in_place(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        LEGACY_SCHEMA
+        + """
+        INSERT INTO sessions(started_at, active_sec) VALUES ('2026-02-17T12:00:00.250000', 600);
+        INSERT INTO sessions(started_at, active_sec) VALUES ('2026-02-18T05:00:00', 60);
+        INSERT INTO reminder_events(ts, type, point_min, action_taken) VALUES ('2026-02-17T13:00:00', 'hard', 50, 'skip');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    db = Database(db_path)
+    epochs = [row[0] for row in db._conn.execute("SELECT started_epoch FROM sessions ORDER BY id")]
+    assert epochs == [to_epoch(datetime(2026, 2, 17, 12, 0, 0)), to_epoch(datetime(2026, 2, 18, 5, 0, 0))]
+    assert db._conn.execute("SELECT started_at FROM sessions WHERE id = 1").fetchone()[0] == "2026-02-17T12:00:00.250000"
+
+    rollup = db.get_daily_rollup("2026-02-17T04:00:00")
+    assert rollup["active_sec"] == 600
+    assert rollup["skips"] == 1
+    db.close()
+
+
+def _fill_years_of_history(db: Database, years: int) -> None:
+    rng = random.Random(7)
+    start = datetime(2016, 1, 1, 4, 0, 0)
+    sessions = []
+    reminders = []
+    breaks = []
+    for day in range(365 * years):
+        day_start = start + timedelta(days=day)
+        for hour in (5, 9, 14):
+            ts = day_start + timedelta(hours=hour, seconds=rng.randrange(3600))
+            sessions.append((ts.isoformat(), to_epoch(ts), rng.randrange(7200), rng.randrange(900), rng.randrange(600)))
+            breaks.append((ts.isoformat(), to_epoch(ts)))
+        for _ in range(20):
+            ts = day_start + timedelta(seconds=rng.randrange(86400))
+            action = rng.choice(("shown", "snooze", "skip", "ignore"))
+            reminders.append((ts.isoformat(), to_epoch(ts), "soft", 15, action))
+    db._conn.executemany(
+        "INSERT INTO sessions(started_at, started_epoch, active_sec, idle_sec, break_sec) VALUES (?,?,?,?,?)",
+        sessions,
+    )
+    db._conn.executemany("INSERT INTO break_events(started_at, started_epoch) VALUES (?,?)", breaks)
+    db._conn.executemany(
+        "INSERT INTO reminder_events(ts, ts_epoch, type, point_min, action_taken) VALUES (?,?,?,?,?)",
+        reminders,
+    )
+    db._conn.commit()
+    db._conn.execute("ANALYZE")
+
+
+def test_daily_stats_read_one_rollup_row_on_ten_years(tmp_path: Path) -> None:
+    db = Database(tmp_path / "history.db")
+    _fill_years_of_history(db, years=10)
+    db.rebuild_daily_rollups("04:00")
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    rollup = db.get_daily_rollup("2021-06-01T04:00:00")
+    db._conn.set_trace_callback(None)
+
+    (query,) = [statement for statement in statements if "daily_rollups" in statement]
+    plan = " ".join(row[3] for row in db._conn.execute("EXPLAIN QUERY PLAN " + query))
+    assert "SEARCH daily_rollups USING INDEX sqlite_autoindex_daily_rollups_1" in plan
+    assert rollup["active_sec"] > 0
+    assert rollup["shown"] + rollup["snoozes"] + rollup["skips"] + rollup["ignores"] > 0
+    db.close()
+
+
+def test_migrations_set_user_version(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db")
+    assert db.schema_version() == 4
+    db.close()
+
+
+def test_migration_backfills_epochs_in_reported_chunks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("controlwork.services.database._MIGRATION_BATCH_ROWS", 500)
+    db_path = tmp_path / "legacy.db"
+    _make_legacy_database(db_path, reminder_rows=3_000)
+    reports: list[MigrationProgress] = []
+
+    db = Database(db_path, progress=reports.append)
+
+    epoch_reports = [(progress.done, progress.total) for progress in reports if progress.version == 2]
+    assert epoch_reports == [(done, 3_000) for done in range(0, 3_001, 500)]
+    assert db._conn.execute("SELECT COUNT(*) FROM reminder_events WHERE ts_epoch IS NULL").fetchone()[0] == 0
+    db.close()
+
+
+def test_rollup_backfill_runs_as_chunked_migration_step(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("controlwork.services.database._MIGRATION_BATCH_ROWS", 500)
+    db_path = tmp_path / "legacy.db"
+    _make_legacy_database(db_path, reminder_rows=3_000)
+    reports: list[MigrationProgress] = []
+
+    db = Database(db_path, progress=reports.append)
+
+    rollup_reports = [(progress.done, progress.total) for progress in reports if progress.version == 3]
+    assert rollup_reports == [(done, 3_000) for done in range(0, 3_001, 500)]
+    assert sum(day["shown"] for day in db.get_daily_rollups("0000", "9999")) == 3_000
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    db.ensure_daily_rollups("04:00")
+    assert not any("daily_rollups" in statement for statement in statements)
+    db.close()
+
+
+def test_interrupted_migration_resumes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("controlwork.services.database._MIGRATION_BATCH_ROWS", 500)
+    db_path = tmp_path / "legacy.db"
+    _make_legacy_database(db_path, reminder_rows=3_000)
+
+    def interrupt(progress: MigrationProgress) -> None:
+        if progress.version == 2 and progress.done >= 1_000:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        Database(db_path, progress=interrupt)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM reminder_events WHERE ts_epoch IS NOT NULL").fetchone()[0] == 1_000
+    conn.close()
+
+    db = Database(db_path)
+    assert db.schema_version() == 4
+    assert db._conn.execute("SELECT COUNT(*) FROM reminder_events WHERE ts_epoch IS NULL").fetchone()[0] == 0
+    db.close()
+
+
+def test_background_writer_returns_ids_and_drains_on_close(tmp_path: Path) -> None:
+    db = BackgroundDatabase(tmp_path / "test.db", flush_interval_sec=3600)
+    session_id = db.create_session(datetime(2026, 2, 17, 12, 0, 0))
+    break_id = db.start_break_event(datetime(2026, 2, 17, 12, 5, 0))
+    for second in range(1, 301):
+        db.update_session_totals(session_id, second, 0, 0)
+    db.log_reminder(datetime(2026, 2, 17, 12, 6, 0), "hard", 50, "skip")
+    db.close_break_event(break_id, datetime(2026, 2, 17, 12, 15, 0), completed=True)
+    db.close()
+
+    conn = sqlite3.connect(tmp_path / "test.db")
+    assert conn.execute("SELECT action_taken FROM reminder_events").fetchall() == [("skip",)]
+    assert conn.execute("SELECT active_sec FROM sessions WHERE id = ?", (session_id,)).fetchone()[0] == 300
+    assert conn.execute("SELECT completed FROM break_events WHERE id = ?", (break_id,)).fetchone()[0] == 1
+    conn.close()
+
+
+def test_background_writer_coalesces_totals_when_queue_is_full(tmp_path: Path) -> None:
+    db = BackgroundDatabase(tmp_path / "test.db", max_queue=4, flush_interval_sec=3600)
+    session_id = db.create_session(datetime(2026, 2, 17, 12, 0, 0))
+    release = threading.Event()
+    original_close_session = db._database.close_session
+
+    def slow_close_session(*args: object) -> None:
+        release.wait(5)
+        original_close_session(*args)
+
+    db._database.close_session = slow_close_session  # type: ignore[method-assign]
+    db.close_session(session_id, datetime(2026, 2, 17, 13, 0, 0))
+
+    started = time.perf_counter()
+    for second in range(1, 101):
+        db.update_session_totals(session_id, second, 0, 0)
+    rollup = db.get_daily_rollup("2026-02-17T04:00:00")
+    assert time.perf_counter() - started < 1.0
+    assert rollup["active_sec"] == 0
+    assert db.coalesced_commands > 0
+
+    release.set()
+    db.close()
+    conn = sqlite3.connect(tmp_path / "test.db")
+    row = conn.execute("SELECT active_sec, ended_at FROM sessions WHERE id = ?", (session_id,)).fetchone()
+    conn.close()
+    assert row == (100, "2026-02-17T13:00:00")
+    assert db.failed_commands == 0
+
+
+def test_background_writer_reports_fire_and_forget_failures(tmp_path: Path, caplog) -> None:
+    db = BackgroundDatabase(tmp_path / "test.db")
+    session_id = db.create_session(datetime(2026, 2, 17, 12, 0, 0))
+
+    db.close_session(session_id, "not a datetime")  # type: ignore[arg-type]
+    db.flush()
+    deadline = time.monotonic() + 5
+    while db.failed_commands == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert "close_session failed" in caplog.text
+    with pytest.raises(DatabaseWriteError):
+        db.create_session(datetime(2026, 2, 17, 13, 0, 0))
+    assert db.create_session(datetime(2026, 2, 17, 13, 0, 0)) > session_id
+
+    db.close_session(session_id, "still not a datetime")  # type: ignore[arg-type]
+    with pytest.raises(DatabaseWriteError):
+        db.close()
+
+
+def test_background_writer_rejects_commands_after_close(tmp_path: Path) -> None:
+    db = BackgroundDatabase(tmp_path / "test.db")
+    db.close()
+    with pytest.raises(RuntimeError):
+        db.log_reminder(datetime(2026, 2, 17, 12, 0, 0), "soft", 15, "shown")
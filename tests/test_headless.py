@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from controlwork.headless import HeadlessApplication
+from controlwork.models import TrackerState
+from controlwork.services.idle import IdleProvider
+from controlwork.services.notification import NotificationSink
+from controlwork.settings import AppPaths
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+class RecordingSink(NotificationSink):
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, bool]] = []
+
+    def notify(self, title: str, message: str, critical: bool = False) -> None:
+        self.messages.append((title, critical))
+
+
+class FakeElapsed:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def __call__(self) -> float:
+        return self.value
+
+
+@pytest.fixture
+def paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> AppPaths:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    paths = AppPaths()
+    paths.settings_path.write_text(
+        json.dumps({"language": "en", "soft_points_min": [1], "hard_points_min": [2], "autostart_enabled": False}),
+        encoding="utf-8",
+    )
+    return paths
+
+
+def test_headless_entry_point_does_not_import_qt() -> None:
+    code = "import sys, controlwork.main, controlwork.headless; print(any(m.startswith('PySide6') for m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert proc.stdout.strip() == "False"
+
+
+def test_headless_ticks_deliver_reminders_to_sinks(paths: AppPaths) -> None:
+    sink = RecordingSink()
+    elapsed = FakeElapsed()
+    app = HeadlessApplication([sink], paths=paths, idle_provider=IdleProvider(), elapsed_fn=elapsed)
+    assert app.next_delay_sec(0) == 10
+
+    for _ in range(13):
+        elapsed.value += 10
+        app.on_tick()
+    assert [critical for _, critical in sink.messages] == [False, True]
+    assert app.tracker.get_cycle_active_seconds() == 130
+
+    app.toggle_pause()
+    assert app.tracker.state == TrackerState.PAUSED
+    app.toggle_pause()
+    app.start_break()
+    assert app.tracker.state == TrackerState.BREAK
+    app.shutdown()
+    assert app.tracker.session_id is None
+
+
+def test_headless_loop_stops_and_closes_session(paths: AppPaths) -> None:
+    app = HeadlessApplication([RecordingSink()], paths=paths, idle_provider=IdleProvider())
+
+    async def run() -> int:
+        asyncio.get_running_loop().call_later(0.05, app.stop)
+        return await app.run_async()
+
+    assert asyncio.run(run()) == 0
+    assert app.tracker.session_id is None
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import queue
+import threading
+
+from controlwork.services.idle import (
+    IdleProvider,
+    IdleProviderChain,
+    IdleSample,
+    LinuxIdleProvider,
+    SampledIdleProvider,
+    linux_idle_backends,
+)
+
+
+class FakeBackend(IdleProvider):
+    def __init__(self, name: str, value: int | None) -> None:
+        self.name = name
+        self.value = value
+        self.calls = 0
+
+    def query_idle_seconds(self) -> int | None:
+        self.calls += 1
+        return self.value
+
+
+class FakeMonotonic:
+    def __init__(self) -> None:
+        self.current = 0.0
+
+    def __call__(self) -> float:
+        return self.current
+
+
+class ScriptedWait:
+    def __init__(self) -> None:
+        self.timeouts: queue.Queue[float | None] = queue.Queue()
+        self.event: threading.Event | None = None
+        self._elapsed = False
+
+    def __call__(self, event: threading.Event, timeout: float | None) -> bool:
+        self.event = event
+        self.timeouts.put(timeout)
+        event.wait()
+        if self._elapsed:
+            self._elapsed = False
+            event.clear()
+            return False
+        return True
+
+    def next_timeout(self) -> float | None:
+        return self.timeouts.get(timeout=5)
+
+    def elapse(self) -> float | None:
+        assert self.event is not None
+        self._elapsed = True
+        self.event.set()
+        return self.next_timeout()
+
+
+def test_chain_uses_first_answering_backend() -> None:
+    clock = FakeMonotonic()
+    broken = FakeBackend("xss", None)
+    working = FakeBackend("dbus-send", 42)
+    fallback = FakeBackend("xprintidle", 7)
+    chain = IdleProviderChain([broken, working, fallback], time_fn=clock)
+
+    assert chain.name == "dbus-send"
+    for _ in range(5):
+        assert chain.get_idle_seconds() == 42
+
+    assert broken.calls == 1
+    assert working.calls == 6
+    assert fallback.calls == 0
+    assert chain.active_latency_sec is not None
+
+
+def test_failed_backend_is_retried_with_exponential_backoff() -> None:
+    clock = FakeMonotonic()
+    broken = FakeBackend("xss", None)
+    chain = IdleProviderChain([broken], time_fn=clock, initial_backoff_sec=1, max_backoff_sec=8)
+    retried_at: list[float] = []
+
+    for second in range(1, 40):
+        clock.current = float(second)
+        calls_before = broken.calls
+        assert chain.get_idle_seconds() == 0
+        if broken.calls > calls_before:
+            retried_at.append(clock.current)
+
+    assert retried_at == [1.0, 3.0, 7.0, 15.0, 23.0, 31.0, 39.0]
+    assert chain.name == "none"
+    assert chain.failures["xss"] == 8
+
+
+def test_recovered_backend_takes_over_again() -> None:
+    clock = FakeMonotonic()
+    preferred = FakeBackend("xss", None)
+    fallback = FakeBackend("xprintidle", 7)
+    chain = IdleProviderChain([preferred, fallback], time_fn=clock)
+    assert chain.name == "xprintidle"
+
+    preferred.value = 3
+    clock.current = 0.5
+    assert chain.get_idle_seconds() == 7
+    clock.current = 1.0
+    assert chain.get_idle_seconds() == 3
+    assert chain.name == "xss"
+    assert chain.failures["xss"] == 0
+
+
+def test_linux_provider_is_a_chain_over_given_backends() -> None:
+    backend = FakeBackend("xss", 5)
+    provider = LinuxIdleProvider([backend], time_fn=FakeMonotonic())
+    assert provider.name == "xss"
+    backend.value = None
+    assert provider.get_idle_seconds() == 0
+    assert provider.name == "none"
+
+
+def test_linux_backends_prefer_dbus_under_wayland(monkeypatch) -> None:
+    monkeypatch.setattr("controlwork.services.idle.XScreenSaverIdleProvider", lambda: FakeBackend("xss", 0))
+
+    def names(environ: dict[str, str]) -> list[str]:
+        return [backend.name for backend in linux_idle_backends(environ)]
+
+    assert names({"XDG_SESSION_TYPE": "x11", "DISPLAY": ":0"}) == ["xss", "dbus-send", "xprintidle"]
+    assert names({"WAYLAND_DISPLAY": "wayland-0", "DISPLAY": ":0"}) == ["dbus-send", "xss", "xprintidle"]
+    assert names({"XDG_SESSION_TYPE": "wayland"}) == ["dbus-send", "xss", "xprintidle"]
+
+
+def test_sampled_provider_reports_latest_sample_and_age() -> None:
+    clock = FakeMonotonic()
+    backend = FakeBackend("xss", 12)
+    sampled = SampledIdleProvider(backend, interval_sec=1.0, time_fn=clock, start=False)
+
+    clock.current = 0.5
+    backend.value = 99
+    assert sampled.get_idle_seconds() == 12
+    assert sampled.latest_sample() == IdleSample(12, 0.5, False)
+    assert backend.calls == 1
+
+    sampled.sample_now()
+    assert sampled.get_idle_seconds() == 99
+    assert sampled.name == "xss"
+
+
+def test_sampled_provider_treats_stale_or_failed_sample_as_active() -> None:
+    clock = FakeMonotonic()
+    backend = FakeBackend("xss", 600)
+    sampled = SampledIdleProvider(backend, interval_sec=1.0, time_fn=clock, start=False)
+
+    clock.current = 3.5
+    assert sampled.latest_sample().stale
+    assert sampled.get_idle_seconds() == 0
+
+    backend.value = None
+    sampled.sample_now()
+    assert not sampled.latest_sample().stale
+    assert sampled.get_idle_seconds() == 0
+
+
+def test_sampled_provider_polls_on_background_thread() -> None:
+    clock = FakeMonotonic()
+    backend = FakeBackend("xss", 5)
+    wait = ScriptedWait()
+    sampled = SampledIdleProvider(backend, interval_sec=1.0, time_fn=clock, wait_fn=wait)
+    try:
+        assert wait.next_timeout() == 1.0
+        for _ in range(3):
+            assert wait.elapse() == 1.0
+        assert backend.calls == 4
+        backend.value = 8
+        wait.elapse()
+        assert sampled.get_idle_seconds() == 8
+    finally:
+        sampled.stop()
+
+    assert backend.calls == 5
+
+
+def test_sampled_provider_wakes_once_on_input() -> None:
+    clock = FakeMonotonic()
+    backend = FakeBackend("xss", 200)
+    sampled = SampledIdleProvider(backend, time_fn=clock, start=False)
+    woken: list[int] = []
+    sampled.on_input = lambda: woken.append(sampled.get_idle_seconds())
+
+    backend.value = 201
+    sampled.sample_now()
+    assert woken == []
+    backend.value = 0
+    sampled.sample_now()
+    backend.value = 0
+    sampled.sample_now()
+
+    assert woken == [0]
+    assert sampled.on_input is None
+
+
+def test_sampled_provider_follows_next_tick_delay() -> None:
+    clock = FakeMonotonic()
+    sampled = SampledIdleProvider(FakeBackend("xss", 5), interval_sec=1.0, time_fn=clock, start=False)
+
+    sampled.follow_tick(10.0)
+    assert sampled.period_sec == 9.75
+    clock.current = 9.9
+    assert sampled.get_idle_seconds() == 5
+    clock.current = 12.5
+    assert sampled.latest_sample().stale
+
+    sampled.follow_tick(10.0, on_input=lambda: None)
+    assert sampled.period_sec == 1.0
+    sampled.follow_tick(None)
+    assert sampled.period_sec is None
+    assert sampled.on_input is None
+
+
+def test_sampled_provider_thread_sleeps_while_suspended_and_resamples_on_resume() -> None:
+    clock = FakeMonotonic()
+    backend = FakeBackend("xss", 5)
+    wait = ScriptedWait()
+    sampled = SampledIdleProvider(
+        backend, interval_sec=1.0, stale_after_sec=3.0, time_fn=clock, lead_sec=0.0, wait_fn=wait
+    )
+    try:
+        assert wait.next_timeout() == 1.0
+        sampled.follow_tick(None)
+        assert wait.next_timeout() is None
+        assert backend.calls == 1
+
+        clock.current = 60.0
+        sampled.follow_tick(20.0)
+        assert wait.next_timeout() == 20.0
+        assert backend.calls == 2
+        assert not sampled.latest_sample().stale
+
+        sampled.follow_tick(20.0)
+        assert wait.next_timeout() == 20.0
+        assert backend.calls == 2
+    finally:
+        sampled.stop()
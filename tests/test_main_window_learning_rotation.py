@@ -84,7 +84,7 @@ def test_select_with_recent_ids_avoids_last_five(monkeypatch) -> None:
     _app()
     window = MainWindow(AppSettings(language="en").normalize())
     window._recent_history = {"quotes": ["a", "b", "c", "d", "e"], "verbs": [], "cards": []}
-    monkeypatch.setattr("controlwork.ui.main_window.random.choice", lambda items: items[0])
+    monkeypatch.setattr("controlwork.services.rotation.random.choice", lambda items: items[0])
     selected = window._select_with_recent_ids(["a", "b", "c", "d", "e", "f"], lambda x: x, "quotes")
     assert selected == "f"
     assert window.settings.learning_recent_history["quotes"][-1] == "f"
@@ -94,7 +94,7 @@ def test_select_with_recent_ids_fallback_to_not_last_when_pool_small(monkeypatch
     _app()
     window = MainWindow(AppSettings(language="en").normalize())
     window._recent_history = {"quotes": ["a", "b", "c"], "verbs": [], "cards": []}
-    monkeypatch.setattr("controlwork.ui.main_window.random.choice", lambda items: items[0])
+    monkeypatch.setattr("controlwork.services.rotation.random.choice", lambda items: items[0])
     selected = window._select_with_recent_ids(["a", "b", "c"], lambda x: x, "quotes")
     assert selected in ("a", "b")
     assert selected != "c"
@@ -104,7 +104,7 @@ def test_select_with_recent_ids_uses_full_pool_when_only_last_exists(monkeypatch
     _app()
     window = MainWindow(AppSettings(language="en").normalize())
     window._recent_history = {"quotes": ["solo"], "verbs": [], "cards": []}
-    monkeypatch.setattr("controlwork.ui.main_window.random.choice", lambda items: items[0])
+    monkeypatch.setattr("controlwork.services.rotation.random.choice", lambda items: items[0])
     selected = window._select_with_recent_ids(["solo"], lambda x: x, "quotes")
     assert selected == "solo"
 
@@ -113,7 +113,7 @@ def test_recent_history_from_settings_influences_next_choice(monkeypatch) -> Non
     _app()
     window = MainWindow(AppSettings(language="en").normalize())
     window._recent_history = {"quotes": ["a", "b", "c", "d", "e"], "verbs": [], "cards": []}
-    monkeypatch.setattr("controlwork.ui.main_window.random.choice", lambda items: items[0])
+    monkeypatch.setattr("controlwork.services.rotation.random.choice", lambda items: items[0])
     selected = window._select_with_recent_ids(["a", "b", "c", "d", "e", "f"], lambda x: x, "quotes")
     assert selected == "f"
 
@@ -143,3 +143,29 @@ def test_pause_button_text_switches_on_paused_state() -> None:
 
     window.update_state(TrackerState.ACTIVE)
     assert window.pause_btn.text() == "Pause"
+
+
+def test_review_store_schedules_custom_cards_and_click_grades_them(tmp_path, monkeypatch) -> None:
+    from controlwork.services.database import Database
+
+    _app()
+    cards_path = tmp_path / "cards.json"
+    cards_path.write_text(
+        json.dumps([{"english": "first", "russian": "первый"}, {"english": "second", "russian": "второй"}]),
+        encoding="utf-8",
+    )
+    db = Database(tmp_path / "test.db")
+    monkeypatch.setattr("controlwork.ui.main_window.time.time", lambda: 62)
+    window = MainWindow(AppSettings(language="en", learning_json_paths=[str(cards_path)]).normalize())
+    window.set_review_store(db)
+
+    window.refresh_learning_block(force=True)
+    assert "first" in window.quote_label.text()
+
+    window._on_quote_click()
+    assert "second" in window.quote_label.text()
+    assert window._learning_scheduler.state(window._custom_cards[0]).repetitions == 1
+
+    window._on_quote_click()
+    assert "Custom English" not in window.quote_label.text()
+    db.close()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import ast
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from controlwork.services.notification import CommandNotificationSink, DesktopNotificationSink
+
+_WRITE_ARGS = "import sys; open(sys.argv[1], 'w', encoding='utf-8').write(repr(sys.argv[2:]))"
+_WAIT_FOR_RELEASE = """
+import os, sys, time
+deadline = time.monotonic() + 20
+while not os.path.exists(sys.argv[1]) and time.monotonic() < deadline:
+    time.sleep(0.01)
+if os.path.exists(sys.argv[1]):
+    open(sys.argv[2], "w", encoding="utf-8").write("released")
+"""
+
+
+def test_command_sink_substitutes_only_known_placeholders(tmp_path: Path) -> None:
+    out = tmp_path / "args.txt"
+    sink = CommandNotificationSink(
+        [sys.executable, "-c", _WRITE_ARGS, str(out), "{title}", "{message}", "{urgency}", "awk '{print}'", "{", "{0}"]
+    )
+
+    sink.notify("Break {message}", "Stand up", critical=True)
+    sink.close()
+
+    assert ast.literal_eval(out.read_text(encoding="utf-8")) == [
+        "Break {message}",
+        "Stand up",
+        "critical",
+        "awk '{print}'",
+        "{",
+        "{0}",
+    ]
+
+
+def test_command_sink_returns_before_the_command_finishes(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    release = tmp_path / "release"
+    done = tmp_path / "done"
+    slow = CommandNotificationSink([sys.executable, "-c", _WAIT_FOR_RELEASE, str(release), str(done)], timeout_sec=30)
+    missing = CommandNotificationSink(["/nonexistent/controlwork-notify"])
+
+    slow.notify("title", "message")
+    missing.notify("title", "message")
+    release.touch()
+    missing.close()
+    slow.close()
+
+    assert done.read_text(encoding="utf-8") == "released"
+    assert "/nonexistent/controlwork-notify" in caplog.text
+
+
+def test_desktop_sink_runs_backend_off_the_calling_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+    calls: list[tuple[str, str, bool]] = []
+
+    def blocking_backend(self: DesktopNotificationSink, title: str, message: str, critical: bool) -> None:
+        release.wait(10)
+        calls.append((title, message, critical))
+
+    monkeypatch.setattr(DesktopNotificationSink, "_try_native_backend", blocking_backend)
+    sink = DesktopNotificationSink()
+
+    sink.notify("title", "message", critical=True)
+    assert calls == []
+    release.set()
+    sink.close()
+
+    assert calls == [("title", "message", True)]
@@ -1,3 +1,5 @@
+import random
+
 from controlwork.services.reminder import ReminderController
 
 
@@ -37,3 +39,56 @@ def test_next_hard_point_min_returns_upcoming_point() -> None:
     assert controller.next_hard_point_min(10) == 50
     controller.evaluate_due_events(50)
     assert controller.next_hard_point_min(50) is None
+
+
+class BruteForceReminders:
+    def __init__(self, soft: list[int], hard: list[int]) -> None:
+        self.points = {"soft": set(soft), "hard": set(hard)}
+        self.extra: dict[str, set[int]] = {"soft": set(), "hard": set()}
+        self.fired: dict[str, set[int]] = {"soft": set(), "hard": set()}
+
+    def evaluate(self, minute: int) -> list[tuple[int, str]]:
+        if minute <= 0:
+            return []
+        due = []
+        for kind in ("soft", "hard"):
+            for point in sorted(self.points[kind] | self.extra[kind]):
+                if point <= minute and point not in self.fired[kind]:
+                    self.fired[kind].add(point)
+                    due.append((point, kind))
+        return sorted(due, key=lambda item: (item[0], item[1] == "hard"))
+
+    def next_hard(self, minute: int) -> int | None:
+        upcoming = [p for p in self.points["hard"] | self.extra["hard"] if p > minute and p not in self.fired["hard"]]
+        return min(upcoming) if upcoming else None
+
+    def reset(self) -> None:
+        for kind in ("soft", "hard"):
+            self.extra[kind].clear()
+            self.fired[kind].clear()
+
+
+def test_heap_index_matches_brute_force_under_random_snoozes() -> None:
+    rng = random.Random(5)
+    for _ in range(30):
+        soft = rng.sample(range(1, 200), rng.randint(1, 40))
+        hard = rng.sample(range(1, 200), rng.randint(1, 10))
+        controller = ReminderController(soft, hard)
+        reference = BruteForceReminders(soft, hard)
+        minute = 0
+        for _ in range(400):
+            minute += rng.choice([0, 0, 1, 1, 2, 7])
+            roll = rng.random()
+            if roll < 0.15:
+                kind = rng.choice(["soft", "hard"])
+                offset = rng.randint(-3, 10)
+                controller.add_snooze(kind, minute, offset)
+                reference.extra[kind].add(max(1, minute + offset))
+            elif roll < 0.17:
+                controller.reset_cycle()
+                reference.reset()
+                minute = 0
+            got = [(event.point_min, event.event_type) for event in controller.evaluate_due_events(minute)]
+            assert got == reference.evaluate(minute)
+            probe = minute + rng.randint(-2, 2)
+            assert controller.next_hard_point_min(probe) == reference.next_hard(probe)
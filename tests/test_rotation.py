@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from controlwork.services.rotation import DailyRotation, RecentDeck, daily_order
+
+
+def test_daily_order_is_deterministic_per_day_key() -> None:
+    pool = [f"item{index}" for index in range(50)]
+
+    first = daily_order(pool, str, "2026-02-17|en")
+
+    assert first == daily_order(list(reversed(pool)), str, "2026-02-17|en")
+    assert sorted(first) == sorted(pool)
+    assert first != daily_order(pool, str, "2026-02-18|en")
+
+
+def test_rotation_builds_once_per_day_language_and_version() -> None:
+    pool = [f"item{index}" for index in range(10)]
+    calls: list[int] = []
+
+    def pool_fn() -> list[str]:
+        calls.append(1)
+        return pool
+
+    rotation: DailyRotation[str] = DailyRotation(str)
+    day = date(2026, 2, 17)
+    ordered = daily_order(pool, str, "2026-02-17|en")
+
+    picks = [rotation.item_at(slot, day, "en", 0, pool_fn) for slot in range(25)]
+
+    assert picks == [ordered[slot % 10] for slot in range(25)]
+    assert rotation.builds == 1
+    rotation.item_at(0, date(2026, 2, 18), "en", 0, pool_fn)
+    rotation.item_at(0, date(2026, 2, 18), "ru", 0, pool_fn)
+    rotation.item_at(0, date(2026, 2, 18), "ru", 1, pool_fn)
+    assert rotation.builds == 4
+    assert len(calls) == 4
+
+
+def test_rotation_rejects_empty_pool() -> None:
+    rotation: DailyRotation[str] = DailyRotation(str)
+
+    with pytest.raises(ValueError):
+        rotation.item_at(0, date(2026, 2, 17), "en", 0, list)
+
+
+def test_recent_deck_precomputes_ids_once() -> None:
+    calls: list[str] = []
+
+    def item_id(item: str) -> str:
+        calls.append(item)
+        return item.upper()
+
+    deck = RecentDeck([f"item{index}" for index in range(1000)], item_id)
+    for _ in range(50):
+        deck.pick(["ITEM1", "ITEM2"])
+
+    assert len(calls) == 1000
+
+
+def test_recent_deck_never_returns_recent_ids_on_large_deck() -> None:
+    deck = RecentDeck([str(index) for index in range(20)], str)
+    history = ["0", "1", "2", "3", "4"]
+
+    picks = {deck.ids[deck.pick(history)] for _ in range(500)}
+
+    assert picks.isdisjoint(history)
+    assert len(picks) > 1
+
+
+def test_recent_deck_falls_back_to_not_last_then_full_pool() -> None:
+    deck = RecentDeck(["a", "b", "c"], str)
+    assert {deck.ids[deck.pick(["a", "b", "c"])] for _ in range(100)} == {"a", "b"}
+
+    solo = RecentDeck(["solo"], str)
+    assert solo.pick(["solo"]) == 0
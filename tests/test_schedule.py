@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from controlwork.models import AppSettings
+from controlwork.services.database import Database
+from controlwork.services.reminder import ReminderController
+from controlwork.services.schedule import ReminderRule, rules_from_points, rules_from_settings
+
+from tracker_support import ActiveIdleProvider, FakeClock, start_tracker
+
+
+def fired_minutes(controller: ReminderController, minutes: range, now: datetime | None = None) -> list[tuple[int, str]]:
+    fired = []
+    for minute in minutes:
+        fired.extend((event.point_min, event.event_type) for event in controller.evaluate_due_events(minute, now))
+    return fired
+
+
+def test_point_lists_compile_to_one_shot_rules() -> None:
+    assert rules_from_points([30, 15, 15], [50]) == [
+        ReminderRule("soft", at_min=15),
+        ReminderRule("soft", at_min=30),
+        ReminderRule("hard", at_min=50),
+    ]
+    from_points = ReminderController([15, 30, 45], [50])
+    from_rules = ReminderController([], [], rules_from_points([15, 30, 45], [50]))
+    assert fired_minutes(from_points, range(1, 120)) == fired_minutes(from_rules, range(1, 120))
+
+
+def test_recurring_rule_with_escalation_after_skip() -> None:
+    controller = ReminderController(
+        [],
+        [],
+        [
+            ReminderRule("soft", every_min=20),
+            ReminderRule("hard", at_min=50),
+            ReminderRule("hard", every_min=30, after="skip"),
+        ],
+    )
+    assert fired_minutes(controller, range(1, 61)) == [(20, "soft"), (40, "soft"), (50, "hard"), (60, "soft")]
+    controller.record_skip(60)
+    assert controller.next_hard_point_min(60) == 90
+    assert fired_minutes(controller, range(61, 151)) == [
+        (80, "soft"),
+        (90, "hard"),
+        (100, "soft"),
+        (120, "soft"),
+        (120, "hard"),
+        (140, "soft"),
+        (150, "hard"),
+    ]
+
+    controller.reset_cycle()
+    assert controller.next_hard_point_min(0) == 50
+    assert fired_minutes(controller, range(1, 200))[-1] == (180, "soft")
+
+
+def test_escalation_after_repeated_snoozes_and_bounded_recurrence() -> None:
+    controller = ReminderController(
+        [],
+        [50],
+        [ReminderRule("hard", at_min=50), ReminderRule("hard", at_min=2, every_min=2, until_min=70, after="snooze", after_count=2)],
+    )
+    assert fired_minutes(controller, range(1, 51)) == [(50, "hard")]
+    controller.add_snooze("hard", 50, 5)
+    assert controller.next_hard_point_min(50) == 55
+    controller.add_snooze("hard", 51, 10)
+    assert fired_minutes(controller, range(51, 80)) == [
+        (53, "hard"),
+        (55, "hard"),
+        (57, "hard"),
+        (59, "hard"),
+        (61, "hard"),
+        (63, "hard"),
+        (65, "hard"),
+        (67, "hard"),
+        (69, "hard"),
+    ]
+
+
+def test_bulk_catch_up_fires_a_recurring_rule_once() -> None:
+    controller = ReminderController([], [], [ReminderRule("soft", every_min=5)])
+    assert fired_minutes(controller, range(23, 24)) == [(5, "soft")]
+    assert controller.next_due_point_min(23) == 25
+
+
+def test_time_of_day_window_suppresses_points_outside_it() -> None:
+    controller = ReminderController([], [], [ReminderRule("soft", every_min=15, window="09:00-12:00")])
+    assert fired_minutes(controller, range(1, 31), datetime(2026, 2, 17, 8, 59)) == []
+    assert fired_minutes(controller, range(31, 46), datetime(2026, 2, 17, 9, 0)) == [(45, "soft")]
+    overnight = ReminderController([], [], [ReminderRule("hard", at_min=5, window="22:00-02:00")])
+    assert fired_minutes(overnight, range(1, 10), datetime(2026, 2, 17, 1, 30)) == [(5, "hard")]
+
+
+def test_settings_rules_are_normalized_and_replace_point_lists(tmp_path: Path) -> None:
+    settings = AppSettings(
+        language="en",
+        reminder_rules=[
+            {"event_type": "soft", "every_min": "20"},
+            {"event_type": "hard", "at_min": 50},
+            {"event_type": "hard", "every_min": 30, "after": "skip"},
+            {"event_type": "loud", "at_min": 5},
+            {"event_type": "soft"},
+            {"event_type": "soft", "at_min": 5, "after": "never"},
+            {"event_type": "soft", "at_min": 5, "window": "25:00-26:00"},
+            "bogus",
+        ],
+    ).normalize()
+    assert [rule["event_type"] for rule in settings.reminder_rules] == ["soft", "hard", "hard"]
+    assert rules_from_settings(settings) == [
+        ReminderRule("soft", every_min=20),
+        ReminderRule("hard", at_min=50),
+        ReminderRule("hard", every_min=30, after="skip"),
+    ]
+    assert rules_from_settings(AppSettings().normalize()) is None
+
+    db = Database(tmp_path / "test.db")
+    clock = FakeClock(datetime(2026, 2, 17, 12, 0, 0))
+    tracker = start_tracker(
+        db, clock, ActiveIdleProvider(), AppSettings(language="en").normalize(), ReminderController([15, 30, 45], [50])
+    )
+    tracker.apply_settings(settings)
+    fired = []
+    for _ in range(60 * 60):
+        fired.extend((event.point_min, event.event_type) for event in tracker.tick().reminders)
+    assert tracker.skip_break() is True
+    for _ in range(30 * 60):
+        fired.extend((event.point_min, event.event_type) for event in tracker.tick().reminders)
+    assert fired == [(20, "soft"), (40, "soft"), (50, "hard"), (60, "soft"), (80, "soft"), (90, "hard")]
+    db.close()
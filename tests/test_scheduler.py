@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import bisect
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from controlwork.models import TrackerState
+from controlwork.services.database import Database
+from controlwork.services.scheduler import TickScheduler
+from controlwork.services.tracker import TrackerService
+
+from tracker_support import FakeClock, TraceIdleProvider, start_tracker
+
+
+def build_trace(inputs: list[int], length: int) -> list[int]:
+    trace = []
+    for second in range(length + 1):
+        last_input = inputs[bisect.bisect_right(inputs, second) - 1]
+        trace.append(second - last_input)
+    return trace
+
+
+def make_trace_tracker(db_path: Path, trace: list[int], start: datetime) -> tuple[TrackerService, FakeClock, Database]:
+    db = Database(db_path)
+    clock = FakeClock(start)
+    return start_tracker(db, clock, TraceIdleProvider(trace, clock, start)), clock, db
+
+
+def read_reminders(db_path: Path) -> list[tuple[str, str, int, str]]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT ts, type, point_min, action_taken FROM reminder_events ORDER BY id").fetchall()
+
+
+def test_scheduled_wakeups_match_one_hertz_accounting(tmp_path: Path) -> None:
+    inputs = list(range(0, 1300, 7)) + list(range(1900, 5000, 4)) + [5100, 5330, 5331, 5333]
+    length = 5600
+    trace = build_trace(inputs, length)
+    start = datetime(2026, 2, 18, 2, 30, 0)
+
+    ticked, tick_clock, tick_db = make_trace_tracker(tmp_path / "tick.db", trace, start)
+    for _ in range(length):
+        tick_clock.advance()
+        ticked.tick()
+
+    scheduled, clock, db = make_trace_tracker(tmp_path / "scheduled.db", trace, start)
+    scheduler = TickScheduler()
+    now = 0
+    wakeups = 0
+    while now < length:
+        wake_at = now + scheduler.next_delay_sec(scheduled, trace[now], visible=False)
+        if scheduled.state == TrackerState.IDLE and inputs[-1] > now:
+            wake_at = min(wake_at, inputs[bisect.bisect_right(inputs, now)])
+        wake_at = min(wake_at, length)
+        clock.advance(wake_at - now)
+        scheduled.advance(wake_at - now, trace[wake_at])
+        now = wake_at
+        wakeups += 1
+
+    assert (scheduled.active_sec, scheduled.idle_sec, scheduled.cycle_active_sec) == (
+        ticked.active_sec,
+        ticked.idle_sec,
+        ticked.cycle_active_sec,
+    )
+    assert scheduled.state == ticked.state
+    assert db.get_daily_rollups("2026-02-17T04:00:00", "2026-02-18T04:00:00") == tick_db.get_daily_rollups(
+        "2026-02-17T04:00:00", "2026-02-18T04:00:00"
+    )
+    tick_db.close()
+    db.close()
+    assert read_reminders(tmp_path / "scheduled.db") == read_reminders(tmp_path / "tick.db")
+    shown = [row[1:3] for row in read_reminders(tmp_path / "tick.db")]
+    assert shown == [("soft", 15), ("soft", 30), ("soft", 45), ("hard", 50)]
+    assert wakeups < length / 8
+
+
+def test_next_delay_picks_nearest_event(tmp_path: Path) -> None:
+    trace = [0] * 10
+    start = datetime(2026, 2, 17, 12, 0, 0)
+    tracker, clock, db = make_trace_tracker(tmp_path / "test.db", trace, start)
+    scheduler = TickScheduler(max_interval_sec=3600)
+
+    assert scheduler.next_delay_sec(tracker, 0, visible=True) == 1
+    assert scheduler.next_delay_sec(tracker, 0, visible=False) == 120
+    assert scheduler.next_delay_sec(tracker, 100, visible=False) == 20
+
+    tracker.cycle_active_sec = 14 * 60 + 50
+    assert scheduler.next_delay_sec(tracker, 0, visible=False) == 10
+
+    clock.current = datetime(2026, 2, 18, 3, 59, 30)
+    assert scheduler.next_delay_sec(tracker, 0, visible=False) == 10
+    clock.current = start
+
+    tracker.enter_break()
+    tracker.break_elapsed_sec = tracker.settings.break_duration_min * 60 - 5
+    assert scheduler.next_delay_sec(tracker, 500, visible=False) == 5
+
+    tracker.finish_break_early()
+    tracker.pause_session()
+    assert scheduler.next_delay_sec(tracker, 0, visible=False) == 3600
+    assert TickScheduler().next_delay_sec(tracker, 0, visible=False) == 10
+    db.close()
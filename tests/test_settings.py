@@ -69,3 +69,8 @@ def test_learning_recent_history_saved_and_loaded(tmp_path) -> None:
         "verbs": ["v1"],
         "cards": ["c1"],
     }
+
+
+def test_unknown_db_profile_falls_back_to_balanced() -> None:
+    assert replace(AppSettings(), db_profile="turbo").normalize().db_profile == "balanced"
+    assert replace(AppSettings(), db_profile="battery").normalize().db_profile == "battery"
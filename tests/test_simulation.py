@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from pathlib import Path
+
+from controlwork.models import AppSettings
+from controlwork.services.database import Database
+from controlwork.simulation.runner import SIMULATION_START, simulate, simulate_population
+from controlwork.simulation.traces import UserProfile, generate_runs, runs_from_idle_trace, total_seconds
+
+from tracker_support import FakeClock, SequenceIdleProvider, start_tracker
+
+
+def expand_runs(runs: list[tuple[int, int | None]]) -> list[int]:
+    trace: list[int] = []
+    for seconds, first_idle in runs:
+        if first_idle is None:
+            trace.extend([0] * seconds)
+        else:
+            trace.extend(range(first_idle, first_idle + seconds))
+    return trace
+
+
+def test_runs_from_idle_trace_collapses_active_stretches() -> None:
+    trace = [0, 5, 0, 119, 120, 121, 122, 3, 130, 131]
+    assert runs_from_idle_trace(trace, 120) == [(4, None), (3, 120), (1, None), (2, 130)]
+    assert total_seconds(runs_from_idle_trace(trace, 120)) == len(trace)
+
+
+def test_simulation_matches_sqlite_tracker_tick_by_tick(tmp_path: Path) -> None:
+    settings = AppSettings(language="en", break_duration_min=5).normalize()
+    profile = UserProfile("always-breaks", take_break_prob=1.0, snooze_prob=0.0, skip_prob=0.0)
+    trace = expand_runs(generate_runs(profile, 1, random.Random(3)))
+
+    db = Database(tmp_path / "test.db")
+    clock = FakeClock(SIMULATION_START)
+    tracker = start_tracker(db, clock, SequenceIdleProvider(trace), settings)
+    hard_shown = 0
+    for _ in trace:
+        clock.current += timedelta(seconds=1)
+        outcome = tracker.tick()
+        if any(event.event_type == "hard" for event in outcome.reminders):
+            hard_shown += 1
+            tracker.enter_break()
+    tracker.stop_session()
+    days = db.get_daily_rollups("0000", "9999")
+    db.close()
+
+    report = simulate(settings, runs_from_idle_trace(trace, settings.idle_threshold_sec), profile)
+
+    assert report.simulated_sec == len(trace)
+    assert report.active_sec == sum(day["active_sec"] for day in days)
+    assert report.idle_sec == sum(day["idle_sec"] for day in days)
+    assert report.break_sec == sum(day["break_sec"] for day in days)
+    assert report.soft_shown + report.hard_shown == sum(day["shown"] for day in days)
+    assert report.hard_shown == report.breaks_started == hard_shown > 0
+    assert report.breaks_completed == sum(day["completed_breaks"] for day in days)
+
+
+def test_population_simulation_accounts_for_every_second() -> None:
+    settings = AppSettings(language="en").normalize()
+    reports = simulate_population(settings, days=30)
+
+    assert [report.profile for report in reports] == ["focused", "fragmented", "resistant"]
+    for report in reports:
+        assert report.simulated_sec == 30 * 24 * 3600
+        assert report.active_sec + report.idle_sec + report.break_sec == report.simulated_sec
+        assert report.soft_shown > 0
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from controlwork.services.database import BackgroundDatabase, Database
+from controlwork.services.learning_content import LearningCard, learning_card_id
+from controlwork.services.spaced_repetition import (
+    DAY_SEC,
+    QUALITY_EASY,
+    QUALITY_GOOD,
+    RELEARN_SEC,
+    LearningScheduler,
+    ReviewState,
+    sm2_review,
+)
+
+NOW = 1_771_329_600
+
+
+def _cards(count: int) -> list[LearningCard]:
+    return [LearningCard(f"word{index}", f"слово{index}") for index in range(count)]
+
+
+def test_sm2_intervals_grow_with_ease() -> None:
+    state = ReviewState(NOW)
+
+    first = sm2_review(state, QUALITY_GOOD, NOW)
+    second = sm2_review(first, QUALITY_GOOD, first.due_epoch)
+    third = sm2_review(second, QUALITY_EASY, second.due_epoch)
+
+    assert first.interval_sec == DAY_SEC
+    assert second.interval_sec == 6 * DAY_SEC
+    assert third.interval_sec == round(6 * DAY_SEC * second.ease)
+    assert third.ease > second.ease
+    assert third.repetitions == 3
+
+
+def test_sm2_lapse_resets_repetitions() -> None:
+    state = ReviewState(NOW, 6 * DAY_SEC, 2.5, 2, 0)
+
+    lapsed = sm2_review(state, 1, NOW)
+
+    assert lapsed == ReviewState(NOW + RELEARN_SEC, RELEARN_SEC, lapsed.ease, 0, 1)
+    assert lapsed.ease < 2.5
+
+
+def test_scheduler_serves_due_cards_in_deck_order_then_waits(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db")
+    cards = _cards(3)
+    scheduler = LearningScheduler(db, cards + cards[:1], NOW)
+
+    shown = []
+    while True:
+        card = scheduler.next_due(NOW)
+        if card is None:
+            break
+        shown.append(card)
+        scheduler.review(card, QUALITY_GOOD, NOW)
+
+    assert shown == cards
+    assert scheduler.next_due(NOW + DAY_SEC) == cards[0]
+    db.close()
+
+
+def test_review_writes_are_batched_and_restored(tmp_path: Path) -> None:
+    now = [0.0]
+    db = Database(tmp_path / "test.db", flush_interval_sec=10, time_fn=lambda: now[0])
+    cards = _cards(100)
+    scheduler = LearningScheduler(db, cards, NOW)
+    for card in cards[:50]:
+        scheduler.review(card, QUALITY_EASY, NOW)
+
+    assert db._conn.execute("SELECT COUNT(*) FROM learning_reviews").fetchone()[0] == 0
+    now[0] = 11.0
+    scheduler.review(cards[50], QUALITY_GOOD, NOW)
+    assert db._conn.execute("SELECT COUNT(*) FROM learning_reviews").fetchone()[0] == 51
+    db.close()
+
+    reopened = Database(tmp_path / "test.db")
+    restored = LearningScheduler(reopened, cards, NOW)
+    assert restored.state(cards[0]) == scheduler.state(cards[0])
+    assert restored.next_due(NOW) == cards[51]
+    reopened.close()
+
+
+def test_background_writer_coalesces_reviews_per_card(tmp_path: Path) -> None:
+    db = BackgroundDatabase(tmp_path / "test.db", flush_interval_sec=3600)
+    card = _cards(1)[0]
+    scheduler = LearningScheduler(db, [card], NOW)
+    for offset in range(5):
+        scheduler.review(card, QUALITY_GOOD, NOW + offset * 10 * DAY_SEC)
+
+    assert db.load_learning_reviews()[learning_card_id(card)][3] == 5
+    db.close()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+OWN_IMPORT_BUDGET_MS = 200
+LAZY_MODULES = (
+    "controlwork.ui.main_window",
+    "controlwork.ui.dialogs",
+    "controlwork.ui.break_overlay",
+    "controlwork.themed_quotes_data",
+    "controlwork.services.learning_content",
+)
+
+
+def import_times(module: str) -> dict[str, int]:
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR), QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, _, name = line[len("import time:") :].split("|")
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def test_gui_entry_point_defers_heavy_modules() -> None:
+    pytest.importorskip("PySide6.QtWidgets")
+    times = import_times("controlwork.app")
+    assert "PySide6.QtWidgets" in times
+    assert [name for name in LAZY_MODULES if name in times] == []
+    own_ms = sum(value for name, value in times.items() if name.startswith("controlwork")) / 1000
+    assert own_ms < OWN_IMPORT_BUDGET_MS
+
+
+def test_themed_quotes_load_on_first_use() -> None:
+    times = import_times("controlwork.i18n")
+    assert "controlwork.themed_quotes_data" not in times
+
+    from controlwork import i18n
+
+    assert set(i18n.THEMED_QUOTES) == {"ru", "en"}
+    assert i18n.themed_quotes() is i18n.THEMED_QUOTES
+
+
+_EARLY_TRAY_CHILD = """
+from PySide6.QtWidgets import QSystemTrayIcon
+QSystemTrayIcon.isSystemTrayAvailable = staticmethod(lambda: True)
+import controlwork.app as app_module
+
+class ClickingDatabase(app_module.BackgroundDatabase):
+    def __init__(self, *args, **kwargs):
+        app = ControlWorkApplication.instance
+        print("menu enabled", app._tray_menu.isEnabled())
+        app._tray_menu.aboutToShow.emit()
+        for action in app._tray_menu.actions():
+            action.trigger()
+        app.tray_icon.activated.emit(QSystemTrayIcon.Trigger)
+        super().__init__(*args, **kwargs)
+
+class ControlWorkApplication(app_module.ControlWorkApplication):
+    instance = None
+    def _build_tray_menu(self):
+        ControlWorkApplication.instance = self
+        super()._build_tray_menu()
+
+app_module.BackgroundDatabase = ClickingDatabase
+app = ControlWorkApplication()
+print("menu enabled", app._tray_menu.isEnabled())
+app._shutdown()
+"""
+
+
+def test_tray_menu_is_inert_until_startup_finishes(tmp_path: Path) -> None:
+    pytest.importorskip("PySide6.QtWidgets")
+    config_dir = tmp_path / ".config" / "controlwork"
+    config_dir.mkdir(parents=True)
+    (config_dir / "settings.json").write_text('{"autostart_enabled": false}', encoding="utf-8")
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(SRC_DIR), QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-c", _EARLY_TRAY_CHILD], capture_output=True, text=True, env=env, timeout=60
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "AttributeError" not in proc.stderr
+    assert proc.stdout.split("\n")[:2] == ["menu enabled False", "menu enabled True"]
+
+
+_BREAK_HANDLERS_CHILD = """
+from PySide6.QtWidgets import QSystemTrayIcon
+QSystemTrayIcon.isSystemTrayAvailable = staticmethod(lambda: True)
+import controlwork.app as app_module
+
+now = [1000.0]
+app_module.elapsed_clock = lambda: now[0]
+app = app_module.ControlWorkApplication()
+app.idle_provider.get_idle_seconds = lambda: 0
+tracker = app.tracker
+app._start_break_now()
+now[0] += 30
+app._on_break_continue()
+print("break", tracker.break_sec, tracker.active_sec)
+now[0] += 20
+app._on_break_start()
+print("break", tracker.break_sec, tracker.active_sec, app.timer.isActive())
+app._shutdown()
+"""
+
+
+def test_break_handlers_credit_elapsed_time_before_changing_state(tmp_path: Path) -> None:
+    pytest.importorskip("PySide6.QtWidgets")
+    config_dir = tmp_path / ".config" / "controlwork"
+    config_dir.mkdir(parents=True)
+    (config_dir / "settings.json").write_text('{"autostart_enabled": false}', encoding="utf-8")
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(SRC_DIR), QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-c", _BREAK_HANDLERS_CHILD], capture_output=True, text=True, env=env, timeout=60
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.split("\n")[:2] == ["break 30 0", "break 30 20 True"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+PySide6_QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+QApplication = PySide6_QtWidgets.QApplication
+
+from PySide6.QtGui import QPalette
+
+from controlwork.models import AppSettings, TrackerState
+from controlwork.ui.main_window import MainWindow
+from controlwork.ui.theme import LIGHT_THEME, main_window_stylesheet
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def test_stylesheet_is_built_once_per_theme() -> None:
+    stylesheet = main_window_stylesheet(LIGHT_THEME.name)
+
+    assert main_window_stylesheet(LIGHT_THEME.name) is stylesheet
+    for state in TrackerState:
+        assert f'QLabel#stateBadge[state="{state.value}"]' in stylesheet
+
+
+def test_state_change_flips_badge_property_without_widget_stylesheet() -> None:
+    _app()
+    window = MainWindow(AppSettings().normalize())
+    window.show()
+    badge_colors = {state: fg for state, _, fg in LIGHT_THEME.badges}
+
+    for state in (TrackerState.IDLE, TrackerState.BREAK, TrackerState.PAUSED, TrackerState.ACTIVE):
+        window.update_state(state)
+
+        assert window.state_badge_label.property("state") == state.value
+        assert window.state_badge_label.styleSheet() == ""
+        color = window.state_badge_label.palette().color(QPalette.WindowText).name().upper()
+        assert color == badge_colors[state]
@@ -1,89 +1,21 @@
 from __future__ import annotations
 
+import bisect
+import random
+import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from controlwork.models import AppSettings, TrackerState
-from controlwork.services.database import Database
-from controlwork.services.reminder import ReminderController
+from controlwork.services.database import BackgroundDatabase, Database
+from controlwork.services.scheduler import TickScheduler
 from controlwork.services.tracker import TrackerService
 
-
-class SequenceIdleProvider:
-    def __init__(self, sequence: list[int]) -> None:
-        self.sequence = sequence
-        self.index = 0
-
-    def get_idle_seconds(self) -> int:
-        if self.index >= len(self.sequence):
-            return self.sequence[-1] if self.sequence else 0
-        value = self.sequence[self.index]
-        self.index += 1
-        return value
-
-
-class FakeClock:
-    def __init__(self, current: datetime) -> None:
-        self.current = current
-
-    def now(self) -> datetime:
-        return self.current
-
-    def advance(self, seconds: int = 1) -> None:
-        self.current += timedelta(seconds=seconds)
-
-
-def make_tracker(tmp_path: Path, idle_sequence: list[int], break_minutes: int = 10) -> tuple[TrackerService, FakeClock, Database]:
-    db = Database(tmp_path / "test.db")
-    settings = AppSettings(
-        language="en",
-        idle_threshold_sec=120,
-        idle_reset_after_sec=300,
-        break_duration_min=break_minutes,
-        soft_points_min=[15, 30, 45],
-        hard_points_min=[50],
-    ).normalize()
-    clock = FakeClock(datetime(2026, 2, 17, 12, 0, 0))
-    tracker = TrackerService(
-        settings=settings,
-        idle_provider=SequenceIdleProvider(idle_sequence),
-        reminder=ReminderController(settings.soft_points_min, settings.hard_points_min),
-        database=db,
-        clock=clock,
-    )
-    tracker.start_session()
-    return tracker, clock, db
-
-
-def make_tracker_at(
-    db_path: Path,
-    idle_sequence: list[int],
-    now: datetime,
-    break_minutes: int = 10,
-) -> tuple[TrackerService, FakeClock, Database]:
-    db = Database(db_path)
-    settings = AppSettings(
-        language="en",
-        idle_threshold_sec=120,
-        idle_reset_after_sec=300,
-        break_duration_min=break_minutes,
-        soft_points_min=[15, 30, 45],
-        hard_points_min=[50],
-    ).normalize()
-    clock = FakeClock(now)
-    tracker = TrackerService(
-        settings=settings,
-        idle_provider=SequenceIdleProvider(idle_sequence),
-        reminder=ReminderController(settings.soft_points_min, settings.hard_points_min),
-        database=db,
-        clock=clock,
-    )
-    tracker.start_session()
-    return tracker, clock, db
+from tracker_support import TRACKER_START, FakeClock, SequenceIdleProvider, make_tracker, start_tracker
 
 
 def test_active_vs_idle_accounting(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 10 + [200] * 5)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 10 + [200] * 5)
 
     for _ in range(15):
         tracker.tick()
@@ -96,7 +28,7 @@ def test_active_vs_idle_accounting(tmp_path: Path) -> None:
 
 
 def test_cycle_timer_resets_after_prolonged_idle(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 3 + [400] * 5)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 3 + [400] * 5)
     tracker.cycle_active_sec = 20 * 60
 
     for _ in range(8):
@@ -108,7 +40,7 @@ def test_cycle_timer_resets_after_prolonged_idle(tmp_path: Path) -> None:
 
 
 def test_short_idle_does_not_reset_cycle_timer(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 3 + [200] * 5)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 3 + [200] * 5)
     tracker.cycle_active_sec = 20 * 60
 
     for _ in range(8):
@@ -120,7 +52,7 @@ def test_short_idle_does_not_reset_cycle_timer(tmp_path: Path) -> None:
 
 
 def test_break_completes_by_timer_even_without_idle_streak(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 140, break_minutes=2)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 140, break_minutes=2)
 
     tracker.enter_break()
     completed = False
@@ -136,7 +68,7 @@ def test_break_completes_by_timer_even_without_idle_streak(tmp_path: Path) -> No
 
 
 def test_break_can_be_finished_early(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 20, break_minutes=2)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 20, break_minutes=2)
     tracker.cycle_active_sec = 25 * 60
     tracker.enter_break()
 
@@ -149,7 +81,7 @@ def test_break_can_be_finished_early(tmp_path: Path) -> None:
 
 
 def test_enter_break_starts_break_immediately(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 20, break_minutes=2)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 20, break_minutes=2)
 
     tracker.cycle_active_sec = 25 * 60
     tracker.enter_break()
@@ -161,7 +93,7 @@ def test_enter_break_starts_break_immediately(tmp_path: Path) -> None:
 
 
 def test_snooze_limit_per_work_hour(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 100)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 100)
 
     assert tracker.request_snooze("soft") is True
     assert tracker.request_snooze("soft") is True
@@ -170,7 +102,7 @@ def test_snooze_limit_per_work_hour(tmp_path: Path) -> None:
 
 
 def test_skip_limit_per_day(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 10)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 10)
 
     assert tracker.skip_break() is True
     assert tracker.skip_break() is False
@@ -180,7 +112,7 @@ def test_skip_limit_per_day(tmp_path: Path) -> None:
 
 
 def test_seconds_to_next_break_for_active_cycle(tmp_path: Path) -> None:
-    tracker, clock, db = make_tracker(tmp_path, [0] * 10)
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 10)
     tracker.cycle_active_sec = 49 * 60 + 30
     assert tracker.get_seconds_to_next_break() == 30
     db.close()
@@ -189,23 +121,351 @@ def test_seconds_to_next_break_for_active_cycle(tmp_path: Path) -> None:
 def test_cycle_timer_restored_after_restart_same_day(tmp_path: Path) -> None:
     db_path = tmp_path / "test.db"
     start = datetime(2026, 2, 17, 12, 0, 0)
-    tracker1, _, db1 = make_tracker_at(db_path, [0] * 10, start)
+    tracker1, _, db1 = make_tracker(db_path, [0] * 10, start)
     tracker1.cycle_active_sec = 25 * 60 + 5
     tracker1.stop_session()
     db1.close()
 
-    tracker2, _, db2 = make_tracker_at(db_path, [0] * 10, start + timedelta(minutes=30))
+    tracker2, _, db2 = make_tracker(db_path, [0] * 10, start + timedelta(minutes=30))
     assert tracker2.cycle_active_sec == 25 * 60 + 5
     db2.close()
 
 
 def test_cycle_timer_resets_after_restart_new_day(tmp_path: Path) -> None:
     db_path = tmp_path / "test.db"
-    tracker1, _, db1 = make_tracker_at(db_path, [0] * 10, datetime(2026, 2, 17, 23, 59, 0))
+    tracker1, _, db1 = make_tracker(db_path, [0] * 10, datetime(2026, 2, 17, 23, 59, 0))
     tracker1.cycle_active_sec = 40 * 60
     tracker1.stop_session()
     db1.close()
 
-    tracker2, _, db2 = make_tracker_at(db_path, [0] * 10, datetime(2026, 2, 18, 4, 1, 0))
+    tracker2, _, db2 = make_tracker(db_path, [0] * 10, datetime(2026, 2, 18, 4, 1, 0))
     assert tracker2.cycle_active_sec == 0
     db2.close()
+
+
+def make_write_behind_tracker(
+    tmp_path: Path,
+    idle_sequence: list[int],
+    flush_interval_sec: float,
+) -> tuple[TrackerService, FakeClock, Database]:
+    clock = FakeClock(TRACKER_START)
+    db = Database(
+        tmp_path / "test.db",
+        flush_interval_sec=flush_interval_sec,
+        time_fn=lambda: clock.now().timestamp(),
+    )
+    return start_tracker(db, clock, SequenceIdleProvider(idle_sequence)), clock, db
+
+
+def read_persisted_totals(db_path: Path, session_id: int) -> tuple[int, int, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT active_sec, idle_sec, break_sec FROM sessions WHERE id = ?",
+            (session_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    return (int(row[0]), int(row[1]), int(row[2]))
+
+
+def test_write_behind_bounds_unflushed_accounting(tmp_path: Path) -> None:
+    tracker, clock, db = make_write_behind_tracker(tmp_path, [0] * 100, flush_interval_sec=10)
+    assert tracker.session_id is not None
+
+    for _ in range(95):
+        clock.advance()
+        tracker.tick()
+        persisted_active = read_persisted_totals(tmp_path / "test.db", tracker.session_id)[0]
+        assert tracker.active_sec - persisted_active <= 10
+
+    assert read_persisted_totals(tmp_path / "test.db", tracker.session_id)[0] < tracker.active_sec
+    db.close()
+
+
+def test_crash_recovery_closes_session_at_last_heartbeat(tmp_path: Path) -> None:
+    tracker, clock, db = make_write_behind_tracker(tmp_path, [0] * 200, flush_interval_sec=10)
+    session_id = tracker.session_id
+    assert session_id is not None
+    for _ in range(125):
+        clock.advance()
+        tracker.tick()
+    tracker.enter_break()
+    break_id = tracker.break_event_id
+    for _ in range(12):
+        clock.advance()
+        tracker.tick()
+    crashed_at = clock.now()
+    db._conn.close()
+
+    restarted, _, db2 = make_tracker(tmp_path / "test.db", [0] * 10, crashed_at + timedelta(hours=1))
+    conn = sqlite3.connect(tmp_path / "test.db")
+    try:
+        session = conn.execute("SELECT ended_at, active_sec, break_sec FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        break_row = conn.execute("SELECT ended_at, completed FROM break_events WHERE id = ?", (break_id,)).fetchone()
+    finally:
+        conn.close()
+    alive_at = datetime.fromisoformat(session[0])
+    assert crashed_at - timedelta(seconds=10) <= alive_at <= crashed_at
+    assert session[1] == 125
+    assert 12 - 10 <= session[2] <= 12
+    assert break_row == (session[0], 0)
+    assert restarted.session_id != session_id
+    assert restarted.cycle_active_sec == 125
+    assert 12 - 10 <= restarted.break_elapsed_sec <= 12
+    db2.close()
+
+
+def test_write_behind_flushes_on_state_transition(tmp_path: Path) -> None:
+    tracker, clock, db = make_write_behind_tracker(tmp_path, [0] * 3 + [200], flush_interval_sec=3600)
+    assert tracker.session_id is not None
+
+    for _ in range(3):
+        clock.advance()
+        tracker.tick()
+    assert read_persisted_totals(tmp_path / "test.db", tracker.session_id) == (0, 0, 0)
+
+    clock.advance()
+    tracker.tick()
+    assert tracker.state == TrackerState.IDLE
+    assert read_persisted_totals(tmp_path / "test.db", tracker.session_id) == (3, 1, 0)
+    db.close()
+
+
+def test_write_behind_flushes_on_stop_session(tmp_path: Path) -> None:
+    tracker, clock, db = make_write_behind_tracker(tmp_path, [0] * 20, flush_interval_sec=3600)
+    session_id = tracker.session_id
+    assert session_id is not None
+
+    tracker.enter_break()
+    for _ in range(5):
+        clock.advance()
+        tracker.tick()
+    tracker.stop_session()
+
+    assert read_persisted_totals(tmp_path / "test.db", session_id) == (0, 0, 5)
+    db.close()
+
+
+def test_write_behind_reminders_visible_to_stats(tmp_path: Path) -> None:
+    tracker, clock, db = make_write_behind_tracker(tmp_path, [0] * 10, flush_interval_sec=3600)
+
+    assert tracker.request_snooze("soft") is True
+    assert tracker.get_today_stats()["snoozes"] == 1
+    db.close()
+
+
+def test_daily_rollup_matches_rebuild_from_raw_tables(tmp_path: Path) -> None:
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * (16 * 60) + [200] * 30 + [0] * 200, break_minutes=1)
+
+    for _ in range(16 * 60 + 30):
+        tracker.tick()
+        clock.advance()
+    assert tracker.request_snooze("soft") is True
+    assert tracker.skip_break() is True
+    tracker.enter_break()
+    for _ in range(60):
+        tracker.tick()
+        clock.advance()
+
+    incremental = tracker.get_today_stats()
+    db.rebuild_daily_rollups(tracker.settings.workday_reset_time)
+    rebuilt = tracker.get_today_stats()
+
+    assert incremental == rebuilt
+    assert incremental["active_sec"] == 16 * 60
+    assert incremental["idle_sec"] == 30
+    assert incremental["break_sec"] == 60
+    assert incremental["shown"] == 1
+    assert incremental["snoozes"] == 1
+    assert incremental["skips"] == 1
+    assert incremental["completed_breaks"] == 1
+    db.close()
+
+
+def test_rollover_splits_session_between_workdays(tmp_path: Path) -> None:
+    db_path = tmp_path / "test.db"
+    tracker, clock, db = make_tracker(db_path, [0] * 200, datetime(2026, 2, 18, 3, 59, 0))
+
+    for _ in range(120):
+        clock.advance()
+        tracker.tick()
+
+    days = db.get_daily_rollups("2026-02-17T04:00:00", "2026-02-18T04:00:00")
+    assert [(day["day_key"], day["active_sec"]) for day in days] == [
+        ("2026-02-17T04:00:00", 59),
+        ("2026-02-18T04:00:00", 61),
+    ]
+    db.rebuild_daily_rollups("04:00")
+    rebuilt = db.get_daily_rollups("2026-02-17T04:00:00", "2026-02-18T04:00:00")
+    assert rebuilt == days
+    db.close()
+
+
+def test_rollups_rebuilt_when_reset_time_changes(tmp_path: Path) -> None:
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 10)
+    for _ in range(10):
+        tracker.tick()
+        clock.advance()
+
+    tracker.apply_settings(AppSettings(language="en", workday_reset_time="06:30").normalize())
+
+    assert db.get_daily_rollup("2026-02-17T06:30:00")["active_sec"] == 10
+    assert db.get_daily_rollup("2026-02-17T04:00:00")["active_sec"] == 0
+    db.close()
+
+
+def test_today_stats_keep_growing_after_reset_time_change(tmp_path: Path) -> None:
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [0] * 20)
+    for _ in range(10):
+        tracker.tick()
+        clock.advance()
+
+    tracker.apply_settings(AppSettings(language="en", workday_reset_time="06:30").normalize())
+    assert tracker.current_day_key == "2026-02-17T06:30:00"
+    for _ in range(10):
+        tracker.tick()
+        clock.advance()
+
+    assert tracker.get_today_stats()["active_sec"] == 20
+    assert db.get_daily_rollup("2026-02-17T04:00:00")["active_sec"] == 0
+    db.close()
+
+
+def test_tracker_accounting_through_background_writer(tmp_path: Path) -> None:
+    db = BackgroundDatabase(tmp_path / "test.db", flush_interval_sec=5)
+    settings = AppSettings(language="en", break_duration_min=1).normalize()
+    clock = FakeClock(TRACKER_START)
+    tracker = start_tracker(db, clock, SequenceIdleProvider([0] * 30 + [200] * 10 + [0] * 100), settings)
+    session_id = tracker.session_id
+    for _ in range(40):
+        clock.advance()
+        tracker.tick()
+    assert tracker.skip_break() is True
+    tracker.enter_break()
+    for _ in range(60):
+        clock.advance()
+        tracker.tick()
+    tracker.stop_session()
+    db.close()
+
+    assert read_persisted_totals(tmp_path / "test.db", session_id) == (30, 10, 60)
+    reopened = Database(tmp_path / "test.db")
+    rollup = reopened.get_daily_rollup(tracker.current_day_key)
+    assert (rollup["active_sec"], rollup["idle_sec"], rollup["break_sec"]) == (30, 10, 60)
+    assert (rollup["skips"], rollup["completed_breaks"]) == (1, 1)
+    reopened.close()
+
+
+def random_inputs(rng: random.Random, length: int) -> list[int]:
+    inputs = [0]
+    while inputs[-1] < length:
+        gap = rng.randint(150, 900) if rng.random() < 0.01 else rng.randint(1, 12)
+        inputs.append(inputs[-1] + gap)
+    return inputs
+
+
+def idle_at(inputs: list[int], second: int) -> int:
+    return second - inputs[bisect.bisect_right(inputs, second) - 1]
+
+
+def read_history(db_path: Path) -> tuple[list[tuple[object, ...]], list[tuple[object, ...]]]:
+    conn = sqlite3.connect(db_path)
+    try:
+        reminders = conn.execute("SELECT ts, type, point_min, action_taken FROM reminder_events ORDER BY id").fetchall()
+        breaks = conn.execute(
+            "SELECT started_at, ended_at, valid_idle_sec, completed FROM break_events ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+    return (reminders, breaks)
+
+
+def test_advance_matches_tick_loop_on_random_traces(tmp_path: Path) -> None:
+    rng = random.Random(11)
+    length = 4 * 3600
+    start = datetime(2026, 2, 18, 2, 0, 0)
+    for trial in range(4):
+        inputs = random_inputs(rng, length)
+        trace = [idle_at(inputs, second) for second in range(length + 1)]
+
+        ticked, tick_clock, tick_db = make_tracker(tmp_path / f"tick{trial}.db", trace[1:], start, break_minutes=2)
+        for _ in range(length):
+            tick_clock.advance()
+            if any(event.event_type == "hard" for event in ticked.tick().reminders):
+                ticked.enter_break()
+
+        advanced, clock, db = make_tracker(tmp_path / f"advance{trial}.db", [], start, break_minutes=2)
+        scheduler = TickScheduler(max_interval_sec=rng.randint(30, 600))
+        now = 0
+        while now < length:
+            wake_at = now + scheduler.next_delay_sec(advanced, trace[now], visible=False)
+            wake_at = min(wake_at, inputs[bisect.bisect_right(inputs, now)], length)
+            clock.advance(wake_at - now)
+            if any(event.event_type == "hard" for event in advanced.advance(wake_at - now, trace[wake_at]).reminders):
+                advanced.enter_break()
+            now = wake_at
+
+        assert (advanced.active_sec, advanced.idle_sec, advanced.break_sec) == (
+            ticked.active_sec,
+            ticked.idle_sec,
+            ticked.break_sec,
+        )
+        assert (advanced.state, advanced.cycle_active_sec) == (ticked.state, ticked.cycle_active_sec)
+        days = ("2026-02-17T04:00:00", "2026-02-18T04:00:00")
+        assert db.get_daily_rollups(*days) == tick_db.get_daily_rollups(*days)
+        db.close()
+        tick_db.close()
+        assert read_history(tmp_path / f"advance{trial}.db") == read_history(tmp_path / f"tick{trial}.db")
+
+
+def test_advance_credits_suspend_as_idle_and_resets_cycle(tmp_path: Path) -> None:
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [])
+    for _ in range(10):
+        clock.advance(60)
+        tracker.advance(60, 0)
+    assert (tracker.active_sec, tracker.cycle_active_sec) == (600, 600)
+
+    clock.advance(3 * 3600)
+    outcome = tracker.advance(3 * 3600, 5)
+
+    assert tracker.active_sec == 600 + 119 + 6
+    assert tracker.idle_sec == 3 * 3600 - 125
+    assert tracker.cycle_active_sec == 6
+    assert outcome.idle_timer_reset is True
+    assert outcome.state == TrackerState.ACTIVE
+    db.close()
+
+
+def test_advance_fires_crossed_reminders_once_and_splits_rollover(tmp_path: Path) -> None:
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [], datetime(2026, 2, 18, 3, 50, 0))
+
+    fired = []
+    for _ in range(26):
+        clock.advance(60)
+        fired.append([(event.event_type, event.point_min) for event in tracker.advance(60, 0).reminders])
+
+    assert fired[24] == [("soft", 15)]
+    assert sum(fired, []) == [("soft", 15)]
+    assert tracker.cycle_active_sec == 961
+    days = db.get_daily_rollups("2026-02-17T04:00:00", "2026-02-18T04:00:00")
+    assert [(day["day_key"], day["active_sec"], day["shown"]) for day in days] == [
+        ("2026-02-17T04:00:00", 599, 0),
+        ("2026-02-18T04:00:00", 961, 1),
+    ]
+    reminders, _ = read_history(tmp_path / "test.db")
+    assert reminders == [("2026-02-18T04:14:59", "soft", 15, "shown")]
+    db.close()
+
+
+def test_advance_active_run_credits_runs_longer_than_idle_threshold(tmp_path: Path) -> None:
+    tracker, clock, db = make_tracker(tmp_path / "test.db", [])
+    clock.advance(300)
+    tracker.advance_active_run(300)
+    assert (tracker.active_sec, tracker.idle_sec) == (300, 0)
+
+    clock.advance(300)
+    outcome = tracker.advance_run(300, 0)
+    assert (tracker.active_sec, tracker.idle_sec) == (300 + 120, 180)
+    assert outcome.state == TrackerState.IDLE
+    db.close()
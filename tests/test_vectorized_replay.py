@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from controlwork.models import AppSettings
+from controlwork.simulation.memory_db import MemoryDatabase
+
+from tracker_support import FakeClock, SequenceIdleProvider, start_tracker
+
+np = pytest.importorskip("numpy")
+from controlwork.simulation.vectorized import (  # noqa: E402
+    STATE_ACTIVE,
+    STATE_BREAK,
+    STATE_IDLE,
+    replay_idle_trace,
+)
+
+
+def random_trace(rng: random.Random, length: int) -> list[int]:
+    trace = []
+    idle = 0
+    while len(trace) < length:
+        if rng.random() < 0.02:
+            run = rng.randint(100, 700)
+        else:
+            run = rng.randint(1, 15)
+        trace.extend(range(idle, idle + run))
+        idle = 0
+    return trace[:length]
+
+
+def scalar_replay(
+    trace: list[int],
+    settings: AppSettings,
+    start: datetime,
+    break_starts: set[int],
+) -> tuple[list[int], list[int], list[tuple[int, str, int]], dict[str, int]]:
+    clock = FakeClock(start)
+    database = MemoryDatabase()
+    tracker = start_tracker(database, clock, SequenceIdleProvider(trace), settings)  # type: ignore[arg-type]
+    states: list[int] = []
+    cycles: list[int] = []
+    reminders: list[tuple[int, str, int]] = []
+    for second in range(len(trace)):
+        clock.current += timedelta(seconds=1)
+        before = rollup_totals(database)
+        outcome = tracker.tick()
+        after = rollup_totals(database)
+        if after["break_sec"] != before["break_sec"]:
+            states.append(STATE_BREAK)
+        elif after["idle_sec"] != before["idle_sec"]:
+            states.append(STATE_IDLE)
+        else:
+            states.append(STATE_ACTIVE)
+        cycles.append(tracker.cycle_active_sec)
+        reminders.extend((second, event.event_type, event.point_min) for event in outcome.reminders)
+        if second in break_starts:
+            tracker.enter_break()
+    return (states, cycles, reminders, rollup_totals(database))
+
+
+def rollup_totals(database: MemoryDatabase) -> dict[str, int]:
+    totals = dict.fromkeys(("active_sec", "idle_sec", "break_sec", "completed_breaks"), 0)
+    for rollup in database.rollups.values():
+        for key in totals:
+            totals[key] += rollup[key]
+    return totals
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_vectorized_replay_matches_scalar_tracker(seed: int) -> None:
+    rng = random.Random(seed)
+    length = 5 * 3600
+    trace = random_trace(rng, length)
+    settings = AppSettings(
+        language="en",
+        idle_threshold_sec=rng.choice([30, 60, 120]),
+        idle_reset_after_sec=rng.choice([0, 90, 300]),
+        break_duration_min=rng.choice([1, 5]),
+        soft_points_min=rng.sample(range(5, 40), 3),
+        hard_points_min=rng.sample(range(20, 60), 2),
+    ).normalize()
+    start = datetime(2026, 2, 18, 1, 30, 0) + timedelta(seconds=rng.randint(0, 3600))
+    break_starts = {rng.randrange(length) for _ in range(rng.randint(0, 6))}
+
+    states, cycles, reminders, totals = scalar_replay(trace, settings, start, break_starts)
+    result = replay_idle_trace(np.asarray(trace), settings, start, sorted(break_starts))
+
+    assert result.states.tolist() == states
+    assert result.cycle_active_sec.tolist() == cycles
+    assert [(second, event.event_type, event.point_min) for second, event in result.reminders] == reminders
+    assert (result.active_sec, result.idle_sec, result.break_sec, result.breaks_completed) == (
+        totals["active_sec"],
+        totals["idle_sec"],
+        totals["break_sec"],
+        totals["completed_breaks"],
+    )
+
+
+def test_vectorized_replay_reports_states_and_resets() -> None:
+    settings = AppSettings(language="en", idle_threshold_sec=30, idle_reset_after_sec=60).normalize()
+    trace = [0] * 10 + list(range(1, 81)) + [0] * 5
+    result = replay_idle_trace(trace, settings, datetime(2026, 2, 17, 12, 0, 0))
+
+    assert result.states[:39].tolist() == [STATE_ACTIVE] * 39
+    assert result.states[39:90].tolist() == [STATE_IDLE] * 51
+    assert result.cycle_active_sec[-1] == 5
+    assert (result.active_sec, result.idle_sec, result.idle_resets) == (44, 51, 1)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from controlwork.models import TrackerState
+from controlwork.ui.view_model import StatusViewModel
+
+
+def test_first_take_returns_every_field() -> None:
+    view = StatusViewModel()
+    view.update(work_seconds=60, until_break_seconds=2940)
+
+    assert view.take_changes() == {
+        "state": TrackerState.ACTIVE,
+        "work_seconds": 60,
+        "until_break_seconds": 2940,
+        "notice": None,
+    }
+
+
+def test_take_returns_only_changed_fields() -> None:
+    view = StatusViewModel()
+    view.update(work_seconds=60, until_break_seconds=2940)
+    view.take_changes()
+
+    view.update(work_seconds=60, until_break_seconds=2940)
+    assert view.take_changes() == {}
+
+    view.update(state=TrackerState.IDLE, notice="status_idle_reset")
+    assert view.take_changes() == {"state": TrackerState.IDLE, "notice": "status_idle_reset"}
+
+
+def test_invalidate_forces_full_push() -> None:
+    view = StatusViewModel()
+    view.take_changes()
+
+    view.invalidate()
+
+    assert set(view.take_changes()) == {"state", "work_seconds", "until_break_seconds", "notice"}
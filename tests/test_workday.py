@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from controlwork.models import AppSettings
+from controlwork.services.database import Database
+from controlwork.services.reminder import ReminderController
+from controlwork.services.workday import WorkdayCalendar
+
+from tracker_support import ActiveIdleProvider, FakeClock, start_tracker
+
+
+def reference_day_key(now: datetime, reset_time: str) -> str:
+    hh, mm = [int(part) for part in reset_time.split(":")]
+    reset_today = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+    start = reset_today - timedelta(days=1) if now < reset_today else reset_today
+    return start.isoformat()
+
+
+def new_york():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        return zoneinfo.ZoneInfo("America/New_York")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("tz database is not available")
+
+
+def test_day_keys_match_reset_boundaries() -> None:
+    rng = random.Random(16)
+    base = datetime(2026, 2, 17)
+    for reset_time in ("00:00", "04:00", "23:59", "12:30"):
+        calendar = WorkdayCalendar(reset_time)
+        ts = base
+        for _ in range(2000):
+            ts += timedelta(seconds=rng.choice((1, 59, 3600, 4 * 3600, 86399)))
+            key = reference_day_key(ts, reset_time)
+            assert calendar.day_key(ts) == key
+            start, end = calendar.window(ts)
+            assert start.isoformat() == key
+            assert start <= ts < end
+            assert calendar.seconds_to_end(ts) == int((end - ts).total_seconds())
+
+
+def test_repeated_reset_hour_does_not_reopen_the_previous_day() -> None:
+    tz = new_york()
+    calendar = WorkdayCalendar("01:30")
+    first_pass = datetime(2026, 11, 1, 1, 45, tzinfo=tz)
+    second_pass = datetime(2026, 11, 1, 1, 15, fold=1, tzinfo=tz)
+    assert calendar.day_key(datetime(2026, 11, 1, 1, 15, tzinfo=tz)) == "2026-10-31T01:30:00"
+    assert calendar.day_key(first_pass) == "2026-11-01T01:30:00"
+    assert calendar.day_key(second_pass) == "2026-11-01T01:30:00"
+
+
+def test_seconds_to_end_counts_real_seconds_across_dst() -> None:
+    tz = new_york()
+    calendar = WorkdayCalendar("04:00")
+    assert calendar.seconds_to_end(datetime(2026, 3, 8, 0, 0, tzinfo=tz)) == 3 * 3600
+    assert calendar.seconds_to_end(datetime(2026, 11, 1, 0, 0, tzinfo=tz)) == 5 * 3600
+    assert calendar.day_key(datetime(2026, 3, 8, 3, 59, tzinfo=tz)) == "2026-03-07T04:00:00"
+
+
+def test_apply_settings_invalidates_cached_window(tmp_path: Path) -> None:
+    db = Database(tmp_path / "test.db")
+    clock = FakeClock(datetime(2026, 2, 17, 3, 0, 0))
+    tracker = start_tracker(
+        db, clock, ActiveIdleProvider(), AppSettings(language="en").normalize(), ReminderController([15], [50])
+    )
+    tracker.tick()
+    assert tracker.current_day_key == "2026-02-16T04:00:00"
+    assert tracker.get_seconds_to_day_rollover() == 3600
+
+    tracker.apply_settings(AppSettings(language="en", workday_reset_time="02:00").normalize())
+    assert tracker.get_seconds_to_day_rollover() == 23 * 3600
+    tracker.tick()
+    assert tracker.current_day_key == "2026-02-17T02:00:00"
+    db.close()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from controlwork.models import AppSettings
+from controlwork.services.database import Database
+from controlwork.services.reminder import ReminderController
+from controlwork.services.tracker import TrackerService
+
+TRACKER_START = datetime(2026, 2, 17, 12, 0, 0)
+
+
+class FakeClock:
+    def __init__(self, current: datetime) -> None:
+        self.current = current
+
+    def now(self) -> datetime:
+        return self.current
+
+    def advance(self, seconds: int = 1) -> None:
+        self.current += timedelta(seconds=seconds)
+
+
+class SequenceIdleProvider:
+    def __init__(self, sequence: list[int]) -> None:
+        self.sequence = sequence
+        self.index = 0
+
+    def get_idle_seconds(self) -> int:
+        if self.index >= len(self.sequence):
+            return self.sequence[-1] if self.sequence else 0
+        value = self.sequence[self.index]
+        self.index += 1
+        return value
+
+
+class TraceIdleProvider:
+    def __init__(self, trace: list[int], clock: FakeClock, start: datetime) -> None:
+        self.trace = trace
+        self.clock = clock
+        self.start = start
+
+    def get_idle_seconds(self) -> int:
+        return self.trace[int((self.clock.now() - self.start).total_seconds())]
+
+
+class ActiveIdleProvider:
+    def get_idle_seconds(self) -> int:
+        return 0
+
+
+def tracker_settings(break_minutes: int = 10) -> AppSettings:
+    return AppSettings(
+        language="en",
+        idle_threshold_sec=120,
+        idle_reset_after_sec=300,
+        break_duration_min=break_minutes,
+        soft_points_min=[15, 30, 45],
+        hard_points_min=[50],
+    ).normalize()
+
+
+def start_tracker(
+    database: Database,
+    clock: FakeClock,
+    idle_provider: object,
+    settings: AppSettings | None = None,
+    reminder: ReminderController | None = None,
+) -> TrackerService:
+    settings = tracker_settings() if settings is None else settings
+    tracker = TrackerService(
+        settings=settings,
+        idle_provider=idle_provider,  # type: ignore[arg-type]
+        reminder=ReminderController(settings.soft_points_min, settings.hard_points_min) if reminder is None else reminder,
+        database=database,
+        clock=clock,
+    )
+    tracker.start_session()
+    return tracker
+
+
+def make_tracker(
+    db_path: Path,
+    idle_sequence: list[int],
+    now: datetime = TRACKER_START,
+    break_minutes: int = 10,
+) -> tuple[TrackerService, FakeClock, Database]:
+    db = Database(db_path)
+    clock = FakeClock(now)
+    tracker = start_tracker(db, clock, SequenceIdleProvider(idle_sequence), tracker_settings(break_minutes))
+    return tracker, clock, db